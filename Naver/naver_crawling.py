@@ -3,7 +3,10 @@ import random
 import hashlib
 import traceback
 
+import os
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from bs4 import BeautifulSoup
 from fastapi import FastAPI
 from selenium import webdriver
@@ -13,15 +16,15 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from webdriver_manager.chrome import ChromeDriverManager
-from elasticsearch import Elasticsearch
 from elasticsearch import NotFoundError
+from elasticsearch_index.es_client import es
 import re
 
 
 from elasticsearch_index.es_err_crawling import index_error_log
+from work_queue import enqueue_npti
 from logger import Logger
 from datetime import datetime, timezone, timedelta
-from kiwipiepy import Kiwi
 from elasticsearch_index.es_raw import tokens, ensure_news_raw, ES_INDEX
 import asyncio
 
@@ -31,17 +34,30 @@ logger = Logger().get_logger(__name__)
 
 
 # ---------- [설정] 엘라스틱서치 연결 ----------
-# 엘라스틱서치 서버 주소 및 인덱스 이름 설정
-ES_HOST = "http://localhost:9200"
-ES_INDEX = "news_raw"
-ES_USER = "elastic"
-ES_PASS = "elastic"
-es = Elasticsearch( # elasticsearch 연결 객체 생성
-    ES_HOST,
-    basic_auth=(ES_USER, ES_PASS),
-    verify_certs=False,
-    ssl_show_warn=False # type: ignore
-)
+# 공용 클라이언트(커넥션 풀 공유, 프로세스별 생성) 사용, 인덱스 이름은 es_raw의 ES_INDEX("news_raw")
+
+
+# ---------- [설정] HTTP 세션 (커넥션 풀 재사용) ----------
+# 일반기사 목록 수집 방식 : http (브라우저 없이 섹션 목록 + 더보기 데이터 직접 요청) / browser (기존 Selenium)
+LIST_MODE = os.getenv("NAVER_LIST_MODE", "http")
+MORE_PAGES = 2  # 더보기 횟수 (browser 모드의 클릭 2회와 동일)
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36'
+
+_session = None
+_session_pid = None
+
+def get_http_session():
+    # 상주 워커(fork)마다 소켓을 따로 쓰도록 프로세스별로 생성
+    global _session, _session_pid
+    if _session is None or _session_pid != os.getpid():
+        session = requests.Session()
+        retry = Retry(total=2, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504], allowed_methods=["GET"])
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=10, max_retries=retry)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers.update({"User-Agent": USER_AGENT})
+        _session, _session_pid = session, os.getpid()
+    return _session
 
 
 # ---------- [설정] Selenium 드라이버 초기화 함수 ----------
@@ -93,7 +109,7 @@ def get_article_detail(url, category_name):
         'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'}
 
     try:
-        response = requests.get(url, headers=headers, timeout=10)
+        response = get_http_session().get(url, headers=headers, timeout=10)
         response.raise_for_status()  # 404, 500 에러 체크
         soup = BeautifulSoup(response.text, "lxml")
 
@@ -308,7 +324,7 @@ def pubtime_update(news_id):
 # Semaphore(접속 수 제한:3)
 #sem = asyncio.Semaphore(3)
 
-async def process_article(item, cat_name, kiwi, sem):
+async def process_article(item, cat_name, sem):
     async with sem:
         try:
             link_tag = item.select_one("a")
@@ -337,7 +353,8 @@ async def process_article(item, cat_name, kiwi, sem):
             content = detail.get("content")
             if not content: return
 
-            token = tokens({"title": title, "content": content}, kiwi)
+            # 형태소 분석은 공용 Kiwi로 스레드에서 실행 (이벤트 루프를 막지 않음)
+            token = await asyncio.to_thread(tokens, {"title": title, "content": content})
 
             doc = {
                 "news_id": news_id,
@@ -346,6 +363,7 @@ async def process_article(item, cat_name, kiwi, sem):
                 "title_tokens": token["title_tokens"],
                 "content": content,
                 "content_tokens": token["content_tokens"],
+                "pos": token["pos"],
                 "link": detail.get("URL"),
                 "media": (detail.get("media") or "").replace('\\', ''),
                 "pubdate": detail.get("pubdate"),
@@ -360,6 +378,7 @@ async def process_article(item, cat_name, kiwi, sem):
 
             # 엘라스틱서치 저장
             await asyncio.to_thread(es.index, index=ES_INDEX, id=news_id, document=doc)
+            await asyncio.to_thread(enqueue_npti, news_id)  # NPTI 분류 대기열 등록
 
             # status가 "NEW_DOC"(신규)이거나 "UPDATE_NEEDED"(pubtime 보완)인 경우 진행
             if status == "UPDATE_NEEDED":
@@ -390,8 +409,9 @@ def crawler_naver():
     #run_fast_crawl() #서버시작시 시작
 
 def run_fast_crawl():
-    driver = get_safe_driver()
-    if not driver:
+    # http 모드는 정경사세 목록을 브라우저 없이 수집 (driver=None)
+    driver = get_safe_driver() if LIST_MODE == "browser" else None
+    if LIST_MODE == "browser" and not driver:
         logger.error("드라이버 로드 실패로 FAST 크롤링 중단")
         return
 
@@ -408,7 +428,8 @@ def run_fast_crawl():
         index_error_log(f"FAST 크롤링 에러: {e}", "NAVER")
 
     finally:
-        driver.quit()
+        if driver:
+            driver.quit()
 
 def run_slow_crawl():
     driver = get_safe_driver()
@@ -423,7 +444,7 @@ def run_slow_crawl():
                            "생활/문화(여행)": "103/237","생활/문화(음식)": "103/238","생활/문화(패션)": "103/376",
                            "생활/문화(공연)": "103/242","생활/문화(책)": "103/243","생활/문화(종교)": "103/244",
                            "생활/문화(일반)": "103/245","IT/과학": "105"}
-        crawling_general_news(driver, slow_categories)
+        crawling_general_news(driver if LIST_MODE == "browser" else None, slow_categories)
         crawling_sports_news(driver)
         crawling_enter_news(driver)
 
@@ -435,9 +456,100 @@ def run_slow_crawl():
         driver.quit()
 
 ################################################################################################################
-# 일반기사 크롤링 함수
+# 일반기사 목록 수집 (browser) : 섹션 페이지 로드 후 더보기 2회 클릭
+def discover_section_items_browser(driver, cat_name, url):
+    driver.get(url)
+
+    # 더보기 클릭 (2회)
+    for i in range(MORE_PAGES):
+        try:
+            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+            time.sleep(random.uniform(1.0, 1.5))
+            more_btn_xpath = "//a[contains(@class, 'section_more_inner') or contains(text(), '더보기')]"
+            more_btn = WebDriverWait(driver, 7).until(
+                EC.presence_of_element_located((By.XPATH, more_btn_xpath))
+            )
+            driver.execute_script("arguments[0].scrollIntoView(true);", more_btn)
+            time.sleep(random.uniform(1.5, 2.5))
+
+            driver.execute_script("arguments[0].click();", more_btn)
+
+            logger.info(f"[{cat_name}] 더보기 버튼 클릭 성공 ({i + 1}/{MORE_PAGES})")
+            time.sleep(random.uniform(2.0, 3.0))
+        except:
+            logger.debug(f"[{cat_name}] 더보기 버튼 없음/종료")
+            break
+
+    soup = BeautifulSoup(driver.page_source, "lxml")
+    return soup.select("div.section_latest ul li")
+
+
+# 일반기사 목록 수집 (http) : 섹션 페이지 HTML + 더보기 버튼이 호출하는 목록 템플릿(JSON)을 직접 요청
+# - 더보기 데이터 위치는 페이지의 data-template-id / data-cursor-name / data-cursor 속성에서 읽음
+# - 반환값은 browser 모드와 같은 div.section_latest ul li 목록 (링크 기준 중복 제거)
+def read_more_cursor(soup):
+    node = soup.select_one("div.section_latest [data-cursor]") or soup.select_one("[data-cursor]")
+    if node is None or not node.get("data-cursor"):
+        return None
+    return {
+        "template_id": node.get("data-template-id") or "SECTION_ARTICLE_LIST",
+        "cursor_name": node.get("data-cursor-name") or "next",
+        "cursor": node.get("data-cursor"),
+        "page_no": int(node.get("data-page-no") or 1),
+    }
+
+
+def discover_section_items_http(cat_name, cat_id, more_pages: int = MORE_PAGES):
+    session = get_http_session()
+    sid, _, sid2 = cat_id.partition("/")
+    if sid2:
+        url = f"https://news.naver.com/breakingnews/section/{sid}/{sid2}"
+    else:
+        url = f"https://news.naver.com/section/{sid}"
+
+    response = session.get(url, timeout=10)
+    response.raise_for_status()
+    soup = BeautifulSoup(response.text, "lxml")
+    items = soup.select("div.section_latest ul li")
+    more = read_more_cursor(soup)
+
+    for i in range(more_pages):
+        if more is None:
+            logger.debug(f"[{cat_name}] 더보기 데이터 없음/종료")
+            break
+        params = {"sid": sid, "sid2": sid2, "pageNo": more["page_no"] + 1, "date": "",
+                  more["cursor_name"]: more["cursor"]}
+        res = session.get(f"https://news.naver.com/section/template/{more['template_id']}",
+                          params=params, headers={"Referer": url}, timeout=10)
+        res.raise_for_status()
+        html = (res.json().get("renderedComponent") or {}).get(more["template_id"]) or ""
+        fragment = BeautifulSoup(html, "lxml")
+        page_items = fragment.select("ul li") or fragment.select("li")  # 조각이 li만 있는 경우
+        if not page_items:
+            break
+        items.extend(page_items)
+        logger.info(f"[{cat_name}] 더보기 데이터 수신 ({i + 1}/{more_pages}) : {len(page_items)}건")
+
+        # 다음 커서 : 응답 조각에 있으면 사용, 없으면 종료
+        next_more = read_more_cursor(fragment)
+        if next_more is None:
+            break
+        next_more["page_no"] = more["page_no"] + 1
+        more = next_more
+
+    unique, seen = [], set()
+    for item in items:
+        link_tag = item.select_one("a")
+        href = link_tag.get("href") if link_tag else None
+        if not href or href in seen:
+            continue
+        seen.add(href)
+        unique.append(item)
+    return unique
+
+
+# 일반기사 크롤링 함수 (driver가 None이면 http 모드)
 def crawling_general_news(driver, categories):
-    kiwi = Kiwi()
     # categories = {
     # "정치": "100", "경제": "101", "사회": "102", "세계": "104", "IT/과학": "105",
     # "생활/문화(건강)": "103/241","생활/문화(자동차)": "103/239","생활/문화(도로)": "103/240","생활/문화(여행)": "103/237","생활/문화(음식)": "103/238",
@@ -448,49 +560,30 @@ def crawling_general_news(driver, categories):
         start_time = time.time()
 
         try:
-            if "/" in cat_id:
-                url = f"https://news.naver.com/breakingnews/section/{cat_id}"
-            else:
-                url = f"https://news.naver.com/section/{cat_id}"
             logger.info(f"======[일반/{cat_name}] 수집 시작======")
-            driver.get(url)
-
-            # 더보기 클릭 (2회)
-            for i in range(2):
-                try:
-                    driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                    time.sleep(random.uniform(1.0, 1.5))
-                    more_btn_xpath = "//a[contains(@class, 'section_more_inner') or contains(text(), '더보기')]"
-                    more_btn = WebDriverWait(driver, 7).until(
-                        EC.presence_of_element_located((By.XPATH, more_btn_xpath))
-                    )
-                    driver.execute_script("arguments[0].scrollIntoView(true);", more_btn)
-                    time.sleep(random.uniform(1.5, 2.5))
-
-                    driver.execute_script("arguments[0].click();", more_btn)
-
-                    logger.info(f"[{cat_name}] 더보기 버튼 클릭 성공 ({i + 1}/2)")
-                    time.sleep(random.uniform(2.0, 3.0))
-                except:
-                    logger.debug(f"[{cat_name}] 더보기 버튼 없음/종료")
-                    break
-
-            soup = BeautifulSoup(driver.page_source, "lxml")
-            items = soup.select("div.section_latest ul li")
+            if driver is None:
+                items = discover_section_items_http(cat_name, cat_id)
+            else:
+                if "/" in cat_id:
+                    url = f"https://news.naver.com/breakingnews/section/{cat_id}"
+                else:
+                    url = f"https://news.naver.com/section/{cat_id}"
+                items = discover_section_items_browser(driver, cat_name, url)
+            list_time = time.time() - start_time
 
             loop = asyncio.new_event_loop()
             asyncio.set_event_loop(loop)
 
             sem = asyncio.Semaphore(3)
 
-            tasks = [process_article(item, cat_name, kiwi, sem) for item in items]
+            tasks = [process_article(item, cat_name, sem) for item in items]
             results = loop.run_until_complete(asyncio.gather(*tasks))
             loop.close()
 
             end_time = time.time()
             duration = end_time - start_time
             saved_count = len([r for r in results if r is True])
-            logger.info(f"[카테고리 - {cat_name}] 수집: 신규 기사: {saved_count}건 / {duration:.2f}초 소요 ")
+            logger.info(f"[카테고리 - {cat_name}] 수집: 목록 {len(items)}건({list_time:.2f}초) / 신규 기사: {saved_count}건 / {duration:.2f}초 소요 ")
 
         except Exception as e:
             error_msg =f"crawling_general_news - [{cat_name}] 카테고리 수집 중 에러: {e}"
@@ -498,15 +591,14 @@ def crawling_general_news(driver, categories):
             index_error_log(error_msg, "NAVER")
             continue
 
-        # 다음 카테고리로 넘어가기 전 대기(IP 차단 방지)
-        time.sleep(random.uniform(2.0, 5.0))
+        # 다음 카테고리로 넘어가기 전 대기(IP 차단 방지) - http 모드는 요청 수가 적어 짧게
+        time.sleep(random.uniform(2.0, 5.0) if driver is not None else random.uniform(0.5, 1.0))
 
     logger.info("일반기사 수집 프로세스 종료")
 
 ################################################################################################################
 # 스포츠기사 크롤링 함수
 def crawling_sports_news(driver):
-    kiwi = Kiwi()
     sports_categories = {
         "국내야구": "kbaseball","해외야구": "wbaseball","국내축구": "kfootball","해외축구": "wfootball",
         "농구": "basketball","배구": "volleyball","일반": "general","골프": "golf"
@@ -614,7 +706,7 @@ def crawling_sports_news(driver):
                         continue
 
 
-                    token = tokens({"title": title, "content": detail.get("content")}, kiwi)
+                    token = tokens({"title": title, "content": detail.get("content")})
 
                     doc = {
                         "news_id": news_id,
@@ -623,6 +715,7 @@ def crawling_sports_news(driver):
                         "title_tokens": token["title_tokens"],
                         "content": detail.get("content", ""),
                         "content_tokens": token["content_tokens"],
+                        "pos": token["pos"],
                         "writer": (detail.get("writer") or "").replace('\\', ''),
                         "media": (detail.get("media") or "").replace('\\', ''),
                         "pubdate": detail.get("pubdate"),
@@ -635,6 +728,7 @@ def crawling_sports_news(driver):
                         "classified": False
                     }
                     es.index(index=ES_INDEX, id=news_id, document=doc)
+                    enqueue_npti(news_id)
                     saved_count += 1
                     time.sleep(random.uniform(0.5, 1.0))
 
@@ -654,7 +748,6 @@ def crawling_sports_news(driver):
 ################################################################################################################
 # 연예 기사 크롤링 함수
 def crawling_enter_news(driver):
-    kiwi = Kiwi()
     start_time = time.time()
     saved_count = 0
     duplicate_count = 0
@@ -750,7 +843,7 @@ def crawling_enter_news(driver):
                         continue
 
 
-                    token = tokens({"title": title, "content": detail.get("content")}, kiwi)
+                    token = tokens({"title": title, "content": detail.get("content")})
 
                     doc = {
                         "news_id": news_id,
@@ -759,6 +852,7 @@ def crawling_enter_news(driver):
                         "title_tokens": token["title_tokens"],
                         "content": detail.get("content", ""),
                         "content_tokens": token["content_tokens"],
+                        "pos": token["pos"],
                         "writer": (detail.get("writer") or "").replace('\\', ''),
                         "media": (detail.get("media") or "").replace('\\', ''),
                         "pubdate": detail.get("pubdate"),
@@ -773,6 +867,7 @@ def crawling_enter_news(driver):
 
                     # ES 저장
                     es.index(index=ES_INDEX, id=news_id, document=doc)
+                    enqueue_npti(news_id)
                     saved_count += 1
                     time.sleep(random.uniform(0.8, 1.2))
 
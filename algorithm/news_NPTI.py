@@ -1,30 +1,27 @@
 import sys, os
 sys.path.append(os.path.dirname(os.path.abspath(os.path.dirname(__file__))))
 
+import time
 import joblib
+import multiprocessing
 from datetime import datetime, timezone, timedelta
 from logger import Logger
-from elasticsearch import Elasticsearch, helpers
+from elasticsearch import helpers
+from elasticsearch_index.es_client import es # 공용 elasticsearch 연결 객체 (프로세스별 클라이언트로 위임)
 
 from database import Base, get_engine, SessionLocal
 import warnings
-from sqlalchemy.exc import IntegrityError
+from sqlalchemy.dialects.mysql import insert as mysql_insert
 from db_index.db_articles_NPTI import ArticlesNPTI
+from collections import Counter
+from db_index.db_article_stats import apply_npti_deltas
+from work_queue import get_npti_queue
 
 logger = Logger().get_logger(__name__)
 
 # 엘라스틱
-ES_HOST = "http://localhost:9200"
-ES_USER = "elastic"
-ES_PASS = "elastic"
 ES_INDEX = "news_raw"
 
-es = Elasticsearch( # elasticsearch 연결 객체 생성
-    ES_HOST,
-    basic_auth=(ES_USER, ES_PASS),
-    verify_certs=False,
-    ssl_show_warn=False # type: ignore
-)
 
 warnings.filterwarnings(
     "ignore",
@@ -82,118 +79,293 @@ def init_npti():
     logger.info("[NPTI INIT] 초기화 완료")
 
 
-# NPTI 라벨링 함수(joblib 모델 활용)
-def classify_npti_fast():
+# ES 문서 상태 일괄 갱신 (classified / npti / classified_reason)
+def bulk_update_docs(docs: dict):
+    if not docs:
+        return 0
+    actions = [
+        {"_op_type": "update", "_index": ES_INDEX, "_id": news_id, "doc": doc}
+        for news_id, doc in docs.items()
+    ]
+    success, errors = helpers.bulk(es, actions, raise_on_error=False)
+    if errors:
+        logger.error(f"[news_NPTI.py] ES 분류 상태 갱신 실패 {len(errors)}건 : {errors[:3]}")
+    return success
+
+
+# 기사 묶음(chunk) 1개 분류 : 3개 모델을 묶음 단위로 예측 -> MySQL 다건 upsert 1번 -> ES bulk 1번
+def classify_chunk(db, models, rows: list, now):
+    model_ct, tfidf_ct = models["ct"]
+    model_fi, tfidf_fi = models["fi"]
+    model_pn, tfidf_pn = models["pn"]
+
+    contents = [row["_source"].get("content") for row in rows]
+    ct = [c.upper() for c in model_ct.predict(tfidf_ct.transform(contents))]
+    fi = [c.upper() for c in model_fi.predict(tfidf_fi.transform(contents))]
+    pn = [c.upper() for c in model_pn.predict(tfidf_pn.transform(contents))]
+
+    records, docs, categories = [], {}, {}
+    for k, row in enumerate(rows):
+        news_id = row["_id"]
+        length_type = "L" if len(contents[k]) >= 1000 else "S"
+        npti_code = length_type + ct[k] + fi[k] + pn[k]
+        records.append({
+            "news_id": news_id,
+            "NPTI_code": npti_code,
+            "length_type": length_type,
+            "article_type": ct[k],
+            "info_type": fi[k],
+            "view_type": pn[k],
+            "updated_at": now,
+        })
+        docs[news_id] = {"classified": True, "npti": npti_code}
+        categories[news_id] = row["_source"].get("category")
+
+    try:
+        # 이미 저장된 기사(동시 분류 / 재시도)의 이전 결과를 잠그고 읽어 통계는 증감으로만 반영
+        # (동시에 같은 신규 기사를 넣으면 한쪽이 deadlock으로 실패 -> 개별 재시도에서 이전 결과로 처리됨)
+        previous = (
+            db.query(ArticlesNPTI.news_id, ArticlesNPTI.NPTI_code, ArticlesNPTI.updated_at)
+            .filter(ArticlesNPTI.news_id.in_(list(docs)))
+            .with_for_update()
+            .all()
+        )
+        deltas = Counter()
+        for r in records:
+            deltas[(now.date(), categories[r["news_id"]], r["NPTI_code"])] += 1
+        for news_id, old_code, old_updated_at in previous:
+            old_date = old_updated_at.date() if old_updated_at else now.date()
+            deltas[(old_date, categories[news_id], old_code)] -= 1
+
+        stmt = mysql_insert(ArticlesNPTI.__table__).values(records)
+        stmt = stmt.on_duplicate_key_update(
+            NPTI_code=stmt.inserted.NPTI_code,
+            length_type=stmt.inserted.length_type,
+            article_type=stmt.inserted.article_type,
+            info_type=stmt.inserted.info_type,
+            view_type=stmt.inserted.view_type,
+            updated_at=stmt.inserted.updated_at,
+        )
+        db.execute(stmt)
+        apply_npti_deltas(db, deltas) # 기사 통계 롤업
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    bulk_update_docs(docs)
+    return len(records)
+
+
+# 기사 묶음 처리 : 본문 없음 / 이미 분류됨 / 신규 분류로 나눠 처리하고 신규 분류 건수 반환
+def process_chunk(db, models, chunk: list, now):
+    # 1. 본문 없는 기사
+    empty = {row["_id"]: {"classified": True, "classified_reason": "empty_content"}
+             for row in chunk if not row["_source"].get("content")}
+
+    # 2. 이미 분류된 기사 (IN 쿼리 1번) -> ES 상태만 맞춰줌
+    ids = [row["_id"] for row in chunk if row["_id"] not in empty]
+    exists = dict(
+        db.query(ArticlesNPTI.news_id, ArticlesNPTI.NPTI_code)
+        .filter(ArticlesNPTI.news_id.in_(ids))
+        .all()
+    ) if ids else {}
+    if exists:
+        logger.info(f"[기사 분류 스킵] 이미 존재: {len(exists)}건")
+    done = {**empty, **{news_id: {"classified": True, "npti": code} for news_id, code in exists.items()}}
+    bulk_update_docs(done)
+
+    # 3. 신규 기사 묶음 분류
+    targets = [row for row in chunk if row["_id"] not in done]
+    if not targets:
+        return 0
+    try:
+        return classify_chunk(db, models, targets, now)
+    except Exception as e:
+        # 묶음 실패 시 1건씩 다시 시도해서 문제 기사만 에러 처리
+        logger.warning(f"[기사 묶음 분류 실패 -> 개별 재시도] {len(targets)}건 / {e}")
+        count, failed = 0, {}
+        for row in targets:
+            try:
+                count += classify_chunk(db, models, [row], now)
+            except Exception as e:
+                news_id = row["_id"]
+                logger.error(f"[기사 분류 실패] news_id={news_id} / {e}")
+                err_article(news_id, e)
+                failed[news_id] = {"classified": True, "classified_reason": "error"}
+        bulk_update_docs(failed)
+        return count
+
+
+# NPTI 정합성 점검(joblib 모델 활용) - 대기열에서 빠진 classified:false 기사를 chunk_size건씩 묶어서 처리
+# (신규 기사는 크롤러가 대기열에 넣고 consume_npti_queue가 바로 분류)
+# - slice_id / max_slices : sliced scroll로 전체 대상 중 겹치지 않는 일부(shard)만 처리 (classify_npti_parallel)
+# - min_age : 저장 후 min_age가 지나지 않은 기사는 대기열 소비 작업 몫이므로 제외 (0이면 전체)
+def classify_npti_fast(chunk_size: int = 500, slice_id: int = None, max_slices: int = None, min_age: str = "10m"):
     db = SessionLocal()
 
     try:
         models = load_joblib()
-        model_ct, tfidf_ct = models["ct"]
-        model_fi, tfidf_fi = models["fi"]
-        model_pn, tfidf_pn = models["pn"]
-
         now = datetime.now(timezone(timedelta(hours=9)))
 
+        filters = [{"term": {"classified": False}}]
+        if min_age and min_age != "0":
+            filters.append({"range": {"timestamp": {"lt": f"now-{min_age}"}}})
         query = {
-            "query": {"term": {"classified": False}},
-            "_source": ["content"]
+            "query": {"bool": {"filter": filters}},
+            "_source": ["content", "category"]
         }
+        if max_slices and max_slices > 1:
+            query["slice"] = {"id": slice_id, "max": max_slices}
 
-        rows = helpers.scan(es, index=ES_INDEX, query=query)
+        rows = helpers.scan(es, index=ES_INDEX, query=query, size=chunk_size)
         count = 0
 
-        for row in rows:
-            news_id = row["_id"]
-            content = row["_source"].get("content")
+        for chunk in iter_chunks(rows, chunk_size):
+            count += process_chunk(db, models, chunk, now)
 
-            if not content:
-                es.update(
-                    index=ES_INDEX,
-                    id=news_id,
-                    body={"doc": {"classified": True, "classified_reason": "empty_content"}}
-                )
-                continue
+        if count > 0:
+            shard = f" (shard {slice_id + 1}/{max_slices})" if max_slices and max_slices > 1 else ""
+            logger.info(f"[정합성 점검] NPTI 미분류 기사 {count}건 분류 완료{shard}")
+
+    except Exception as e:
+        logger.error(f"[news_NPTI.py] 기사 NPTI 전체 프로세스(joblib) 에러: {e}")
+        err_article("BATCH", e)
+        logger.info(f"[news_NPTI.py] 에러 로그 저장 완료")
+        db.rollback()
+    finally:
+        db.close()
+
+
+# NPTI 분류 대기열 소비 - run_seconds 동안 대기열을 계속 비우고 종료 (스케줄러가 다시 실행)
+# - 처리 성공 : ack / ES·DB 장애 등으로 묶음 전체 실패 : nack (backoff 후 재시도)
+def consume_npti_queue(run_seconds: float = 55, chunk_size: int = 200, idle_sleep: float = 2):
+    queue = get_npti_queue()
+    db = SessionLocal()
+    deadline = time.monotonic() + run_seconds
+    count = 0
 
-            exists = (
-                db.query(ArticlesNPTI)
-                .filter(ArticlesNPTI.news_id == news_id)
-                .first()
-            )
-            if exists:
-                logger.info(f"[기사 분류 스킵] 이미 존재: {news_id}")
+    try:
+        models = load_joblib()
+        while time.monotonic() < deadline:
+            ids = queue.lease(chunk_size, lease_seconds=300)
+            if not ids:
+                time.sleep(idle_sleep)
                 continue
 
             try:
-                length_type = "L" if len(content) >= 1000 else "S"
-                ct = model_ct.predict(tfidf_ct.transform([content]))[0].upper()
-                fi = model_fi.predict(tfidf_fi.transform([content]))[0].upper()
-                pn = model_pn.predict(tfidf_pn.transform([content]))[0].upper()
-
-                npti_code = length_type + ct + fi + pn
-
-                record = ArticlesNPTI(
-                    news_id=news_id,
-                    length_type=length_type,
-                    article_type=ct,
-                    info_type=fi,
-                    view_type=pn,
-                    NPTI_code=npti_code,
-                    updated_at=now
-                )
-
-                db.add(record)
-                db.commit()
-                count += 1
-
-                es.update(
-                    index=ES_INDEX,
-                    id=news_id,
-                    body={
-                        "doc": {
-                            "classified": True,
-                            "npti": npti_code
-                        }
-                    }
-                )
-
-            except IntegrityError as e:
-                db.rollback()
-                logger.warning(f"[중복 기사] news_id={news_id}")
-                es.update(
-                    index=ES_INDEX,
-                    id=news_id,
-                    body={"doc": {"classified": True, "classified_reason": "duplicate"}}
-                )
-                continue
+                now = datetime.now(timezone(timedelta(hours=9)))
+                res = es.mget(index=ES_INDEX, ids=ids, source_includes=["content", "category"])
+                chunk = [{"_id": d["_id"], "_source": d.get("_source", {})} for d in res["docs"] if d.get("found")]
+                missing = [news_id for news_id in ids if news_id not in {row["_id"] for row in chunk}]
 
+                count += process_chunk(db, models, chunk, now) if chunk else 0
+                queue.ack([row["_id"] for row in chunk])
+                queue.nack(missing, "news_raw 문서 없음")
             except Exception as e:
                 db.rollback()
-                logger.error(f"[기사 분류 실패] news_id={news_id} / {e}")
-                err_article(news_id, e)
-                logger.info(f"기사 분류 실패 에러로그 저장 완료 - {news_id}")
-                es.update(
-                    index=ES_INDEX,
-                    id=news_id,
-                    body={
-                        "doc": {
-                            "classified": True,
-                            "classified_reason": "error"
-                        }
-                    }
-                )
-                continue
+                logger.error(f"[NPTI 대기열] 묶음 처리 실패 {len(ids)}건 -> 재시도 예정 / {e}")
+                queue.nack(ids, str(e))
+
         if count > 0:
-            logger.info(f"NPTI 신규 기사 {count}건 분류 완료")
+            logger.info(f"[NPTI 대기열] 신규 기사 {count}건 분류 완료 (대기열 {queue.stats()})")
 
     except Exception as e:
-        logger.error(f"[news_NPTI.py] 기사 NPTI 전체 프로세스(joblib) 에러: {e}")
-        err_article(news_id if 'news_id' in locals() else "BATCH", e)
-        logger.info(f"[news_NPTI.py] 에러 로그 저장 완료")
-        db.rollback()
+        logger.error(f"[news_NPTI.py] NPTI 대기열 처리 에러: {e}")
+        err_article("QUEUE", e)
+    finally:
+        db.close()
+
+
+# =========================
+# 멀티 프로세스 분류 (backfill / 재크롤링처럼 미분류 기사가 많을 때)
+# - 부모 프로세스에서 모델을 먼저 로드한 뒤 fork -> 자식 프로세스는 모델을 copy-on-write로 공유
+# - 정합성 점검 : sliced scroll로 shard를 나눠 워커끼리 같은 기사를 잡지 않음
+# - 대기열 소비 : 대기열 lease가 작업 단위를 나눠줌
+# =========================
+NPTI_WORKERS = int(os.getenv("NPTI_WORKERS", str(max(1, min(4, (os.cpu_count() or 2) - 1)))))
+
+
+def init_npti_worker():
+    # 부모의 MySQL 커넥션을 자식이 같이 쓰지 않도록 새 풀 사용 (ES는 es_client가 프로세스별로 생성)
+    get_engine().dispose(close=False)
+
+
+def _run_worker(target, args):
+    init_npti_worker()
+    target(*args)
+
+
+def run_npti_workers(target, args_list: list):
+    load_joblib()
+    ctx = multiprocessing.get_context("fork")
+    procs = [ctx.Process(target=_run_worker, args=(target, args), name=f"npti-worker-{i}")
+             for i, args in enumerate(args_list)]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join()
+    failed = [p.name for p in procs if p.exitcode != 0]
+    if failed:
+        logger.error(f"[NPTI 워커] 비정상 종료 : {failed}")
+
+
+def classify_npti_parallel(workers: int = None, chunk_size: int = 500, min_age: str = "10m"):
+    workers = workers or NPTI_WORKERS
+    if workers <= 1:
+        return classify_npti_fast(chunk_size, min_age=min_age)
+    logger.info(f"[정합성 점검] NPTI 분류 워커 {workers}개 시작")
+    run_npti_workers(classify_npti_fast, [(chunk_size, i, workers, min_age) for i in range(workers)])
+
+
+def consume_npti_queue_parallel(run_seconds: float = 55, workers: int = None, chunk_size: int = 200):
+    workers = workers or NPTI_WORKERS
+    if workers <= 1:
+        return consume_npti_queue(run_seconds, chunk_size)
+    run_npti_workers(consume_npti_queue, [(run_seconds, chunk_size)] * workers)
+
+
+def iter_chunks(iterable, size: int):
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+# articles_NPTI(MySQL)에만 있고 ES 문서에 npti 필드가 없는 기사 보정 (npti 필터 전환 시 1회 실행)
+def backfill_npti_field(chunk_size: int = 1000):
+    db = SessionLocal()
+    try:
+        rows = db.query(ArticlesNPTI.news_id, ArticlesNPTI.NPTI_code).yield_per(chunk_size)
+        actions = (
+            {
+                "_op_type": "update",
+                "_index": ES_INDEX,
+                "_id": news_id,
+                "doc": {"npti": npti_code, "classified": True}
+            }
+            for news_id, npti_code in rows
+        )
+        success, errors = helpers.bulk(es, actions, chunk_size=chunk_size, raise_on_error=False)
+        logger.info(f"npti 필드 보정 완료: {success}건 / 실패 {len(errors)}건")
+        return success
+    except Exception as e:
+        logger.error(f"npti 필드 보정 실패: {e}")
+        return 0
     finally:
         db.close()
 
 
 if __name__ == "__main__":
-    print("NPTI 분류(joblib) 테스트 시작")
-    classify_npti_fast()
\ No newline at end of file
+    if len(sys.argv) > 1 and sys.argv[1] == "backfill_npti":
+        backfill_npti_field()
+    elif len(sys.argv) > 1 and sys.argv[1] == "classify":
+        # 미분류 기사 전체 분류 : python -m algorithm.news_NPTI classify [워커 수]
+        classify_npti_parallel(int(sys.argv[2]) if len(sys.argv) > 2 else None, min_age="0")
+    else:
+        print("NPTI 분류(joblib) 테스트 시작")
+        classify_npti_fast()
\ No newline at end of file
@@ -1,19 +1,10 @@
 import os
+import threading
 
 import pandas as pd
 import numpy as np
-from sklearn.ensemble import RandomForestClassifier, VotingClassifier, ExtraTreesClassifier, StackingClassifier
-from sklearn.linear_model import LogisticRegression
-from sklearn.neural_network import MLPClassifier
-from sklearn.pipeline import make_pipeline
-from sklearn.preprocessing import StandardScaler
-from xgboost import XGBClassifier
-from sklearn.model_selection import GroupKFold, cross_validate, cross_val_score
-from sklearn.metrics import (
-    make_scorer, precision_score, recall_score, f1_score,
-    roc_auc_score, confusion_matrix, classification_report
-)
 from joblib import dump, load
+# 학습용 라이브러리(xgboost, sklearn 모델/평가 함수)는 웹 서버 시작 시간을 줄이기 위해 각 학습 함수 안에서 import
 
 
 # joblib 저장
@@ -22,6 +13,12 @@ save_dir = os.path.join(base_dir, "saved_models")
 os.makedirs(save_dir, exist_ok=True)
 
 def xgb_training():
+    from xgboost import XGBClassifier
+    from sklearn.model_selection import GroupKFold, cross_validate
+    from sklearn.metrics import (
+        make_scorer, precision_score, recall_score, f1_score,
+        roc_auc_score, confusion_matrix, classification_report
+    )
     # 1. 데이터 로드
     try:
         df = pd.read_csv("second_feature_labeled.csv")
@@ -157,6 +154,13 @@ def xgb_training():
     print(grouped.head())
 
 def voting_training():
+    from xgboost import XGBClassifier
+    from sklearn.ensemble import RandomForestClassifier, VotingClassifier, ExtraTreesClassifier
+    from sklearn.model_selection import GroupKFold, cross_validate
+    from sklearn.metrics import (
+        make_scorer, precision_score, recall_score, f1_score,
+        roc_auc_score, confusion_matrix, classification_report
+    )
     # 1. 데이터 로드
     try:
         df = pd.read_csv("second_feature_labeled.csv")
@@ -315,6 +319,10 @@ def load_and_preprocess():
     return x_train, y_train, x_test, y_test, test_df
 
 def solution_1_basic_stacking():
+    from xgboost import XGBClassifier
+    from sklearn.ensemble import RandomForestClassifier, ExtraTreesClassifier, StackingClassifier
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.metrics import roc_auc_score, classification_report
     print("\n" + "=" * 60)
     print(">>> [솔루션 1] Basic Stacking (안정성 강화 버전)")
     print("=" * 60)
@@ -347,6 +355,9 @@ def solution_1_basic_stacking():
 
 
 def final_best_model():
+    from xgboost import XGBClassifier
+    from sklearn.ensemble import RandomForestClassifier, VotingClassifier, ExtraTreesClassifier
+    from sklearn.metrics import precision_score, recall_score, f1_score
     print("\n" + "=" * 60)
     print(">>> [최종 추천] Improved Voting with Threshold Optimization")
     print("=" * 60)
@@ -449,45 +460,80 @@ def final_best_model():
 #     return {"latest_update_time": latest_update_time}
 
 
-def model_predict_proba(logs:list): # [{},{}] 형태 input
-    model_path = os.path.join(save_dir, "model_read_efficiency.joblib")
-    model = load(model_path)
-    data = pd.DataFrame(logs)
+# 모델 레지스트리 : joblib 파일을 프로세스당 1번만 로드 (파일이 다시 저장되면 자동 재로드)
+READ_EFFICIENCY_MODEL = "model_read_efficiency.joblib"
+_model_registry = {}  # file_name -> (mtime, model)
+_model_lock = threading.Lock()
+
+def get_model(file_name: str = READ_EFFICIENCY_MODEL):
+    model_path = os.path.join(save_dir, file_name)
+    mtime = os.path.getmtime(model_path)
+    cached = _model_registry.get(file_name)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    with _model_lock:
+        cached = _model_registry.get(file_name)
+        if not cached or cached[0] != mtime:
+            print(f"모델 로드 : {file_name}")
+            cached = (mtime, load(model_path))
+            _model_registry[file_name] = cached
+    return cached[1]
+
+
+def model_predict_proba_batch(logs_per_news:list): # [[{},{}],[{},{},{}]] 형태 input (기사별 로그 묶음)
+    sessions = [logs for logs in logs_per_news if logs]
+    if not sessions:
+        return []
+    model = get_model(READ_EFFICIENCY_MODEL)
+    best_th = 0.39
+
+    # 모든 기사의 로그를 한 번에 예측
+    data = pd.DataFrame([log for logs in sessions for log in logs])
     data.rename(columns={"MMF_X_inf":"MMF_x_inf","MMF_Y_inf":"MMF_y_inf","MSF_Y_inf":"MSF_y_inf"}, inplace=True)
     features = ['timestamp', 'MMF_y_inf', 'MMF_x_inf', 'MSF_y_inf', 'mouseX', 'mouseY', 'baseline']
     y_prob = model.predict_proba(data[features])[:, 1]
-    data['pred_prob'] = y_prob
-    best_th = 0.39
 
     # 성능 확인 용 통계 출력 (예측 분포)
-    print(f"전체 로그 수 : {len(data)}개")
-    print(f"확률 예측 로그 수 : {data['pred_prob'].sum()}개")
-    print(f"평균 읽음 확률 : {y_prob.mean():.4f}")
+    print(f"기사 수 : {len(sessions)}개 | 전체 로그 수 : {len(data)}개 | 평균 읽음 확률 : {y_prob.mean():.4f}")
+
+    # 로그별 기사(session) 번호
+    n_session = len(sessions)
+    session_idx = np.repeat(np.arange(n_session), [len(logs) for logs in sessions])
+    timestamp = data['timestamp'].to_numpy(dtype=np.int64)
 
     # timestamp 중복 시 확률 평균값 이용
-    df_unique = data.groupby(['user_id', 'news_id', 'timestamp'], as_index=False)['pred_prob'].mean()
+    keys, inverse = np.unique(np.column_stack([session_idx, timestamp]), axis=0, return_inverse=True)
+    inverse = inverse.reshape(-1)
+    mean_prob = np.bincount(inverse, weights=y_prob) / np.bincount(inverse)
 
     # reading time 및 efficiency 계산
-    result = df_unique.groupby(['user_id', 'news_id']).agg(
-        dwell_time=('timestamp', 'max'),
-        final_read_time=('pred_prob', lambda x: (x >= best_th).sum())
-    ).reset_index()
-
-    result['reading_efficiency'] = result.apply(
-        lambda row: row['final_read_time'] / row['dwell_time'] if row['dwell_time'] > 0 else 0.0,
-        axis=1
-    )
-
-    # 최종 결과 반환
-    # 8. 최종 결과물 출력 (final_best_model 스타일)
-    final_res = result.iloc[0].to_dict()
+    key_session, key_timestamp = keys[:, 0], keys[:, 1]
+    dwell_time = np.zeros(n_session, dtype=np.int64)
+    np.maximum.at(dwell_time, key_session, key_timestamp)
+    final_read_time = np.bincount(key_session, weights=(mean_prob >= best_th), minlength=n_session).astype(np.int64)
+    reading_efficiency = np.divide(final_read_time, dwell_time, out=np.zeros(n_session), where=dwell_time > 0)
+
+    results = []
+    for i, logs in enumerate(sessions):
+        results.append({
+            "user_id": logs[0].get("user_id"),
+            "news_id": logs[0].get("news_id"),
+            "dwell_time": int(dwell_time[i]),
+            "final_read_time": int(final_read_time[i]),
+            "reading_efficiency": float(reading_efficiency[i]),
+        })
+    return results
+
+
+def model_predict_proba(logs:list): # [{},{}] 형태 input (기사 1건)
+    final_res = model_predict_proba_batch([logs])[0]
 
     print(f"===== Analysis Result =====")
     print(f"User ID: {final_res['user_id']}")
     print(f"News ID: {final_res['news_id']}")
     print(f"Dwell Time: {final_res['dwell_time']}")
     print(f"Pred Read Time: {final_res['final_read_time']}s")
-    print(f"News ID: {final_res['reading_efficiency']}")
+    print(f"Reading Efficiency: {final_res['reading_efficiency']}")
 
     return final_res
 
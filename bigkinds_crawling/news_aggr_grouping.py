@@ -1,80 +1,54 @@
-from kiwipiepy import Kiwi
-from matplotlib import pyplot as plt
-from sklearn.metrics.pairwise import cosine_similarity as cosine
+import os
+import time
+from sklearn.preprocessing import normalize
+from scipy import sparse
 import math
 import numpy as np
-from elasticsearch_index.es_aggr import tokens_aggr
-from elasticsearch_index.es_raw import es
+from elasticsearch_index.es_aggr import tokens_aggr, tokens_aggr_from_pos
+from elasticsearch_index.es_raw import es, msearch_news_condition
+from elasticsearch_index.es_client import TIMEOUT_BATCH
 from datetime import datetime
 from logger import Logger
-from sklearn.feature_extraction.text import TfidfVectorizer
+from bigkinds_crawling.news_tfidf import get_news_tfidf, top_terms, compact_vector, vectors_from_compact
 from elasticsearch import helpers
 
 logger = Logger().get_logger(__name__)
 
-def related_news(news_title:str, exclude_id:str, category:str):
-    body = {
-        "size":5,
-        "_source":["news_id","title","pubdate","media","img"],
-        "query":{
-            "bool":{
-                "must":[
-                    {"multi_match":{
-                        "query":news_title,
-                        "fields":["title", "content"]
-                    }}
-                ],
-                "must_not":[
-                    {"term":{"news_id":exclude_id}},
-                ],
-                "filter":[
-                    {"term":{"category":category}},
-                ]
-            }
-        }
-    }
-    try:
-        res = es.search(index="news_raw", body=body)
-        hits = res["hits"]["hits"]
-        results = []
-        for hit in hits:
-            doc = hit["_source"]
-            doc["_score"] = hit["_score"]
-            results.append(doc)
-        return results
-    except Exception as e:
-        logger.info(f"검색 중 에러 발생 : {e}")
-        return None
+# online : 군집을 실행 간 유지하고 새 속보만 배정 (news_stream_cluster) / batch : 최근 1시간 전체 재군집화
+AGGR_MODE = os.getenv("NEWS_AGGR_MODE", "online")
 
-
-kiwi = Kiwi()
 def news_aggr(*args):
-    processed_ids = set()
+    online = AGGR_MODE == "online"
     try:
-        # 1. 처리된 기사 ID 확인
-        query = {
-            "_source": ["news_id"],
-            "size": 10000,
-            "query": {"range": {"timestamp": {"gte": "now-1h", "lte": "now"}}}
-        }
-        es.indices.refresh(index="news_aggr")
-        res = es.search(index="news_aggr", body=query)
-        for hit in res["hits"]["hits"]:
-            processed_ids.add(hit["_source"].get("news_id"))
+        run_started = time.time()
+        if online:
+            from bigkinds_crawling.news_stream_cluster import get_stream_clusterer
+            clusterer = get_stream_clusterer()
+            since = clusterer.since()  # 직전 실행 이후 기사만 조회
+        else:
+            since = "now-1h"
 
-        # 2. Raw 기사 가져오기
+        # 1. Raw 기사 가져오기
         raw_query = {
-            "_source": ["news_id", "title", "content", "tag"],
+            "_source": ["news_id", "title", "content", "tag", "pos"],
             "size": 10000,
-            "query": {"range": {"timestamp": {"gte": "now-1h", "lte": "now"}}}
+            "query": {"range": {"timestamp": {"gte": since, "lte": "now"}}}
         }
         raw_res = es.search(index="news_raw", body=raw_query)
 
+        # 2. 처리된 기사 ID 확인 (news_aggr의 _id = news_id -> 조회한 기사만 mget)
+        candidate_ids = [hit["_source"].get("news_id") for hit in raw_res["hits"]["hits"] if hit["_source"].get("news_id")]
+        processed_ids = set()
+        if candidate_ids:
+            res = es.mget(index="news_aggr", ids=candidate_ids, source=False)
+            processed_ids = {doc["_id"] for doc in res["docs"] if doc.get("found")}
+
         # 리스트 초기화
         breaking_list = []
         norm_list = []
         target_breaking_ids_list = []
         remove_breaking_list = []  # [New] 그룹핑에서 제외할 기사 ID 목록
+        pending_tokens = []  # (item_data, 분석할 문자열)
 
         # ------------------------------------------------------------------
         # [A] 새로운 기사 분류 및 토큰화
@@ -89,10 +63,12 @@ def news_aggr(*args):
                 content_token = str(source.get("content", ""))
                 weighted_token = (title_token + " ") * 3 + content_token
 
-                # 형태소 분석 (숫자 포함 필수)
-                token_result = tokens_aggr(weighted_token, kiwi)
-
-                item_data = {"news_id": news_id, "token": token_result, "tag": tag}
+                # 형태소 분석 (숫자 포함 필수) - 수집 시 저장한 품사 분석 결과가 있으면 재사용
+                item_data = {"news_id": news_id, "token": None, "tag": tag}
+                if source.get("pos"):
+                    item_data["token"] = tokens_aggr_from_pos(source["pos"])
+                else:
+                    pending_tokens.append((item_data, weighted_token))  # 아래에서 한 번에 배치 분석
 
                 if tag == "속보":
                     # [조건] 제목이 본문에 포함된 경우 (부실/중복 속보)
@@ -112,6 +88,11 @@ def news_aggr(*args):
                 elif tag == "일반":
                     norm_list.append(item_data)
 
+        # 품사 분석 결과가 없는 (이전 수집) 기사는 Kiwi 배치 분석
+        if pending_tokens:
+            for (item_data, _), token_result in zip(pending_tokens, tokens_aggr([t for _, t in pending_tokens])):
+                item_data["token"] = token_result
+
         logger.info(f"새로 수집: 속보 {len(breaking_list)}건 (제외대상 {len(remove_breaking_list)}건 포함), 일반 {len(norm_list)}건")
 
         # ------------------------------------------------------------------
@@ -120,7 +101,8 @@ def news_aggr(*args):
         target_breaking_list = []
         is_fallback_mode = False
 
-        if breaking_list:
+        if breaking_list or online:
+            # online 모드는 기존 속보가 군집 상태에 남아 있으므로 신규 속보만 처리
             target_breaking_list = breaking_list
             logger.info(">>> [모드] 신규 속보 데이터 분석")
 
@@ -130,7 +112,7 @@ def news_aggr(*args):
 
             fallback_query = {
                 "size": 10000,
-                "_source": ["news_id", "tokens", "tag"],
+                "_source": ["news_id", "vec_idx", "vec_val", "tokens", "tag"],
                 "query": {
                     "bool": {
                         "must": [
@@ -145,95 +127,57 @@ def news_aggr(*args):
 
             for hit in fallback_res["hits"]["hits"]:
                 src = hit["_source"]
-                tokens_data = src.get("tokens", [])
-                extracted_terms = [t.get("term", "") for t in tokens_data]
-                reconstructed_token_str = " ".join(extracted_terms)
-
-                if reconstructed_token_str.strip():
-                    target_breaking_list.append({
-                        "news_id": src.get("news_id"),
-                        "token": reconstructed_token_str,
-                        "tag": "속보"
-                    })
+                if src.get("vec_idx") or src.get("tokens"):
+                    target_breaking_list.append({"news_id": src.get("news_id"), "tag": "속보", "source": src})
                     target_breaking_ids_list.append(src.get("news_id"))
 
         # ------------------------------------------------------------------
-        # [C] 속보 TF-IDF 계산 (전체 리스트 대상)
+        # [C] 신규 기사 TF-IDF 계산 (누적 IDF 모델 - 실행마다 새로 fit하지 않음)
         # ------------------------------------------------------------------
+        tfidf_model = get_news_tfidf()
         breaking_tfidf = None
-        breaking_actions = []
-
-        if target_breaking_list:
-            breaking_corpus = [item['token'] for item in target_breaking_list]
-
-            # TF-IDF 수행 (여기서는 제외 대상도 포함해서 계산됨)
-            breaking_vectorizer = TfidfVectorizer(ngram_range=(1, 2), sublinear_tf=True, max_features=3000)
-            breaking_tfidf = breaking_vectorizer.fit_transform(breaking_corpus)
-            breaking_features = breaking_vectorizer.get_feature_names_out()
-
-            # [저장 로직] 제외 대상도 Index에는 저장 (Requirement 충족)
+        new_items = breaking_list + norm_list
+
+        if new_items:
+            # 신규 기사만 문서 빈도에 반영 (제외 대상 속보도 포함해서 계산됨)
+            counts, term_names = tfidf_model.count([item['token'] for item in new_items])
+            tfidf_model.partial_fit(counts)
+            new_tfidf = tfidf_model.transform(counts)
+            tfidf_model.save()
             if not is_fallback_mode:
-                for i, item in enumerate(target_breaking_list):
-                    row = breaking_tfidf.getrow(i).toarray().flatten()
-                    tokens_score_list = [
-                        {"term": str(breaking_features[idx]), "score": float(row[idx])}
-                        for idx in range(len(row)) if row[idx] > 0
-                    ]
-                    tokens_score_list = sorted(tokens_score_list, key=lambda x: x['score'], reverse=True)
-
-                    action = {
-                        "_index": "news_aggr", "_id": item['news_id'],
-                        "_source": {
-                            "news_id": item['news_id'], "tokens": tokens_score_list,
-                            "tag": item['tag'], "timestamp": datetime.now().astimezone().isoformat(timespec="seconds")
-                        }
-                    }
-                    breaking_actions.append(action)
-                logger.info(f"신규 속보 저장 대기: {len(breaking_actions)}건")
+                breaking_tfidf = new_tfidf[:len(breaking_list)]
+        if is_fallback_mode and target_breaking_list:
+            # 저장된 벡터를 그대로 사용 (재토큰화 없음) - 이전 형식(tokens) 문서는 단어만 해싱
+            sources = [item['source'] for item in target_breaking_list]
+            if all(src.get("vec_idx") for src in sources):
+                breaking_tfidf = vectors_from_compact(sources)
+            else:
+                breaking_tfidf = sparse.vstack([
+                    vectors_from_compact([src]) if src.get("vec_idx") else tfidf_model.vectors_from_scores([src.get("tokens", [])])
+                    for src in sources
+                ]).tocsr()
 
         # ------------------------------------------------------------------
-        # [D] 일반 기사 TF-IDF 및 저장
+        # [D] 신규 기사(속보 + 일반) 저장 데이터 생성 - 제외 대상도 Index에는 저장
         # ------------------------------------------------------------------
-        norm_actions = []
-        if norm_list:
-            norm_corpus = [item['token'] for item in norm_list]
-            norm_vectorizer = TfidfVectorizer(ngram_range=(1, 2), sublinear_tf=True, max_features=3000)
-            norm_tfidf = norm_vectorizer.fit_transform(norm_corpus)
-            norm_features = norm_vectorizer.get_feature_names_out()
-
-            for i, item in enumerate(norm_list):
-                row = norm_tfidf.getrow(i).toarray().flatten()
-                tokens_score_list = [
-                    {"term": str(norm_features[idx]), "score": float(row[idx])}
-                    for idx in range(len(row)) if row[idx] > 0
-                ]
-                tokens_score_list = sorted(tokens_score_list, key=lambda x: x['score'], reverse=True)
-                action = {
-                    "_index": "news_aggr", "_id": item['news_id'],
-                    "_source": {
-                        "news_id": item['news_id'], "tokens": tokens_score_list,
-                        "tag": item['tag'], "timestamp": datetime.now().astimezone().isoformat(timespec="seconds")
-                    }
+        actions = []
+        timestamp = datetime.now().astimezone().isoformat(timespec="seconds")
+        for i, item in enumerate(new_items):
+            action = {
+                "_index": "news_aggr", "_id": item['news_id'],
+                "_source": {
+                    "news_id": item['news_id'], **compact_vector(new_tfidf, i),
+                    "terms": [t["term"] for t in top_terms(new_tfidf, i, term_names)],
+                    "tag": item['tag'], "timestamp": timestamp
                 }
-                norm_actions.append(action)
-
-        # ------------------------------------------------------------------
-        # [E] ES Bulk 저장
-        # ------------------------------------------------------------------
-        actions = breaking_actions + norm_actions
+            }
+            actions.append(action)
         if actions:
-            success, _ = helpers.bulk(es, actions)
-            logger.info(f"ES Bulk Insert Success: {success}건")
-
-        if not actions and not target_breaking_list:
-            return {"status": "no data to process"}
+            logger.info(f"신규 기사 저장 대기: 속보 {len(breaking_list)}건 / 일반 {len(norm_list)}건")
 
         # ------------------------------------------------------------------
-        # [F] 그룹핑 및 시각화 (속보 대상) - 제외 대상 필터링 적용!
+        # [E] 그룹핑 대상 필터링 - 제외 대상 필터링 적용!
         # ------------------------------------------------------------------
-        final_groups = []
-        groups_1st = []
-
         # [1] 필터링 준비: remove_breaking_list에 없는 기사들만 골라내기
         grouping_target_list = []
         valid_indices = []
@@ -247,26 +191,60 @@ def news_aggr(*args):
 
         logger.info(f"그룹핑 필터링: 전체 {len(target_breaking_list)}건 -> 그룹핑 대상 {len(grouping_target_list)}건")
 
+        if online:
+            # news_aggr 저장(= 처리 완료 표시) 전에 군집 배정 / 상태 저장
+            # -> 저장 전에 작업이 중단되면 다음 실행이 같은 기사를 다시 가져오고, add가 이미 배정된 기사는 건너뜀
+            if grouping_target_list and breaking_tfidf is not None:
+                clusterer.add([item['news_id'] for item in grouping_target_list], breaking_tfidf[valid_indices])
+            clusterer.expire()
+            clusterer.save()
+
+        # ------------------------------------------------------------------
+        # [F] ES Bulk 저장
+        # ------------------------------------------------------------------
+        if actions:
+            success, _ = helpers.bulk(es, actions)
+            logger.info(f"ES Bulk Insert Success: {success}건")
+
+        if not actions and not target_breaking_list and not online:
+            return {"status": "no data to process"}
+
+        # ------------------------------------------------------------------
+        # [G] 그룹핑 및 시각화 (속보 대상)
+        # ------------------------------------------------------------------
+        final_groups = []
+        groups_1st = []
+
         # [2] 그룹핑 실행 (필터링된 리스트 사용)
-        if grouping_target_list and breaking_tfidf is not None:
+        if online:
+            # 신규 속보 배정은 [E]에서 완료 -> 저장까지 끝났으므로 다음 조회 시작 시각(watermark)만 갱신
+            clusterer.last_run = run_started
+            clusterer.save()
+            groups_1st = clusterer.groups()
+            final_groups = clusterer.groups(min_size=2) or groups_1st
+            logger.info(f"속보 온라인 군집화: 군집 {len(groups_1st)}개 / 2건 이상 {len(final_groups)}개")
+
+        elif grouping_target_list and breaking_tfidf is not None:
             logger.info("--- 속보 기사 그룹핑 시작 ---")
 
             # [핵심] TF-IDF 행렬 Slicing: 유효한 행(valid_indices)만 뽑아서 새 행렬 생성
             filtered_tfidf_matrix = breaking_tfidf[valid_indices]
 
-            # 코사인 유사도 계산 (필터링된 행렬 사용)
-            sim_actions = cal_cosine_similarity(filtered_tfidf_matrix, grouping_target_list)
+            # 코사인 유사도 계산 (필터링된 행렬 사용) -> 임계값 이상 기사 쌍(edge) 목록
+            rows, cols, scores = similarity_edges(filtered_tfidf_matrix)
+            news_ids = [item['news_id'] for item in grouping_target_list]
 
             # 1차 그룹핑 (Threshold 0.15)
             # 이유: 짧은 기사는 단어 하나만 달라도 유사도가 낮으므로 진입장벽을 낮춤
-            groups_1st, edges = topic_grouping(sim_actions)
+            groups_idx = topic_grouping(len(news_ids), rows, cols, scores)
+            groups_1st = [[news_ids[i] for i in group] for group in groups_idx]
             logger.info(f"1차 그룹핑 완료: {len(groups_1st)}개 그룹")
 
             # 2차 병합 (Threshold 0.35)
-            # 이유: 뭉쳐진 텍스트는 유사도가 높게 나오므로 엄격하게 검사
-            all_news_dict = {item['news_id']: item for item in grouping_target_list}
+            # 이유: 뭉쳐진 벡터는 유사도가 높게 나오므로 엄격하게 검사
             threshold = 0.35
-            final_groups = merge_similar_groups(groups_1st, all_news_dict, threshold=threshold)
+            merged_idx = merge_similar_groups(groups_idx, filtered_tfidf_matrix, threshold=threshold)
+            final_groups = [[news_ids[i] for i in group] for group in merged_idx]
             logger.info(f"2차 병합 완료: {len(final_groups)}개 그룹")
 
             # 만약 그룹핑 결과가 없으면 개별 ID 리스트로 반환 (단, 필터링된 ID들만)
@@ -274,7 +252,8 @@ def news_aggr(*args):
                 filtered_ids = [item['news_id'] for item in grouping_target_list]
                 final_groups = [[nid] for nid in filtered_ids]
 
-            # # 시각화
+            # # 시각화 (edge 목록은 시각화할 때만 생성)
+            # edges = [(news_ids[i], news_ids[j], s) for i, j, s in zip(rows.tolist(), cols.tolist(), scores.tolist())]
             # time_str = datetime.now().strftime("%Y%m%d_%H%M%S")
             # graph_title = f"final_groups_threshold({threshold})_{time_str}"
             #
@@ -290,10 +269,14 @@ def news_aggr(*args):
               f"first_group : \n{groups_1st}\n"
               f"final_groups(필터링됨) : \n{final_groups}")
 
+        # 그룹별 대표 기사(최신 1건)를 여기서 한 번에 조회 -> /render_breaking은 메모리만 읽음
+        breaking_news = resolve_breaking_headlines(final_groups)
+
         res = {
             "target_breaking_ids_list": target_breaking_ids_list,
             "first_group": groups_1st,
-            "final_group": final_groups
+            "final_group": final_groups,
+            "breaking_news": breaking_news
         }
 
         q = args[-1]
@@ -306,153 +289,156 @@ def news_aggr(*args):
 
 
 
-def cal_cosine_similarity(tfidf_matrix, news_items):
-    sim_matrix = cosine(tfidf_matrix)
+def resolve_breaking_headlines(final_groups):
+    """
+    그룹별 대표 기사(timestamp 최신 1건)의 id, title, timestamp를
+    _msearch 한 번으로 조회하여 바로 응답 가능한 형태로 반환합니다.
+    """
+    if not final_groups:
+        return []
+
+    queries = [{"size": 1, "_source": ["news_id", "title", "timestamp"],
+                "query": {"terms": {"news_id": group}},
+                "sort": [{"timestamp": {"order": "desc"}}]} for group in final_groups]
+    responses = msearch_news_condition(queries, request_timeout=TIMEOUT_BATCH) or []
+
+    headlines = []
+    for res in responses:
+        hits = res.get("hits", {}).get("hits", [])
+        if hits:
+            src = hits[0]["_source"]
+            headlines.append({"id": src["news_id"], "title": src["title"], "timestamp": src.get("timestamp", "")})
+    return headlines
 
-    similarity_actions=[]
-    for i in range(len(news_items)):
-        # 자기 자신을 제외하고 유사도가 높은 순으로 정렬 (예: 상위 5개)
-        # sim_matrix[i]는 i번째 기사와 다른 모든 기사 간의 점수
-        sorted_indices = sim_matrix[i].argsort()[::-1]
 
-        related_news = []
-        for idx in sorted_indices:
-            if i == idx: continue  # 자기 자신 제외
-            score = float(sim_matrix[i][idx])
-            if score < 0.2 : break  # 유사도 임계값 설정
+SIM_THRESHOLD = 0.2     # 기사 간 유사도 임계값
+SIM_BLOCK_SIZE = 256    # 한 번에 계산할 행 수 (메모리 사용량 = 블록 행 수 x 기사 수 이내)
 
-            related_news.append({
-                "news_id": news_items[idx]['news_id'],
-                "score": score
-            })
-            # if len(related_news) >= 5: break  # 상위 5개만 저장
 
-        if related_news:
-            similarity_actions.append({
-                    "news_id": news_items[i]['news_id'],
-                    "related_news": related_news,
-                    "timestamp": datetime.now().isoformat()
-            })
+def similarity_edges(tfidf_matrix, threshold: float = SIM_THRESHOLD, block_size: int = SIM_BLOCK_SIZE):
+    """
+    코사인 유사도가 threshold 이상인 기사 쌍 (i < j)을 희소 행렬 곱으로 구합니다.
+    n x n 전체 행렬을 만들지 않고 block_size 행씩 계산 후 바로 임계값으로 걸러냄
+    Returns: (rows, cols, scores) numpy 배열
+    """
+    matrix = normalize(sparse.csr_matrix(tfidf_matrix), norm="l2", copy=True)
+    matrix_t = matrix.T.tocsr()
+    n = matrix.shape[0]
+    rows, cols, scores = [], [], []
+    for start in range(0, n, block_size):
+        block = (matrix[start:start + block_size] @ matrix_t).tocoo()
+        block_rows = block.row + start
+        keep = (block.data >= threshold) & (block.col > block_rows)  # 자기 자신 / 중복 쌍 제외
+        rows.append(block_rows[keep])
+        cols.append(block.col[keep])
+        scores.append(block.data[keep])
+    if not rows:
+        return np.array([], dtype=np.int64), np.array([], dtype=np.int64), np.array([], dtype=np.float64)
+    return np.concatenate(rows), np.concatenate(cols), np.concatenate(scores)
+
+
+def cal_cosine_similarity(tfidf_matrix, news_items, threshold: float = SIM_THRESHOLD):
+    """기사별 유사 기사 목록 (유사도 높은 순) - similarity_edges 결과를 기사 단위로 묶은 형태"""
+    rows, cols, scores = similarity_edges(tfidf_matrix, threshold)
+
+    related = {}
+    for i, j, score in zip(rows.tolist(), cols.tolist(), scores.tolist()):
+        related.setdefault(i, []).append({"news_id": news_items[j]['news_id'], "score": score})
+        related.setdefault(j, []).append({"news_id": news_items[i]['news_id'], "score": score})
+
+    similarity_actions = []
+    timestamp = datetime.now().isoformat()
+    for i in sorted(related):
+        similarity_actions.append({
+                "news_id": news_items[i]['news_id'],
+                "related_news": sorted(related[i], key=lambda x: x['score'], reverse=True),
+                "timestamp": timestamp
+        })
     return similarity_actions
 
 
+class DisjointSet:
+    """Union-Find (경로 압축 + 크기 기준 합치기) : 연결 요소 찾기를 거의 선형 시간에 처리"""
+
+    def __init__(self, n: int):
+        self.parent = list(range(n))
+        self.size = [1] * n
+
+    def find(self, x: int) -> int:
+        root = x
+        while self.parent[root] != root:
+            root = self.parent[root]
+        while self.parent[x] != root:
+            self.parent[x], x = root, self.parent[x]
+        return root
+
+    def union(self, a: int, b: int):
+        ra, rb = self.find(a), self.find(b)
+        if ra == rb:
+            return
+        if self.size[ra] < self.size[rb]:
+            ra, rb = rb, ra
+        self.parent[rb] = ra
+        self.size[ra] += self.size[rb]
+
+    def groups(self, nodes=None):
+        """연결 요소 목록 (요소 안은 번호 순, 요소끼리는 가장 작은 번호 순)"""
+        result = {}
+        for x in (range(len(self.parent)) if nodes is None else sorted(nodes)):
+            result.setdefault(self.find(x), []).append(x)
+        return list(result.values())
+
+
 # 1. 1차 그룹핑 (기사 간 유사도 기반)
 # ---------------------------------------------------------
-def topic_grouping(news_group):
+def topic_grouping(n: int, rows, cols, scores, min_score: float = 0.15):
     """
-    1차: 기사 간 유사도(Cosine Similarity) 결과를 바탕으로 그래프를 생성하고
-    연결된 컴포넌트(Connected Components)를 찾아 그룹핑합니다.
-    Returns: (groups, edges)
+    1차: 기사 간 유사도 edge(rows[k] - cols[k], scores[k])로 연결된 기사끼리 묶습니다. (Union-Find)
+    유사한 기사가 하나도 없는 기사는 그룹에 포함하지 않음
+    Returns: 기사 번호(행 번호) 그룹 목록
     """
-    adj_list = {}
-    all_nodes = set()
-    edges = []
-
-    for item in news_group:
-        source_id = item['news_id']
-        all_nodes.add(source_id)
-
-        if source_id not in adj_list:
-            adj_list[source_id] = set()
-
-        for rel in item['related_news']:
-            # score 0.15 이상만 유효한 엣지로 간주
-            if rel['score'] >= 0.15:
-                target_id = rel['news_id']
-                all_nodes.add(target_id)
-
-                # 양방향 연결
-                adj_list[source_id].add(target_id)
-                if target_id not in adj_list:
-                    adj_list[target_id] = set()
-                adj_list[target_id].add(source_id)
-
-                # 시각화용 엣지 저장
-                edge = tuple(sorted([source_id, target_id]))
-                if edge not in [e[:2] for e in edges]:
-                    edges.append((edge[0], edge[1], rel['score']))
-
-    # BFS로 그룹 찾기
-    visited = set()
-    groups = []
-
-    for node in all_nodes:
-        if node not in visited:
-            component = []
-            queue = [node]
-            visited.add(node)
-            while queue:
-                curr = queue.pop(0)
-                component.append(curr)
-                if curr in adj_list:
-                    for neighbor in adj_list[curr]:
-                        if neighbor not in visited:
-                            visited.add(neighbor)
-                            queue.append(neighbor)
-            groups.append(component)
-
-    return groups, edges
+    dsu = DisjointSet(n)
+    nodes = set()
+    for i, j, score in zip(rows.tolist(), cols.tolist(), scores.tolist()):
+        # score 0.15 이상만 유효한 엣지로 간주
+        if score >= min_score:
+            dsu.union(i, j)
+            nodes.add(i)
+            nodes.add(j)
+    return dsu.groups(nodes)
 
 
 # ---------------------------------------------------------
 # 2. 2차 그룹핑 (그룹 간 유사도 기반 병합)
 # ---------------------------------------------------------
-def merge_similar_groups(groups, all_news_dict, threshold:float = 0.25):
+def merge_similar_groups(groups, tfidf_matrix, threshold: float = 0.25):
     """
-    2차: 1차로 분류된 그룹들의 전체 텍스트를 합쳐서 다시 TF-IDF를 돌리고,
+    2차: 1차 그룹별로 소속 기사 벡터를 합산해 그룹 벡터를 만들고 (재벡터화 없음),
     그룹 간 유사도가 threshold 이상이면 병합합니다.
     """
     if len(groups) < 2:
         return groups
 
-    # 1. 각 그룹의 텍스트 뭉치기
-    group_texts = []
-    for group in groups:
-        combined_text = []
-        for news_id in group:
-            if news_id in all_news_dict:
-                # tokens_aggr로 이미 토큰화된 문자열을 가져옴
-                token_str = all_news_dict[news_id].get('token', '')
-                combined_text.append(str(token_str))
-        group_texts.append(" ".join(combined_text))
-
-    # 2. 그룹 간 유사도 계산
-    try:
-        vectorizer = TfidfVectorizer()
-        tfidf_matrix = vectorizer.fit_transform(group_texts)
-        sim_matrix = cosine(tfidf_matrix)  # sklearn cosine_similarity
-    except ValueError:
-        # 텍스트가 비어있거나 하는 경우 원본 유지
-        return groups
-
-    # 3. 그룹 간 병합 그래프 생성
-    n_groups = len(groups)
-    adj = {i: set() for i in range(n_groups)}
+    # 1. 그룹 소속 행렬(그룹 수 x 기사 수) @ 기사 벡터 = 그룹별 벡터 합
+    membership = sparse.csr_matrix(
+        (np.ones(sum(len(g) for g in groups)),
+         (np.repeat(np.arange(len(groups)), [len(g) for g in groups]), np.concatenate(groups))),
+        shape=(len(groups), tfidf_matrix.shape[0])
+    )
+    group_matrix = membership @ sparse.csr_matrix(tfidf_matrix)
 
-    for i in range(n_groups):
-        for j in range(i + 1, n_groups):
-            if sim_matrix[i][j] >= threshold:
-                adj[i].add(j)
-                adj[j].add(i)
+    # 2. 그룹 간 유사도 (임계값 이상 쌍만) -> Union-Find로 병합
+    rows, cols, _ = similarity_edges(group_matrix, threshold=threshold)
+    dsu = DisjointSet(len(groups))
+    for i, j in zip(rows.tolist(), cols.tolist()):
+        dsu.union(i, j)
 
-    # 4. BFS로 병합된 그룹 찾기
-    visited = set()
     merged_groups = []
-
-    for i in range(n_groups):
-        if i not in visited:
-            stack = [i]
-            visited.add(i)
-            new_big_group = []
-            while stack:
-                curr_idx = stack.pop()
-                new_big_group.extend(groups[curr_idx])
-                for neighbor in adj[curr_idx]:
-                    if neighbor not in visited:
-                        visited.add(neighbor)
-                        stack.append(neighbor)
-            merged_groups.append(new_big_group)
-
+    for members in dsu.groups():
+        new_big_group = []
+        for idx in members:
+            new_big_group.extend(groups[idx])
+        merged_groups.append(new_big_group)
     return merged_groups
 
 
@@ -463,6 +449,8 @@ def visualize_groups(groups, edges, title:str="News Grouping"):
     """
     그룹 결과를 시각화합니다. 서버 실행 시 plt.show()는 주의해야 합니다.
     """
+    from matplotlib import pyplot as plt  # 시각화할 때만 로드 (서버 시작 시간 단축)
+
     group_centers = []
     node_positions = {}
 
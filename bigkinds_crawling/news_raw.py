@@ -1,39 +1,41 @@
 import hashlib
-import pandas as pd
 import time
-from selenium import webdriver
-from selenium.webdriver.chromium.options import ChromiumOptions
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.wait import WebDriverWait
-from selenium.webdriver.support import expected_conditions as ec
-from kiwipiepy import Kiwi
 from typing import Optional
 from elasticsearch_index.es_raw import es, ES_INDEX
+from elasticsearch_index.es_client import get_async_es, TIMEOUT_FAST
 from datetime import datetime, timezone
 from logger import Logger
 from elasticsearch_index.es_raw import (
     ensure_news_raw, index_sample_row, search_news_row, tokens
 )
 from elasticsearch_index.es_err_crawling import index_error_log
-from sklearn.feature_extraction.text import TfidfVectorizer
-from elasticsearch import helpers
+from work_queue import enqueue_npti
+from elasticsearch import helpers, NotFoundError
 
 logger = Logger().get_logger(__name__)
 
-# 셀레니움 옵션 설정
-options = ChromiumOptions()
-options.add_argument('--remote-allow-origins=*')
-options.add_argument('--start-maximized')
+# 셀레니움 옵션 설정 (selenium은 크롤링할 때만 import -> 웹 서버 시작 시 로드하지 않음)
+def chrome_options():
+    from selenium.webdriver.chromium.options import ChromiumOptions
+    options = ChromiumOptions()
+    options.add_argument('--remote-allow-origins=*')
+    options.add_argument('--start-maximized')
+    return options
 
 ############################################################################### 각 컬럼 값 크롤링하기 전에 초기화
 def news_crawling(max_pages: int):
+    from selenium import webdriver
+    from selenium.webdriver.chrome.service import Service
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.wait import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as ec
+
     ensure_news_raw()
+    options = chrome_options()
     service = Service()
     driver = webdriver.Chrome(service=service, options=options)
     driver.get('https://www.bigkinds.or.kr/v2/news/recentNews.do')
     wait = WebDriverWait(driver, 30)
-    kiwi = Kiwi()
 
     total_samples = []
     page = 1
@@ -120,12 +122,13 @@ def news_crawling(max_pages: int):
                         pass
 
                     # 토큰화 및 저장
-                    token = tokens({"title": title, "content": content}, kiwi)
+                    token = tokens({"title": title, "content": content})
                     timestamp = datetime.now(timezone.utc).isoformat(timespec='milliseconds').replace("+00:00", "Z")
 
                     news_data = {
                         "title_tokens": token["title_tokens"],
                         "content_tokens": token["content_tokens"],
+                        "pos": token["pos"],
                         "writer_tokens": writer,
                         "news_id": news_id, "link": link, "title": title,
                         "media": media, "category": category, "writer": writer,
@@ -135,6 +138,7 @@ def news_crawling(max_pages: int):
 
                     sample.append(news_data)
                     index_sample_row(news_data)  # 개별 인덱싱
+                    enqueue_npti(news_id)  # NPTI 분류 대기열 등록
 
                     # 모달 닫기
                     driver.execute_script("jQuery('#news-detail-modal').modal('hide');")
@@ -175,38 +179,47 @@ def news_crawling(max_pages: int):
 
     return total_samples
 
-def search_article(news_id:str):
-    body = {
-        "query": {
-            "bool":{
-                "filter":[
-                    {"term":{"news_id":news_id}},
-                ]
-            }
-        }
+def to_news_info(src:dict):
+    return {
+        "news_id":src.get("news_id", ""),
+        "title":src.get("title", ""),
+        "content":src.get("content", ""),
+        "writer":src.get("writer", ""),
+        "tag":src.get("tag", ""),
+        "media":src.get("media", ""),
+        "link":src.get("link", ""),
+        "category":src.get("category", ""),
+        "pubdate":src.get("pubdate", ""),
+        "img":src.get("img",""),
+        "imgCap":src.get("imgCap",""),
+        "timestamp":src.get("timestamp", ""),
     }
+
+# 기사 상세 조회 : news_id가 문서 _id이므로 search 대신 GET으로 바로 조회 (없으면 None)
+ARTICLE_SOURCE = ["news_id", "title", "content", "writer", "tag", "media", "link",
+                  "category", "pubdate", "img", "imgCap", "timestamp"]
+
+def search_article(news_id:str):
     try :
-        res = es.search(index=ES_INDEX, body=body)
-        hits = res["hits"]["hits"]
-        if len(hits)>0:
-            src = hits[0]["_source"]
-        news_info = {
-            "news_id":src.get("news_id", ""),
-            "title":src.get("title", ""),
-            "content":src.get("content", ""),
-            "writer":src.get("writer", ""),
-            "tag":src.get("tag", ""),
-            "media":src.get("media", ""),
-            "link":src.get("link", ""),
-            "category":src.get("category", ""),
-            "pubdate":src.get("pubdate", ""),
-            "img":src.get("img",""),
-            "imgCap":src.get("imgCap",""),
-            "timestamp":src.get("timestamp", ""),
-        }
-        return news_info
+        res = es.options(request_timeout=TIMEOUT_FAST).get(index=ES_INDEX, id=news_id, source_includes=ARTICLE_SOURCE)
+        return to_news_info(res["_source"])
+    except NotFoundError:
+        logger.info(f"{news_id}에 해당하는 기사가 없습니다")
+        return None
+    except Exception as e:
+        logger.error(f"{news_id} 기사 조회 오류 : {e}")
+        return None
+
+# async def 핸들러용 (이벤트 루프를 막지 않도록 AsyncElasticsearch 사용)
+async def search_article_async(news_id:str):
+    try :
+        res = await get_async_es().options(request_timeout=TIMEOUT_FAST).get(index=ES_INDEX, id=news_id, source_includes=ARTICLE_SOURCE)
+        return to_news_info(res["_source"])
+    except NotFoundError:
+        logger.info(f"{news_id}에 해당하는 기사가 없습니다")
+        return None
     except Exception as e:
-        logger.error(f"{news_id}에 해당하는 기사가 없습니다 : {e}")
+        logger.error(f"{news_id} 기사 조회 오류 : {e}")
         return None
 
 
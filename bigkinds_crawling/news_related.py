@@ -0,0 +1,90 @@
+# <연관 기사 검색 - 웹 요청 경로용>
+# news_aggr_grouping(scipy / sklearn / TF-IDF)을 import하지 않아도 되도록 분리
+from elasticsearch_index.es_raw import es
+from elasticsearch_index.es_client import get_async_es, TIMEOUT_SEARCH
+from logger import Logger
+
+logger = Logger().get_logger(__name__)
+
+def related_news_body(news_title:str, exclude_id:str, category:str):
+    return {
+        "size":5,
+        "_source":["news_id","title","pubdate","media","img"],
+        "query":{
+            "bool":{
+                "must":[
+                    {"multi_match":{
+                        "query":news_title,
+                        "fields":["title", "content"]
+                    }}
+                ],
+                "must_not":[
+                    {"term":{"news_id":exclude_id}},
+                ],
+                "filter":[
+                    {"term":{"category":category}},
+                ]
+            }
+        }
+    }
+
+def to_related_list(res):
+    results = []
+    for hit in res["hits"]["hits"]:
+        doc = hit["_source"]
+        doc["_score"] = hit["_score"]
+        results.append(doc)
+    return results
+
+def related_news(news_title:str, exclude_id:str, category:str):
+    try:
+        res = es.options(request_timeout=TIMEOUT_SEARCH).search(index="news_raw", body=related_news_body(news_title, exclude_id, category))
+        return to_related_list(res)
+    except Exception as e:
+        logger.info(f"검색 중 에러 발생 : {e}")
+        return None
+
+# async def 핸들러용 (이벤트 루프를 막지 않도록 AsyncElasticsearch 사용)
+async def related_news_async(news_title:str, exclude_id:str, category:str):
+    try:
+        res = await get_async_es().options(request_timeout=TIMEOUT_SEARCH).search(index="news_raw", body=related_news_body(news_title, exclude_id, category))
+        return to_related_list(res)
+    except Exception as e:
+        logger.info(f"검색 중 에러 발생 : {e}")
+        return None
+
+# 기사 본문 조회 없이 news_id만으로 연관 기사 검색 -> 기사 GET과 동시에 실행 가능
+# - more_like_this : 기준 기사(_id)의 title/content에서 핵심 단어를 뽑아 검색
+# - terms lookup : 기준 기사의 category를 ES가 직접 읽어 같은 카테고리로 필터
+def related_news_by_id_body(news_id:str):
+    return {
+        "size":5,
+        "_source":["news_id","title","pubdate","media","img"],
+        "query":{
+            "bool":{
+                "must":[
+                    {"more_like_this":{
+                        "fields":["title", "content"],
+                        "like":[{"_index":"news_raw", "_id":news_id}],
+                        "min_term_freq":1,
+                        "min_doc_freq":1,
+                        "max_query_terms":25
+                    }}
+                ],
+                "must_not":[
+                    {"term":{"news_id":news_id}},
+                ],
+                "filter":[
+                    {"terms":{"category":{"index":"news_raw", "id":news_id, "path":"category"}}},
+                ]
+            }
+        }
+    }
+
+async def related_news_by_id_async(news_id:str):
+    try:
+        res = await get_async_es().options(request_timeout=TIMEOUT_SEARCH).search(index="news_raw", body=related_news_by_id_body(news_id))
+        return to_related_list(res)
+    except Exception as e:
+        logger.info(f"검색 중 에러 발생 : {e}")
+        return None
@@ -0,0 +1,178 @@
+import os
+import time
+import joblib
+import numpy as np
+from scipy import sparse
+from sklearn.preprocessing import normalize
+from logger import Logger
+from bigkinds_crawling.news_aggr_grouping import DisjointSet, similarity_edges
+
+logger = Logger().get_logger(__name__)
+
+# =========================
+# 속보 온라인 군집화 (news_aggr online 모드)
+# - 군집(중심 벡터 + 소속 기사)을 실행 간 유지하고, 새 속보만 가장 가까운 군집에 배정 / 없으면 새 군집 생성
+# - 배정 후 중심 벡터끼리 유사도가 merge_threshold 이상이면 병합 (기존 2차 병합과 같은 역할)
+# - 군집에 들어온 지 max_age(기본 1시간)가 지난 기사는 군집에서 빼고 중심 벡터를 남은 기사로 다시 계산
+#   (기사가 모두 빠진 군집은 제거 -> 배치 모드와 같은 최근 1시간 기준 유지)
+# - 실행 비용은 새로 들어온 기사 수에만 비례 (1시간 전체 재군집화 없음)
+# =========================
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STATE_PATH = os.getenv("NEWS_CLUSTER_PATH", os.path.join(BASE_DIR, "algorithm", "saved_models", "news_stream_clusters.joblib"))
+
+ASSIGN_THRESHOLD = 0.2   # 기사 -> 군집 배정 (기존 기사 간 유사도 임계값과 동일)
+MERGE_THRESHOLD = 0.35   # 군집 간 병합 (기존 2차 병합 임계값과 동일)
+MAX_AGE = 3600           # 군집 유지 시간(초)
+OVERLAP = 120            # 신규 기사 조회 시 직전 실행 시각보다 앞당겨 볼 시간(초) - 색인 지연 보정
+STATE_VERSION = 2        # 저장 형식 (기사별 추가 시각 / 벡터 보관)
+
+
+class StreamClusterer:
+    def __init__(self, assign_threshold: float = ASSIGN_THRESHOLD, merge_threshold: float = MERGE_THRESHOLD,
+                 max_age: float = MAX_AGE):
+        self.assign_threshold = assign_threshold
+        self.merge_threshold = merge_threshold
+        self.max_age = max_age
+        # cid -> {"vector": 1 x n_features 합 벡터, "vectors": 기사별 벡터(members 순서), "members": [news_id],
+        #         "added_at": [기사별 추가 시각(초)], "updated_at": 초}
+        self.clusters = {}
+        self.next_id = 0
+        self.last_run = None
+        self.version = STATE_VERSION
+
+    def since(self):
+        """신규 기사 조회 시작 시각 (epoch millis) - 처음이면 max_age 전부터"""
+        now = time.time()
+        start = now - self.max_age if self.last_run is None else max(self.last_run - OVERLAP, now - self.max_age)
+        return int(start * 1000)
+
+    def _new_cluster(self, n_features, now):
+        cid = self.next_id
+        self.next_id += 1
+        self.clusters[cid] = {"vector": sparse.csr_matrix((1, n_features)), "vectors": sparse.csr_matrix((0, n_features)),
+                              "members": [], "added_at": [], "updated_at": now}
+        return cid
+
+    def member_ids(self) -> set:
+        return {news_id for c in self.clusters.values() for news_id in c["members"]}
+
+    def add(self, news_ids: list, tfidf_matrix, now: float = None):
+        """새 기사 n건(행렬 n행)을 군집에 배정 (이미 군집에 있는 기사는 건너뜀 - 재시도 시 중복 방지)"""
+        now = now or time.time()
+        existing = self.member_ids()
+        keep = [i for i, news_id in enumerate(news_ids) if news_id not in existing]
+        if not keep:
+            return
+        news_ids = [news_ids[i] for i in keep]
+        matrix = normalize(sparse.csr_matrix(tfidf_matrix)[keep], norm="l2", copy=True)
+        assigned = np.full(len(news_ids), -1, dtype=np.int64)
+
+        # 1. 기존 군집 중심과 비교 -> 가장 가까운 군집이 임계값 이상이면 배정
+        if self.clusters:
+            cids = list(self.clusters)
+            centroids = normalize(sparse.vstack([self.clusters[c]["vector"] for c in cids]).tocsr(), norm="l2")
+            sims = (matrix @ centroids.T).tocsr()
+            best = np.asarray(sims.argmax(axis=1)).ravel()
+            best_score = sims.max(axis=1).toarray().ravel()
+            for i in np.where(best_score >= self.assign_threshold)[0]:
+                assigned[i] = cids[best[i]]
+
+        # 2. 배정되지 않은 기사끼리 묶어서 새 군집 생성
+        rest = np.where(assigned < 0)[0]
+        if len(rest):
+            rows, cols, _ = similarity_edges(matrix[rest], threshold=self.assign_threshold)
+            dsu = DisjointSet(len(rest))
+            for i, j in zip(rows.tolist(), cols.tolist()):
+                dsu.union(i, j)
+            for group in dsu.groups():
+                cid = self._new_cluster(matrix.shape[1], now)
+                assigned[rest[group]] = cid
+
+        # 3. 군집 벡터 / 소속 기사 갱신
+        for cid in np.unique(assigned).tolist():
+            idx = np.where(assigned == cid)[0]
+            cluster = self.clusters[cid]
+            cluster["vector"] = (cluster["vector"] + sparse.csr_matrix(np.ones((1, len(idx)))) @ matrix[idx]).tocsr()
+            cluster["vectors"] = sparse.vstack([cluster["vectors"], matrix[idx]]).tocsr() if cluster["members"] else matrix[idx]
+            cluster["members"].extend(news_ids[i] for i in idx)
+            cluster["added_at"].extend([now] * len(idx))
+            cluster["updated_at"] = now
+
+        self._merge()
+
+    def _merge(self):
+        if len(self.clusters) < 2:
+            return
+        cids = list(self.clusters)
+        vectors = sparse.vstack([self.clusters[c]["vector"] for c in cids]).tocsr()
+        rows, cols, _ = similarity_edges(vectors, threshold=self.merge_threshold)
+        if not len(rows):
+            return
+        dsu = DisjointSet(len(cids))
+        for i, j in zip(rows.tolist(), cols.tolist()):
+            dsu.union(i, j)
+        for group in dsu.groups():
+            if len(group) < 2:
+                continue
+            keep = self.clusters[cids[group[0]]]
+            for k in group[1:]:
+                other = self.clusters.pop(cids[k])
+                keep["vector"] = (keep["vector"] + other["vector"]).tocsr()
+                keep["vectors"] = sparse.vstack([keep["vectors"], other["vectors"]]).tocsr()
+                keep["members"].extend(other["members"])
+                keep["added_at"].extend(other["added_at"])
+                keep["updated_at"] = max(keep["updated_at"], other["updated_at"])
+
+    def expire(self, now: float = None):
+        """추가된 지 max_age가 지난 기사를 군집에서 빼고, 남은 기사로 중심 벡터 재계산 (빈 군집은 제거)"""
+        now = now or time.time()
+        removed, stale = 0, []
+        for cid, c in self.clusters.items():
+            alive = [i for i, t in enumerate(c["added_at"]) if now - t <= self.max_age]
+            if len(alive) == len(c["members"]):
+                continue
+            removed += len(c["members"]) - len(alive)
+            if not alive:
+                stale.append(cid)
+                continue
+            c["members"] = [c["members"][i] for i in alive]
+            c["added_at"] = [c["added_at"][i] for i in alive]
+            c["vectors"] = c["vectors"][alive]
+            c["vector"] = (sparse.csr_matrix(np.ones((1, len(alive)))) @ c["vectors"]).tocsr()
+            c["updated_at"] = max(c["added_at"])
+        for cid in stale:
+            del self.clusters[cid]
+        if removed:
+            logger.info(f"속보 군집 기사 {removed}건 만료 / 군집 {len(stale)}개 제거 (남은 군집 {len(self.clusters)}개)")
+
+    def groups(self, min_size: int = 1):
+        """군집 소속 기사 목록 (최근 갱신된 군집 순)"""
+        ordered = sorted(self.clusters.values(), key=lambda c: c["updated_at"], reverse=True)
+        return [list(c["members"]) for c in ordered if len(c["members"]) >= min_size]
+
+    def save(self, path: str = STATE_PATH):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + ".tmp"
+        joblib.dump(self, tmp_path)
+        os.replace(tmp_path, path)
+
+
+_clusterer = None
+
+def get_stream_clusterer() -> StreamClusterer:
+    global _clusterer
+    if _clusterer is None:
+        if os.path.exists(STATE_PATH):
+            try:
+                loaded = joblib.load(STATE_PATH)
+                if getattr(loaded, "version", 1) != STATE_VERSION:
+                    logger.info("속보 군집 상태 형식이 달라 새로 시작합니다.")
+                else:
+                    _clusterer = loaded
+                    _clusterer.expire()
+                    logger.info(f"속보 군집 상태 로드 (군집 {len(_clusterer.clusters)}개)")
+            except Exception as e:
+                logger.error(f"속보 군집 상태 로드 실패 -> 새로 시작 : {e}")
+        if _clusterer is None:
+            _clusterer = StreamClusterer()
+    return _clusterer
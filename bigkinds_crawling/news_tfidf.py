@@ -0,0 +1,168 @@
+import os
+import time
+from collections import Counter
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.preprocessing import normalize
+from sklearn.utils import murmurhash3_32
+from logger import Logger
+
+logger = Logger().get_logger(__name__)
+
+# =========================
+# news_aggr용 누적 TF-IDF (실행마다 새로 fit하지 않음)
+# - 단어 -> 열 번호 : feature hashing (murmurhash3) -> 사전 없이도 실행 간 같은 단어는 항상 같은 열
+# - IDF : 지금까지 들어온 기사의 문서 빈도(df)를 누적 (half_life 주기로 절반씩 감쇠 -> 최근 기사 비중 유지)
+# - 상태(df, 문서 수)는 파일로 저장해서 프로세스 재시작 후에도 이어서 사용
+# =========================
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STATE_PATH = os.getenv("NEWS_TFIDF_PATH", os.path.join(BASE_DIR, "algorithm", "saved_models", "news_aggr_df.npz"))
+
+N_FEATURES = 2 ** 20
+HALF_LIFE_HOURS = 24
+TOP_TERMS = 10  # news_aggr에 저장할 기사별 상위 단어 수 (확인용 - 유사도 계산은 vec_idx / vec_val 사용)
+
+
+class HashingTfidf:
+    def __init__(self, path: str = STATE_PATH, n_features: int = N_FEATURES,
+                 ngram_range=(1, 2), half_life_hours: float = HALF_LIFE_HOURS):
+        self.path = path
+        self.n_features = n_features
+        self.half_life = half_life_hours * 3600
+        # TfidfVectorizer와 같은 전처리 / 토큰 규칙 (소문자, 2글자 이상 단어, n-gram)
+        self.analyzer = HashingVectorizer(ngram_range=ngram_range).build_analyzer()
+        self.df = np.zeros(n_features, dtype=np.float64)
+        self.n_docs = 0.0
+        self.updated_at = time.time()
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            logger.info(f"TF-IDF 누적 상태 없음 -> 새로 시작 ({self.path})")
+            return
+        try:
+            state = np.load(self.path)
+            if int(state["n_features"]) != self.n_features:
+                logger.warning("TF-IDF 누적 상태의 n_features가 달라 새로 시작합니다.")
+                return
+            self.df = state["df"].astype(np.float64)
+            self.n_docs = float(state["n_docs"])
+            self.updated_at = float(state["updated_at"])
+            logger.info(f"TF-IDF 누적 상태 로드 (문서 수 {self.n_docs:.0f})")
+        except Exception as e:
+            logger.error(f"TF-IDF 누적 상태 로드 실패 -> 새로 시작 : {e}")
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = self.path + ".tmp.npz"
+        np.savez(tmp_path, df=self.df.astype(np.float32), n_docs=self.n_docs,
+                 updated_at=self.updated_at, n_features=self.n_features)
+        os.replace(tmp_path, self.path)
+
+    def term_index(self, term: str) -> int:
+        return abs(murmurhash3_32(term, seed=0)) % self.n_features
+
+    def count(self, docs: list):
+        """
+        토큰 문자열 목록 -> (단어 빈도 CSR 행렬, {열 번호: 단어})
+        열 번호 -> 단어 매핑은 상위 단어를 문자열로 돌려줄 때만 사용
+        """
+        indptr, indices, data = [0], [], []
+        names = {}
+        for doc in docs:
+            counts = Counter(self.analyzer(doc or ""))
+            cols = {}
+            for term, cnt in counts.items():
+                idx = self.term_index(term)
+                cols[idx] = cols.get(idx, 0) + cnt
+                names.setdefault(idx, term)
+            indices.extend(cols.keys())
+            data.extend(cols.values())
+            indptr.append(len(indices))
+        matrix = sparse.csr_matrix(
+            (np.asarray(data, dtype=np.float64), np.asarray(indices, dtype=np.int64), np.asarray(indptr, dtype=np.int64)),
+            shape=(len(docs), self.n_features)
+        )
+        return matrix, names
+
+    def partial_fit(self, counts: sparse.csr_matrix):
+        """새 기사들의 문서 빈도를 누적 (이미 반영한 기사는 다시 넣지 않도록 호출하는 쪽에서 관리)"""
+        now = time.time()
+        decay = 0.5 ** (max(now - self.updated_at, 0) / self.half_life)
+        self.df *= decay
+        self.n_docs *= decay
+        self.updated_at = now
+        if counts.shape[0]:
+            np.add.at(self.df, counts.indices, 1.0)  # 행마다 열 번호가 중복되지 않으므로 = 문서 빈도
+            self.n_docs += counts.shape[0]
+
+    def idf(self, indices: np.ndarray) -> np.ndarray:
+        # sklearn TfidfVectorizer(smooth_idf=True)와 같은 식
+        return np.log((1.0 + self.n_docs) / (1.0 + self.df[indices])) + 1.0
+
+    def transform(self, counts: sparse.csr_matrix) -> sparse.csr_matrix:
+        """단어 빈도 -> sublinear TF * IDF -> 행 단위 L2 정규화"""
+        tfidf = counts.astype(np.float64, copy=True)
+        tfidf.data = (1.0 + np.log(tfidf.data)) * self.idf(tfidf.indices)
+        return l2_normalize(tfidf)
+
+    def vectors_from_scores(self, rows: list) -> sparse.csr_matrix:
+        """(이전 형식) news_aggr에 저장된 [{term, score}, ...] 목록 -> TF-IDF 행렬 (재토큰화 없이 단어를 열 번호로만 변환)"""
+        indptr, indices, data = [0], [], []
+        for tokens in rows:
+            cols = {}
+            for t in tokens:
+                idx = self.term_index(t.get("term", ""))
+                cols[idx] = cols.get(idx, 0.0) + float(t.get("score", 0.0))
+            indices.extend(cols.keys())
+            data.extend(cols.values())
+            indptr.append(len(indices))
+        matrix = sparse.csr_matrix(
+            (np.asarray(data, dtype=np.float64), np.asarray(indices, dtype=np.int64), np.asarray(indptr, dtype=np.int64)),
+            shape=(len(rows), self.n_features)
+        )
+        return l2_normalize(matrix)
+
+
+def compact_vector(matrix: sparse.csr_matrix, row: int, digits: int = 4) -> dict:
+    """CSR 행 1개 -> news_aggr 저장용 압축 형태 (열 번호 / 점수 배열)"""
+    start, end = matrix.indptr[row], matrix.indptr[row + 1]
+    return {
+        "vec_idx": matrix.indices[start:end].tolist(),
+        "vec_val": np.round(matrix.data[start:end], digits).tolist(),
+    }
+
+
+def vectors_from_compact(rows: list, n_features: int = N_FEATURES) -> sparse.csr_matrix:
+    """compact_vector로 저장한 {vec_idx, vec_val} 목록 -> TF-IDF 행렬 (토큰화 / 해싱 없음)"""
+    lengths = [len(r.get("vec_idx") or []) for r in rows]
+    indptr = np.concatenate([[0], np.cumsum(lengths)]).astype(np.int64)
+    indices = np.fromiter((i for r in rows for i in (r.get("vec_idx") or [])), dtype=np.int64, count=int(indptr[-1]))
+    data = np.fromiter((v for r in rows for v in (r.get("vec_val") or [])), dtype=np.float64, count=int(indptr[-1]))
+    matrix = sparse.csr_matrix((data, indices, indptr), shape=(len(rows), n_features))
+    return l2_normalize(matrix)
+
+
+def l2_normalize(matrix: sparse.csr_matrix) -> sparse.csr_matrix:
+    return normalize(matrix, norm="l2", copy=False)
+
+
+def top_terms(matrix: sparse.csr_matrix, row: int, names: dict, k: int = TOP_TERMS):
+    """CSR 행의 indices / data를 직접 읽어 점수 상위 k개 단어 반환 (dense 변환 없음)"""
+    start, end = matrix.indptr[row], matrix.indptr[row + 1]
+    cols, scores = matrix.indices[start:end], matrix.data[start:end]
+    if len(scores) > k:
+        pick = np.argpartition(-scores, k - 1)[:k]
+        cols, scores = cols[pick], scores[pick]
+    order = np.argsort(-scores, kind="stable")
+    return [{"term": names.get(int(cols[i]), ""), "score": float(scores[i])} for i in order if scores[i] > 0]
+
+
+_model = None
+
+def get_news_tfidf() -> HashingTfidf:
+    global _model
+    if _model is None:
+        _model = HashingTfidf()
+    return _model
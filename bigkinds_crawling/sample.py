@@ -2,31 +2,31 @@ import hashlib
 
 import pandas as pd
 from fastapi import FastAPI
-from selenium.webdriver.chromium.options import ChromiumOptions
-from selenium.webdriver.chrome.service import Service
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.wait import WebDriverWait
-from selenium.webdriver.support import expected_conditions as ec
 from logger import Logger
 import time
 from typing import Optional
 from elasticsearch_index.es_sample import ensure_index, index_sample_row, search_news_row, tokens
 from elasticsearch_index.es_sample import es, ES_INDEX
-from kiwipiepy import Kiwi
+from elasticsearch_index.kiwi_client import get_kiwi
 
 
 logger = Logger().get_logger(__name__)
 
 # selenium driver 등록
 driver_path = './driver/chromedriver.exe'
-options = ChromiumOptions()
-options.add_argument('--remote-allow-origins=*')
-options.add_argument('--start-maximized')
 
 ############################################################################### 각 컬럼 값 크롤링하기 전에 초기화
 def sample_crawling(max_pages:int):
-    kiwi = Kiwi()
+    # selenium은 크롤링할 때만 import (웹 서버 시작 시 로드하지 않음)
+    from selenium import webdriver
+    from selenium.webdriver.chrome.service import Service
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.wait import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as ec
+    from bigkinds_crawling.news_raw import chrome_options
+
+    options = chrome_options()
+    kiwi = get_kiwi()
     service = Service()
     driver = webdriver.Chrome(service=service, options=options)
     driver.get('https://www.bigkinds.or.kr/')
@@ -1,89 +1,213 @@
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
-from Naver.naver_crawling import  run_fast_crawl, run_slow_crawl
-from algorithm.news_NPTI import classify_npti_fast, init_npti
-from bigkinds_crawling.news_raw import news_crawling
-from bigkinds_crawling.news_aggr_grouping import news_aggr
+from database import get_engine
+import os
+import time
+import queue
+import threading
 import multiprocessing
 import psutil
 from logger import Logger
 from datetime import datetime, timezone, timedelta
-import inspect
+import importlib
 
 
 logger = Logger().get_logger(__name__)
 
 result_queue = multiprocessing.Queue()
 
-# 1. 하나의 통합된 실행 제어 함수
-def run_job_with_timeout(func, args, timeout, on_success=None):
-    """
-    func: 실행할 함수 (news_crawling 등)
-    args: 함수에 전달할 인자 (튜플 형태)
-    timeout: 제한 시간 (초 단위)
-    """
-    # 별도 프로세스로 작업 시작
+NEEDS_RESULT_QUEUE = ['news_aggr']
+AGGR_MODE = os.getenv("NEWS_AGGR_MODE", "online")  # news_aggr_grouping.AGGR_MODE와 같은 값
 
-    needs_queue = ['news_aggr']
-    if func.__name__ in needs_queue:
-        full_args = args + (result_queue,)
-    else:
-        full_args = args
+# 작업 함수는 "모듈:함수" 문자열로 등록하고 워커 프로세스 안에서 import
+# -> 웹 서버(main) 시작 시 크롤러(selenium) / NPTI 분류기 / 집계(scipy, sklearn) 모듈을 로드하지 않음
+JOB_NEWS_CRAWLING = "bigkinds_crawling.news_raw:news_crawling"
+JOB_NAVER_FAST = "Naver.naver_crawling:run_fast_crawl"
+JOB_NAVER_SLOW = "Naver.naver_crawling:run_slow_crawl"
+JOB_NEWS_AGGR = "bigkinds_crawling.news_aggr_grouping:news_aggr"
+JOB_NPTI_QUEUE = "algorithm.news_NPTI:consume_npti_queue_parallel"
+JOB_NPTI_CLASSIFY = "algorithm.news_NPTI:classify_npti_parallel"
+JOB_STATS_ROLLUP = "db_index.db_article_stats:rollup_recent_raw"
+JOB_NPTI_DAILY_CARRY = "db_index.db_user_npti_daily:carry_forward_job"
+WORKER_MAX_JOBS = 200  # 작업 N회마다 워커 재시작 (메모리 누수 방지)
 
-    p = multiprocessing.Process(target=func, args=full_args)
-    p.start()
-    print(f"{func} 함수 시작")
 
-    # 프로세스가 끝날 때까지 지정된 시간(timeout)만큼 대기
-    p.join(timeout)
+def job_name(func) -> str:
+    return func.rsplit(":", 1)[-1] if isinstance(func, str) else func.__name__
 
-    # 만약 지정된 시간이 지났는데도 프로세스가 살아있다면? (강제 종료 로직)
-    if p.is_alive():
-        print(f"⚠️ [타임아웃] {func.__name__} 작업이 {timeout}초를 초과하여 강제 종료 및 청소를 시작합니다.")
 
-        try:
-            # 부모 프로세스 객체 생성
-            parent = psutil.Process(p.pid)
-            # 자식 프로세스(Chromedriver, Chrome 등)를 재귀적으로 모두 찾음
-            children = parent.children(recursive=True)
+def resolve_job(func):
+    """'모듈:함수' 문자열 -> 함수 (이미 함수면 그대로)"""
+    if not isinstance(func, str):
+        return func
+    module_name, func_name = func.split(":", 1)
+    return getattr(importlib.import_module(module_name), func_name)
 
-            # 1단계: 자식 프로세스(브라우저 등) 먼저 종료
-            for child in children:
-                if child.is_running():
-                    child.terminate()
 
-            # 2단계: 부모 프로세스(파이썬 함수) 종료
+# 프로세스 트리 강제 종료 (Chromedriver, Chrome, NPTI 분류 워커 등 자식까지)
+def kill_process_tree(pid, include_parent=True):
+    try:
+        # 부모 프로세스 객체 생성
+        parent = psutil.Process(pid)
+        # 자식 프로세스(Chromedriver, Chrome 등)를 재귀적으로 모두 찾음
+        children = parent.children(recursive=True)
+
+        # 1단계: 자식 프로세스(브라우저 등) 먼저 종료
+        for child in children:
+            if child.is_running():
+                child.terminate()
+
+        # 2단계: 부모 프로세스(파이썬 함수) 종료
+        targets = children + [parent] if include_parent else children
+        if include_parent:
             parent.terminate()
 
-            # 3단계: 완전히 죽을 때까지 최대 3초 대기 후, 안 죽으면 강제 Kill
-            gone, alive = psutil.wait_procs(children + [parent], timeout=3)
-            for p_alive in alive:
-                p_alive.kill()
+        # 3단계: 완전히 죽을 때까지 최대 3초 대기 후, 안 죽으면 강제 Kill
+        gone, alive = psutil.wait_procs(targets, timeout=3)
+        for p_alive in alive:
+            p_alive.kill()
+    except psutil.NoSuchProcess:
+        pass
+
+
+def reset_inherited_connections():
+    """fork 직후 호출 : 부모의 MySQL 커넥션을 같이 쓰지 않도록 새 풀 사용 (ES 클라이언트는 es_client가 프로세스별로 생성)"""
+    get_engine().dispose(close=False)
 
-        except psutil.NoSuchProcess:
-            pass
+
+def _worker_loop(name, tasks, results):
+    """작업 종류별 상주 프로세스 : 모델 / Kiwi / 커넥션 풀을 한 번 올려두고 작업을 계속 받아서 실행"""
+    reset_inherited_connections() # 작업 모듈(크롤러 / NPTI / 집계) import는 작업 실행 시 resolve_job에서
+    logger.info(f"[워커] {name} 시작 (pid={os.getpid()})")
+    while True:
+        task = tasks.get()
+        if task is None:
+            break
+        func, args = task
+        if job_name(func) in NEEDS_RESULT_QUEUE:
+            args = args + (result_queue,)
+        try:
+            resolve_job(func)(*args)
+            results.put(("ok", None))
+        except Exception as e:
+            logger.error(f"[워커] {name} 작업 에러: {e}")
+            results.put(("error", str(e)))
         finally:
-            p.join()  # 프로세스 자원 반환
-            print(f"✅ [정리완료] {func.__name__} 관련 좀비 프로세스가 모두 제거되었습니다.")
+            # 작업이 남긴 자식 프로세스(브라우저 등) 정리
+            kill_process_tree(os.getpid(), include_parent=False)
+
+
+class WarmWorker:
+    """작업 종류 1개를 담당하는 상주 프로세스 관리 (없거나 죽었으면 다시 띄움)"""
+
+    def __init__(self, name: str, max_jobs: int = WORKER_MAX_JOBS):
+        self.name = name
+        self.max_jobs = max_jobs
+        self.proc = None
+        self.jobs = 0
+        self._lock = threading.Lock()
+
+    def _ensure(self):
+        if self.proc is not None and self.proc.is_alive():
+            return
+        ctx = multiprocessing.get_context("fork")
+        self.tasks = ctx.Queue()
+        self.results = ctx.Queue()
+        self.proc = ctx.Process(target=_worker_loop, args=(self.name, self.tasks, self.results),
+                                name=f"worker-{self.name}", daemon=False)
+        self.proc.start()
+        self.jobs = 0
+
+    def kill(self):
+        if self.proc is not None:
+            kill_process_tree(self.proc.pid)
+            self.proc.join()
+            self.proc = None
+
+    def stop(self, timeout: float = 5):
+        if self.proc is not None and self.proc.is_alive():
+            self.tasks.put(None)
+            self.proc.join(timeout)
+        self.kill()
+
+    def run(self, func, args, timeout):
+        """작업 1건 실행 -> 'ok' / 'error' / 'timeout' / 'died'"""
+        with self._lock:
+            self._ensure()
+            self.jobs += 1
+            self.tasks.put((func, args))
+            deadline = time.monotonic() + timeout
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.kill()
+                    return "timeout"
+                try:
+                    status, _ = self.results.get(timeout=min(1.0, remaining))
+                    break
+                except queue.Empty:
+                    if not self.proc.is_alive():
+                        self.kill()
+                        return "died"
+            if self.jobs >= self.max_jobs:
+                self.stop()
+            return status
+
+
+_workers = {}
+_workers_lock = threading.Lock()
+
+
+def get_worker(name: str) -> WarmWorker:
+    with _workers_lock:
+        if name not in _workers:
+            _workers[name] = WarmWorker(name)
+        return _workers[name]
+
+
+def stop_workers():
+    with _workers_lock:
+        workers = list(_workers.values())
+    for worker in workers:
+        worker.stop()
+    logger.info(f"[워커] 상주 프로세스 {len(workers)}개 종료")
+
+
+# 1. 하나의 통합된 실행 제어 함수
+def run_job_with_timeout(func, args, timeout, on_success=None):
+    """
+    func: 실행할 함수 또는 "모듈:함수" 문자열 (JOB_NEWS_CRAWLING 등)
+    args: 함수에 전달할 인자 (튜플 형태)
+    timeout: 제한 시간 (초 단위)
+    작업은 함수별 상주 프로세스(WarmWorker)에 넘겨서 실행하고,
+    제한 시간을 넘기면 해당 워커를 프로세스 트리째 종료 (다음 실행 때 새로 띄움)
+    """
+    name = job_name(func)
+    print(f"{name} 함수 시작")
+    status = get_worker(name).run(func, args, timeout)
+
+    if status == "timeout":
+        print(f"⚠️ [타임아웃] {name} 작업이 {timeout}초를 초과하여 강제 종료했습니다.")
+        print(f"✅ [정리완료] {name} 관련 좀비 프로세스가 모두 제거되었습니다.")
+    elif status == "died":
+        print(f"⚠️ [비정상 종료] {name} 워커 프로세스가 종료되어 다음 실행 때 다시 시작합니다.")
     else:
-        print(f"✅ [완료] {func.__name__} 작업이 제시간에 종료되었습니다.")
-        # 정상 종료 시 분류 작업 트리거
+        print(f"✅ [완료] {name} 작업이 제시간에 종료되었습니다.")
         if on_success:
             on_success()
 
-# 크롤링 직후 즉시 분류(date job) 트리거
-def trigger_classify_once(scheduler):
-    job_id = "classify_once_pending"
-    if scheduler.get_job(job_id):
-        return
-    scheduler.add_job(
-        classify_npti_fast,
-        trigger="date", #딱 1번 실행
-        run_date=datetime.now() + timedelta(seconds=1),
-        id=job_id,
-        replace_existing=True,  # 혹시 남아있으면 덮어씀
-        misfire_grace_time=60  # 1분 정도 늦어도 실행 허용
-    )
-    logger.info("크롤링 완료 → 즉시 NPTI 분류 1회 예약")
+def init_scheduler_tables():
+    """스케줄러 작업이 쓰는 테이블 / index 확인 (main startup에서 스레드로 실행, 모델은 워커가 처음 쓸 때 로드)"""
+    from algorithm.news_NPTI import add_db
+    from elasticsearch_index.es_aggr import ensure_news_aggr
+    try:
+        add_db() # articles_npti 테이블 확인
+    except Exception as e:
+        logger.error(f"articles_npti 테이블 확인 실패 : {e}")
+    try:
+        ensure_news_aggr() # news_aggr index / 기사 벡터 필드 확인
+    except Exception as e:
+        logger.error(f"news_aggr index 확인 실패 : {e}")
+
 
 def sch_start():
     job_defaults = {
@@ -92,7 +216,6 @@ def sch_start():
     }
     sch = AsyncIOScheduler(job_defaults=job_defaults)
     now = datetime.now(timezone(timedelta(hours=9)))
-    init_npti()
 
     # 5분(300초) 주기지만, 안전을 위해 280초(4분 40초)에 강제 종료하도록 설정
     # 그래야 5분 정각에 새 스케줄러가 시작될 때 충돌이 없습니다.
@@ -103,7 +226,7 @@ def sch_start():
         'interval',
         minutes=5,
         id='news_crawling',
-        args=[news_crawling, (10,), 280, lambda: trigger_classify_once(sch)],
+        args=[JOB_NEWS_CRAWLING, (10,), 280],
         next_run_time=(now + timedelta(seconds=5)).isoformat(timespec="seconds") # 함수명, 인자(튜플), 타임아웃(초)
     )
 
@@ -113,7 +236,7 @@ def sch_start():
         trigger='interval',
         minutes=10,
         id='crawler_naver_fast',
-        args=[run_fast_crawl, (), 540, lambda: trigger_classify_once(sch)],
+        args=[JOB_NAVER_FAST, (), 540],
         next_run_time=(now + timedelta(seconds=10)).isoformat(timespec="seconds")
     )
     # 네이버 크롤러(slow) # 스케줄러 시작 기준 7분 후 첫 실행
@@ -122,28 +245,59 @@ def sch_start():
         trigger='interval',
         minutes=30,
         id='crawler_naver_slow',
-        args=[run_slow_crawl, (), 1680, lambda: trigger_classify_once(sch)],
+        args=[JOB_NAVER_SLOW, (), 1680],
         next_run_time=(now + timedelta(minutes=7)).isoformat(timespec="seconds")
     )
 
     # 2-2. 뉴스 집계 등록
+    # online 모드는 신규 속보만 처리하므로 30초마다 실행 (batch 모드는 기존처럼 5분)
     sch.add_job(
         run_job_with_timeout,
         'interval',
-        minutes=5,
+        seconds=30 if AGGR_MODE == "online" else 300,
         id='news_aggr',
-        args=[news_aggr, (), 290],
+        args=[JOB_NEWS_AGGR, (), 120 if AGGR_MODE == "online" else 290],
         next_run_time=(now + timedelta(seconds=30)).isoformat(timespec="seconds")
     )
 
-    # 기사 NPTI 라벨링 알고리즘 호출
+    # 기사 NPTI 라벨링 - 분류 대기열 소비 (크롤러가 저장 직후 등록한 기사를 55초 동안 계속 처리)
+    sch.add_job(
+        run_job_with_timeout,
+        trigger="interval",
+        seconds=60,
+        id="news_npti_queue",
+        args=[JOB_NPTI_QUEUE, (55,), 90],
+        next_run_time=(now + timedelta(seconds=20)).isoformat(timespec="seconds")
+    )
+
+    # 기사 NPTI 라벨링 - 정합성 점검 (대기열에서 빠진 classified:false 기사 보정)
     sch.add_job(
         run_job_with_timeout,
         trigger="interval",
-        seconds=30,
+        minutes=10,
         id="news_npti_classify",
-        args=[classify_npti_fast, (), 300],  # 5분 타임아웃
+        args=[JOB_NPTI_CLASSIFY, (), 300],  # 5분 타임아웃
         next_run_time=(now + timedelta(seconds=50)).isoformat(timespec="seconds")
     )
 
+    # 기사 통계 롤업 (최근 2일 수집 기사 수 재집계)
+    sch.add_job(
+        run_job_with_timeout,
+        trigger="interval",
+        minutes=5,
+        id="article_stats_rollup",
+        args=[JOB_STATS_ROLLUP, (), 120],
+        next_run_time=(now + timedelta(minutes=1)).isoformat(timespec="seconds")
+    )
+
+    # 회원 NPTI 일별 스냅샷 이월 (날짜가 바뀐 뒤 전날 스냅샷 복사 - 회원 저장 요청에서는 하지 않음)
+    sch.add_job(
+        run_job_with_timeout,
+        trigger="interval",
+        minutes=10,
+        id="user_npti_daily_carry",
+        args=[JOB_NPTI_DAILY_CARRY, (), 120],
+        next_run_time=(now + timedelta(minutes=2)).isoformat(timespec="seconds")
+    )
+
     return sch
\ No newline at end of file
@@ -0,0 +1,209 @@
+import sys
+from collections import Counter
+from datetime import datetime, date, timedelta, timezone
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from logger import Logger
+from database import SessionLocal
+from elasticsearch_index.es_raw import search_news_condition, mget_news
+from elasticsearch_index.es_client import TIMEOUT_BATCH
+
+logger = Logger().get_logger(__name__)
+
+# =========================
+# 기사 통계 롤업 (article_stats_daily) : (날짜, category, npti_code) -> 기사 수
+# - stat_kind = 'raw'  : news_raw 수집 기사 수 (pubdate 기준, npti_code = '')
+#                        -> 스케줄러가 최근 며칠치를 ES에서 다시 집계해 덮어씀
+# - stat_kind = 'npti' : NPTI 분류 기사 수 (분류일 = articles_npti.updated_at 기준)
+#                        -> NPTI 분류(classify_chunk)가 articles_NPTI 저장과 같은 트랜잭션에서 증감 반영
+#                           (재분류된 기사는 이전 (날짜, 코드)에서 빼고 새 (날짜, 코드)에 더함 -> 중복 집계 없음)
+# - /articles_statistics는 news_raw / articles_npti 대신 이 테이블만 조회
+# - 최초 1회 또는 데이터 보정 시 : python -m db_index.db_article_stats backfill [YYYY-MM-DD]
+# =========================
+KIND_RAW = "raw"
+KIND_NPTI = "npti"
+
+CREATE_SQL = text("""
+    CREATE TABLE IF NOT EXISTS article_stats_daily (
+        stat_kind     VARCHAR(10) NOT NULL COMMENT 'raw : 수집(pubdate) / npti : 분류(분류일)',
+        stat_date     DATE NOT NULL,
+        category      VARCHAR(50) NOT NULL DEFAULT '',
+        npti_code     VARCHAR(10) NOT NULL DEFAULT '',
+        article_count INT NOT NULL DEFAULT 0,
+        PRIMARY KEY (stat_kind, stat_date, category, npti_code)
+    ) engine=innodb default charset=utf8mb4
+""")
+
+UPSERT_SQL = text("""
+    INSERT INTO article_stats_daily (stat_kind, stat_date, category, npti_code, article_count)
+    VALUES (:stat_kind, :stat_date, :category, :npti_code, :article_count)
+    ON DUPLICATE KEY UPDATE article_count = article_count + VALUES(article_count)
+""")
+
+# category가 text 타입이라 집계용 임시 keyword 필드 생성 (롤업 갱신 구간에만 사용)
+CATEGORY_RUNTIME = {
+    "category_runtime": {
+        "type": "keyword",
+        "script": {
+            "source": "if (params['_source'].containsKey('category')) { emit(params['_source']['category'].toString()) }"
+        }
+    }
+}
+
+
+def kst_today() -> date:
+    return datetime.now(timezone(timedelta(hours=9))).date()
+
+
+def ensure_article_stats(db: Session):
+    db.execute(CREATE_SQL)
+    db.commit()
+
+
+DECREMENT_SQL = text("""
+    UPDATE article_stats_daily SET article_count = GREATEST(article_count - :article_count, 0)
+    WHERE stat_kind = :stat_kind AND stat_date = :stat_date AND category = :category AND npti_code = :npti_code
+""")
+
+
+def apply_npti_deltas(db: Session, deltas: Counter):
+    """
+    분류 결과 증감 반영 : deltas = {(stat_date, category, npti_code): +n / -n} (commit은 호출한 쪽에서)
+    - 신규 분류 : 분류일 행 +1
+    - 재분류    : 이전 분류일 / 이전 코드 행 -1, 새 분류일 / 새 코드 행 +1 (같으면 0이라 변화 없음)
+    """
+    increments, decrements = [], []
+    for (d, c, n), cnt in deltas.items():
+        if cnt:
+            row = {"stat_kind": KIND_NPTI, "stat_date": d, "category": str(c or ""), "npti_code": n, "article_count": abs(cnt)}
+            (increments if cnt > 0 else decrements).append(row)
+    if increments:
+        db.execute(UPSERT_SQL, increments)
+    if decrements:
+        db.execute(DECREMENT_SQL, decrements)
+
+
+def rollup_raw(db: Session, start: date, end: date):
+    """start ~ end (pubdate) 수집 기사 수를 ES에서 집계해 'raw' 행을 교체합니다."""
+    start_str, end_str = start.strftime('%Y-%m-%d'), end.strftime('%Y-%m-%d')
+    query = {
+        "size": 0,
+        "runtime_mappings": CATEGORY_RUNTIME,
+        "query": {"range": {"pubdate": {"gte": start_str, "lte": end_str, "format": "yyyy-MM-dd"}}},
+        "aggs": {
+            "per_day": {
+                "date_histogram": {"field": "pubdate", "calendar_interval": "day", "format": "yyyy-MM-dd"},
+                "aggs": {"by_category": {"terms": {"field": "category_runtime", "size": 100}}}
+            }
+        }
+    }
+    response = search_news_condition(query)
+    if not response:
+        logger.error(f"article_stats_daily raw 집계 실패 : {start_str} ~ {end_str}")
+        return 0
+
+    rows = []
+    for day_bucket in response['aggregations']['per_day']['buckets']:
+        for cat_bucket in day_bucket['by_category']['buckets']:
+            rows.append({
+                "stat_kind": KIND_RAW,
+                "stat_date": day_bucket['key_as_string'],
+                "category": cat_bucket['key'],
+                "npti_code": "",
+                "article_count": cat_bucket['doc_count'],
+            })
+    try:
+        db.execute(text("""
+            DELETE FROM article_stats_daily
+            WHERE stat_kind = :stat_kind AND stat_date BETWEEN :start AND :end
+        """), {"stat_kind": KIND_RAW, "start": start, "end": end})
+        if rows:
+            db.execute(UPSERT_SQL, rows)
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logger.error(f"article_stats_daily raw 저장 실패 : {e}")
+        return 0
+    logger.info(f"article_stats_daily raw 갱신 : {start_str} ~ {end_str} ({len(rows)}행)")
+    return len(rows)
+
+
+def rollup_recent_raw(days: int = 2):
+    """스케줄러 작업 : 최근 days일(오늘 포함) 수집 기사 수 갱신"""
+    db = SessionLocal()
+    try:
+        end = kst_today()
+        rollup_raw(db, end - timedelta(days=days - 1), end)
+    finally:
+        db.close()
+
+
+def rollup_npti(db: Session, start: date, end: date, chunk_size: int = 1000):
+    """start ~ end (분류일) articles_npti 기준으로 'npti' 행을 다시 계산합니다. (backfill용)"""
+    counter = Counter()
+    rows = db.execute(text("""
+        SELECT news_id, npti_code, DATE(updated_at) AS stat_date
+        FROM articles_npti
+        WHERE updated_at >= :start AND updated_at < :end + INTERVAL 1 DAY
+    """), {"start": start, "end": end}).fetchall()
+    for i in range(0, len(rows), chunk_size):
+        chunk = rows[i:i + chunk_size]
+        categories = mget_news([r.news_id for r in chunk], ["category"], request_timeout=TIMEOUT_BATCH)
+        for r in chunk:
+            category = categories.get(r.news_id, {}).get("category") or ""
+            counter[(r.stat_date, str(category), r.npti_code)] += 1
+    try:
+        db.execute(text("""
+            DELETE FROM article_stats_daily
+            WHERE stat_kind = :stat_kind AND stat_date BETWEEN :start AND :end
+        """), {"stat_kind": KIND_NPTI, "start": start, "end": end})
+        if counter:
+            db.execute(UPSERT_SQL, [
+                {"stat_kind": KIND_NPTI, "stat_date": d, "category": c, "npti_code": n, "article_count": cnt}
+                for (d, c, n), cnt in counter.items()
+            ])
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logger.error(f"article_stats_daily npti 저장 실패 : {e}")
+        return 0
+    logger.info(f"article_stats_daily npti 갱신 : {start} ~ {end} ({len(rows)}건)")
+    return len(rows)
+
+
+def init_article_stats():
+    """서버 시작 시 호출 : 테이블이 없으면 만들고, 비어 있으면 backfill"""
+    db = SessionLocal()
+    try:
+        ensure_article_stats(db)
+        empty = db.execute(text("SELECT 1 FROM article_stats_daily LIMIT 1")).first() is None
+    finally:
+        db.close()
+    if empty:
+        backfill()
+
+
+def backfill(start: date = None, end: date = None):
+    """start(기본 : 6개월 전 1일) ~ end(기본 : 오늘) 롤업을 원본 데이터로 다시 계산합니다."""
+    end = end or kst_today()
+    if start is None:
+        y, m = end.year, end.month - 6
+        while m <= 0:
+            y -= 1
+            m += 12
+        start = date(y, m, 1)
+    db = SessionLocal()
+    try:
+        ensure_article_stats(db)
+        rollup_raw(db, start, end)
+        rollup_npti(db, start, end)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "backfill":
+        start_arg = datetime.strptime(sys.argv[2], '%Y-%m-%d').date() if len(sys.argv) > 2 else None
+        backfill(start_arg)
+    else:
+        print("usage : python -m db_index.db_article_stats backfill [YYYY-MM-DD]")
@@ -1,5 +1,6 @@
 from logger import Logger
 from sqlalchemy import Column, String, DateTime
+from sqlalchemy.orm import Session
 from database import Base
 from datetime import datetime
 
@@ -16,4 +17,12 @@ class ArticlesNPTI(Base):
     article_type = Column(String)
     info_type = Column(String)
     view_type = Column(String)
-    updated_at = Column(DateTime, default=datetime.now)
\ No newline at end of file
+    updated_at = Column(DateTime, default=datetime.now)
+
+
+def get_articles_npti_by_ids(db: Session, news_ids: list):
+    # 여러 기사의 NPTI 분류 결과를 IN 쿼리 한 번으로 조회 -> {news_id: ArticlesNPTI}
+    if not news_ids:
+        return {}
+    rows = db.query(ArticlesNPTI).filter(ArticlesNPTI.news_id.in_(list(news_ids))).all()
+    return {row.news_id: row for row in rows}
\ No newline at end of file
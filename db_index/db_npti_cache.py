@@ -0,0 +1,108 @@
+import threading
+from datetime import datetime
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from logger import Logger
+from database import SessionLocal
+
+logger = Logger().get_logger(__name__)
+
+# =========================
+# NPTI 기준 테이블(npti_type / npti_code / npti_question) 캐시
+# - 거의 바뀌지 않는 데이터이므로 서버 시작 시 1회 로드 후 메모리에서 조회
+# - 테이블 수정 시 invalidate_npti_reference() 또는 load_npti_reference() 호출
+# - version: 로드할 때마다 1씩 증가 (응답/로그에서 캐시 갱신 여부 확인용)
+# =========================
+_lock = threading.Lock()
+_cache = None
+_version = 0
+
+
+def _load(db: Session):
+    types = db.execute(text("""
+        select npti_type, npti_group, npti_kor
+        from npti_type
+        order by npti_group, npti_type
+    """)).mappings().all()
+
+    codes = db.execute(text("""
+        select
+            npti_code,
+            length_type,
+            article_type,
+            info_type AS information_type,
+            view_type,
+            type_nick,
+            type_de
+        from npti_code
+        order by npti_code
+    """)).mappings().all()
+
+    questions = db.execute(text("""
+        select
+            question_id,
+            question_text,
+            npti_axis,
+            target_type,
+            question_ratio,
+            score_rate,
+            created_at
+        from npti_question
+        order by question_id
+    """)).mappings().all()
+
+    types = [dict(r) for r in types]
+    codes = [dict(r) for r in codes]
+    questions = [dict(r) for r in questions]
+    return {
+        "types": types,
+        "type_by_char": {r["npti_type"]: r for r in types},
+        "codes": codes,
+        "code_by_code": {r["npti_code"]: r for r in codes},
+        "questions": questions,
+    }
+
+
+def load_npti_reference(db: Session = None):
+    """DB에서 기준 테이블 3종을 다시 읽어 캐시를 교체하고 새 version을 반환합니다."""
+    global _cache, _version
+    own_session = db is None
+    if own_session:
+        db = SessionLocal()
+    try:
+        data = _load(db)
+        with _lock:
+            _version += 1
+            data["version"] = _version
+            data["loaded_at"] = datetime.now()
+            _cache = data
+        logger.info(f"NPTI 기준 데이터 캐시 로드 완료 (version={_version}, "
+                    f"type {len(data['types'])} / code {len(data['codes'])} / question {len(data['questions'])})")
+        return _version
+    finally:
+        if own_session:
+            db.close()
+
+
+def invalidate_npti_reference():
+    """캐시를 비웁니다. 다음 조회 시 DB에서 다시 로드됩니다."""
+    global _cache
+    with _lock:
+        _cache = None
+    logger.info("NPTI 기준 데이터 캐시 무효화")
+
+
+def get_npti_reference(db: Session = None):
+    cache = _cache
+    if cache is None:
+        load_npti_reference(db)
+        cache = _cache
+    return cache
+
+
+def npti_reference_version():
+    cache = _cache
+    return {
+        "version": cache["version"] if cache else None,
+        "loaded_at": cache["loaded_at"].strftime('%Y-%m-%d %H:%M:%S') if cache else None
+    }
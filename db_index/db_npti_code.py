@@ -1,8 +1,9 @@
 from sqlalchemy.orm import Session
 from logger import Logger
 from pydantic import BaseModel
-from sqlalchemy import text, Column, String
+from sqlalchemy import Column, String
 from database import Base
+from db_index.db_npti_cache import get_npti_reference
 
 logger = Logger().get_logger(__name__)
 
@@ -26,36 +27,9 @@ class NptiCodeTable(Base):
     view_type = Column(String)
 
 def get_all_npti_codes(db: Session):
-    logger.info("npti_code 전체 조회")
-
-    sql = text("""
-        select
-            npti_code,
-            length_type,
-            article_type,
-            info_type AS information_type,
-            view_type,
-            type_nick,
-            type_de
-        from npti_code
-        order by npti_code
-    """)
-    return db.execute(sql).mappings().all()
+    # npti_code는 정적 데이터 -> 캐시에서 조회 (db는 캐시가 비어있을 때 로드용)
+    return get_npti_reference(db)["codes"]
 
 
 def get_npti_code_by_code(db: Session, code: str):
-    logger.info(f"npti_code 단일 조회: {code}")
-
-    sql = text("""
-        select
-            npti_code,
-            length_type,
-            article_type,
-            info_type AS information_type,
-            view_type,
-            type_nick,
-            type_de
-        from npti_code
-        where npti_code = :code
-    """)
-    return db.execute(sql, {"code": code}).mappings().first()
+    return get_npti_reference(db)["code_by_code"].get(code)
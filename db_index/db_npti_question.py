@@ -2,6 +2,7 @@ from sqlalchemy.orm import Session
 from logger import Logger
 from pydantic import BaseModel
 from datetime import datetime
+from db_index.db_npti_cache import get_npti_reference
 
 logger = Logger().get_logger(__name__)
 
@@ -17,33 +18,9 @@ class npti_question_response(BaseModel):
 
 
 def get_all_npti_questions(db: Session):
-    sql = """
-        select
-            question_id,
-            question_text,
-            npti_axis,
-            target_type,
-            question_ratio,
-            score_rate,
-            created_at
-        from npti_question
-        order by question_id
-    """
-    return db.execute(sql).mappings().all()
+    # npti_question은 정적 데이터 -> 캐시에서 조회 (db는 캐시가 비어있을 때 로드용)
+    return get_npti_reference(db)["questions"]
 
 
 def get_npti_questions_by_axis(db: Session, axis: str):
-    sql = """
-        select
-            question_id,
-            question_text,
-            npti_axis,
-            target_type,
-            question_ratio,
-            score_rate,
-            created_at
-        from npti_question
-        where npti_axis = :axis
-        order by question_id
-    """
-    return db.execute(sql, {"axis": axis}).mappings().all()
+    return [r for r in get_npti_reference(db)["questions"] if r["npti_axis"] == axis]
@@ -1,8 +1,9 @@
 from sqlalchemy.orm import Session
 from logger import Logger
 from pydantic import BaseModel
-from sqlalchemy import text, Column, String
+from sqlalchemy import Column, String
 from database import Base
+from db_index.db_npti_cache import get_npti_reference
 
 logger = Logger().get_logger(__name__)
 
@@ -18,31 +19,11 @@ class NptiTypeTable(Base):
     npti_kor = Column(String)
 
 def get_all_npti_type(db: Session):
-    logger.info("npti_type 전체 조회")
-
-    sql = text("""
-            select
-                npti_type,
-                npti_group,
-                npti_kor
-            from npti_type
-            order by npti_group, npti_type
-        """)
-    return db.execute(sql).mappings().all()
+    # npti_type은 정적 데이터 -> 캐시에서 조회 (db는 캐시가 비어있을 때 로드용)
+    return get_npti_reference(db)["types"]
 
 def get_npti_type_by_group(db: Session, group: str):
-    logger.info(f"npti_type 그룹 조회: {group}")
-
-    sql = text("""
-            select
-                npti_type,
-                npti_group,
-                npti_kor
-            from npti_type
-            where npti_group = :group
-            order by npti_type
-        """)
-    return db.execute(sql, {"group": group}).mappings().all()
+    return [r for r in get_npti_reference(db)["types"] if r["npti_group"] == group]
 
 def get_npti_questions_placeholder():
     return []
@@ -5,6 +5,7 @@ from pydantic import BaseModel
 from datetime import datetime
 from sqlalchemy import Column, String, Float, DateTime
 from database import Base
+from db_index.db_user_npti_daily import upsert_daily_snapshot
 
 logger = Logger().get_logger(__name__)
 
@@ -97,6 +98,9 @@ def insert_user_npti(db: Session, params: dict):
         logger.error(f"user_npti 저장 실패: {str(e)}")
         raise e
 
+    # 대시보드용 일별 스냅샷은 회원 저장과 별도 트랜잭션 (실패해도 저장 결과에 영향 없음)
+    upsert_daily_snapshot(db, params)
+
 def finalize_score(val):
     int_val = int(round(val))
     final_val = max(0, min(100, int_val))
@@ -0,0 +1,182 @@
+import sys
+from datetime import datetime, date, timedelta, timezone
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from logger import Logger
+from database import SessionLocal
+
+logger = Logger().get_logger(__name__)
+
+# =========================
+# 회원 NPTI 일별 스냅샷 (user_npti_daily)
+# - 날짜별로 "그날이 끝났을 때 각 회원의 최신 NPTI 코드 + 4축 타입"을 1행씩 저장
+# - insert_user_npti 저장(commit) 후 당일 행을 별도로 upsert (실패해도 회원 저장에는 영향 없음)
+# - 날짜가 바뀌면 직전 스냅샷을 복사(carry forward) : 스케줄러 작업(carry_forward_job)에서만 실행 (요청 경로에서는 하지 않음)
+# - /members_statistics는 user_npti 전체 이력 대신 이 테이블만 조회
+# - 최초 1회 또는 데이터 보정 시 : python -m db_index.db_user_npti_daily backfill [YYYY-MM-DD]
+# =========================
+CREATE_SQL = text("""
+    CREATE TABLE IF NOT EXISTS user_npti_daily (
+        snapshot_date DATE NOT NULL COMMENT '기준 날짜 (해당 일자 종료 시점 상태)',
+        user_id       VARCHAR(50) NOT NULL,
+        npti_code     VARCHAR(10) NOT NULL,
+        length_type   VARCHAR(10) NOT NULL,
+        article_type  VARCHAR(10) NOT NULL,
+        info_type     VARCHAR(10) NOT NULL,
+        view_type     VARCHAR(10) NOT NULL,
+        PRIMARY KEY (snapshot_date, user_id),
+        KEY idx_user_npti_daily_code (snapshot_date, npti_code)
+    ) engine=innodb default charset=utf8mb4
+""")
+
+
+def kst_today() -> date:
+    return datetime.now(timezone(timedelta(hours=9))).date()
+
+
+def ensure_user_npti_daily(db: Session):
+    db.execute(CREATE_SQL)
+    db.commit()
+
+
+CARRY_LOOKBACK_DAYS = 7  # 이월 전에 회원 저장으로 일부 행만 생긴 날짜도 다시 채우도록 최근 N일은 항상 재확인
+
+
+def carry_forward(db: Session, day: date = None):
+    """
+    기준 날짜(day - CARRY_LOOKBACK_DAYS 이전의 마지막 스냅샷 날짜) 다음 날부터 day까지 직전 날짜의 행을 복사합니다.
+    (하루 동안 진단/갱신이 없던 회원도 매일 스냅샷에 포함되도록)
+    - INSERT IGNORE라 이미 있는 행(당일 회원 저장으로 들어간 행)은 유지 -> 여러 번 실행해도 결과 동일
+    """
+    day = day or kst_today()
+    last = db.execute(text("SELECT MAX(snapshot_date) FROM user_npti_daily WHERE snapshot_date <= :base"),
+                      {"base": day - timedelta(days=CARRY_LOOKBACK_DAYS)}).scalar()
+    if last is None:
+        last = db.execute(text("SELECT MIN(snapshot_date) FROM user_npti_daily")).scalar()
+    if last is None or last >= day:
+        return 0
+    copied = 0
+    cur = last
+    while cur < day:
+        nxt = cur + timedelta(days=1)
+        res = db.execute(text("""
+            INSERT IGNORE INTO user_npti_daily
+                (snapshot_date, user_id, npti_code, length_type, article_type, info_type, view_type)
+            SELECT :nxt, user_id, npti_code, length_type, article_type, info_type, view_type
+            FROM user_npti_daily
+            WHERE snapshot_date = :cur
+        """), {"cur": cur, "nxt": nxt})
+        copied += res.rowcount
+        cur = nxt
+    if copied:
+        logger.info(f"user_npti_daily 이월 : {last} -> {day} ({copied}행)")
+    return copied
+
+
+def upsert_daily_snapshot(db: Session, params: dict):
+    """
+    insert_user_npti가 user_npti를 commit한 뒤 호출 : 당일 스냅샷 1행만 upsert해서 commit
+    - 실패(테이블 미생성, lock 대기 등)해도 로그만 남김 -> 다음 이월 / backfill이 보정
+    - 다른 회원 행 이월(carry_forward)은 여기서 하지 않음
+    """
+    updated_at = params.get("updated_at")
+    day = datetime.strptime(updated_at, '%Y-%m-%d %H:%M:%S').date() if isinstance(updated_at, str) \
+        else (updated_at.date() if updated_at else kst_today())
+    try:
+        _upsert_user_row(db, day, params)
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logger.error(f"user_npti_daily 스냅샷 갱신 실패 ({params.get('user_id')}) : {e}")
+
+
+def _upsert_user_row(db: Session, day: date, params: dict):
+    db.execute(text("""
+        INSERT INTO user_npti_daily
+            (snapshot_date, user_id, npti_code, length_type, article_type, info_type, view_type)
+        SELECT :day, :user_id, npti_code, length_type, article_type, info_type, view_type
+        FROM npti_code
+        WHERE npti_code = :npti_code
+        ON DUPLICATE KEY UPDATE
+            npti_code = VALUES(npti_code),
+            length_type = VALUES(length_type),
+            article_type = VALUES(article_type),
+            info_type = VALUES(info_type),
+            view_type = VALUES(view_type)
+    """), {"day": day, "user_id": params.get("user_id"), "npti_code": params.get("npti_code")})
+
+
+def refresh_daily_snapshot(db: Session, day: date = None):
+    """오늘 날짜까지 스냅샷을 채움 (carry_forward_job에서 호출)"""
+    try:
+        copied = carry_forward(db, day)
+        if copied:
+            db.commit()
+    except Exception as e:
+        db.rollback()
+        logger.error(f"user_npti_daily 이월 실패 : {e}")
+
+
+def carry_forward_job():
+    """스케줄러 작업 : 날짜가 바뀐 뒤 전날 스냅샷을 오늘로 이월"""
+    db = SessionLocal()
+    try:
+        refresh_daily_snapshot(db)
+    finally:
+        db.close()
+
+
+def init_user_npti_daily():
+    """서버 시작 시 호출 : 테이블이 없으면 만들고, 비어 있으면 전체 이력으로 backfill"""
+    db = SessionLocal()
+    try:
+        ensure_user_npti_daily(db)
+        empty = db.execute(text("SELECT 1 FROM user_npti_daily LIMIT 1")).first() is None
+    finally:
+        db.close()
+    if empty:
+        backfill()
+
+
+def backfill(start: date = None, end: date = None):
+    """user_npti 전체 이력으로 start ~ end 일별 스냅샷을 다시 계산합니다."""
+    db = SessionLocal()
+    try:
+        ensure_user_npti_daily(db)
+        if start is None:
+            start = db.execute(text("SELECT DATE(MIN(updated_at)) FROM user_npti")).scalar()
+            if start is None:
+                logger.info("user_npti 이력 없음 - backfill 생략")
+                return
+        end = end or kst_today()
+        day = start
+        while day <= end:
+            db.execute(text("DELETE FROM user_npti_daily WHERE snapshot_date = :day"), {"day": day})
+            res = db.execute(text("""
+                INSERT INTO user_npti_daily
+                    (snapshot_date, user_id, npti_code, length_type, article_type, info_type, view_type)
+                SELECT :day, L.user_id, L.npti_code, C.length_type, C.article_type, C.info_type, C.view_type
+                FROM (
+                    SELECT
+                        user_id,
+                        npti_code,
+                        ROW_NUMBER() OVER (PARTITION BY user_id ORDER BY updated_at DESC) as rn
+                    FROM user_npti
+                    WHERE updated_at < :day + INTERVAL 1 DAY
+                ) L
+                JOIN npti_code C ON L.npti_code = C.npti_code
+                WHERE L.rn = 1
+            """), {"day": day})
+            db.commit()
+            logger.info(f"user_npti_daily backfill {day} : {res.rowcount}명")
+            day += timedelta(days=1)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "backfill":
+        start_arg = datetime.strptime(sys.argv[2], '%Y-%m-%d').date() if len(sys.argv) > 2 else None
+        backfill(start_arg)
+    else:
+        print("usage : python -m db_index.db_user_npti_daily backfill [YYYY-MM-DD]")
@@ -1,35 +1,26 @@
 from logger import Logger
-from elasticsearch import Elasticsearch
-from kiwipiepy import Kiwi
+from elasticsearch_index.es_client import es # 공용 elasticsearch 연결 객체 (프로세스별 클라이언트로 위임)
+from elasticsearch_index.es_raw import parse_pos
+from elasticsearch_index.kiwi_client import tokenize_many
 
 logger = Logger().get_logger(__name__)
 
-ES_HOST = "http://localhost:9200"
-ES_USER = "elastic"
-ES_PASS = "elastic"
 ES_INDEX = "news_aggr"
 
-es = Elasticsearch( # elasticsearch 연결 객체 생성
-    ES_HOST,
-    basic_auth=(ES_USER, ES_PASS),
-    verify_certs=False,
-    ssl_show_warn=False # type: ignore
-)
 
-kiwi = Kiwi()
+# 기사 TF-IDF 벡터 (news_tfidf.compact_vector) : 검색하지 않고 _source로만 읽으므로 색인 / doc_values 없음
+VECTOR_FIELDS = {
+    "vec_idx": {"type": "integer", "index": False, "doc_values": False},
+    "vec_val": {"type": "float", "index": False, "doc_values": False},
+    "terms": {"type": "keyword"},  # 상위 단어 몇 개 (확인용)
+}
 
 def ensure_news_aggr():
     body = {
         "mappings": {
             "properties": {
                 "news_id": { "type": "keyword" },
-                "tokens": {
-                    "type": "nested",
-                    "properties": {
-                    "term": { "type": "keyword" },
-                    "score": { "type": "float" }
-                    }
-                },
+                **VECTOR_FIELDS,
                 "tag": {"type" :"keyword"},
                 "timestamp": { "type": "date" },
             }
@@ -40,6 +31,10 @@ def ensure_news_aggr():
         logger.info(f"이미 존재하는 index : {ES_INDEX}")
         cnt = es.count(index=ES_INDEX)["count"]  # raw_news 데이터 수를 cnt 변수에 저장
         logger.info(f"문서 수 : {cnt}")
+        try:
+            es.indices.put_mapping(index=ES_INDEX, properties=VECTOR_FIELDS) # 이전 index에 벡터 필드 추가
+        except Exception as e:
+            logger.error(f"{ES_INDEX} 벡터 필드 추가 오류 : {e}")
         return None
 
     try:
@@ -52,31 +47,36 @@ def ensure_news_aggr():
         logger.error(f"index 생성 오류 : {e}")
 
 
-def tokens_aggr(combined_text: str, kiwi: Kiwi):
-    if not combined_text or not combined_text.strip():
-        return ""
+# 제거할 품사 태그 정의 (튜플 형태)
+# J: 조사, E: 어미, S: 부호 및 숫자(SN 포함),
+# NNB: 의존명사, XP: 접두사, XS: 접미사
+AGGR_EXCLUDE_TAGS = ('J', 'E', 'S', 'NNB', 'XP', 'XS')
 
-    # 1. Kiwi 토큰화
-    tokens = kiwi.tokenize(combined_text)
 
-    # 2. 제거할 품사 태그 정의 (튜플 형태)
-    # J: 조사, E: 어미, S: 부호 및 숫자(SN 포함),
-    # NNB: 의존명사, XP: 접두사, XS: 접미사
-    exclude_tags = ('J', 'E', 'S', 'NNB', 'XP', 'XS')
+def aggr_forms(pairs):
+    # 불용어 품사 제외 (pairs = [(형태, 품사), ...])
+    return [form for form, tag in pairs if not tag.startswith(AGGR_EXCLUDE_TAGS)]
 
-    # 3. 필터링 및 정제
-    # - 불용어 품사 제외
-    # - 단어 길이가 2글자 이상인 것만 유지 (주제 분류 정확도 향상)
-    filtered_tokens = [
-        token.form for token in tokens
-        if not token.tag.startswith(exclude_tags)
-           # and len(token.form) > 1
-    ]
 
-    # 4. 공백으로 구분된 문자열로 결합
-    tokens_list = " ".join(filtered_tokens)
+def tokens_aggr(combined_text, kiwi=None):
+    """문자열 1건 또는 여러 건(list) -> 불용어 품사를 뺀 형태 문자열 (여러 건이면 Kiwi 배치 분석)"""
+    single = isinstance(combined_text, str) or combined_text is None
+    texts = [combined_text or ""] if single else list(combined_text)
 
-    return tokens_list
+    # 1. Kiwi 토큰화 -> 2. 필터링 후 공백으로 구분된 문자열로 결합
+    results = [" ".join(aggr_forms((token.form, token.tag) for token in analyzed))
+               for analyzed in tokenize_many(texts, kiwi)]
+    return results[0] if single else results
+
+
+def tokens_aggr_from_pos(pos: dict):
+    """
+    수집 시 저장한 품사 분석 결과(news_raw.pos)로 tokens_aggr((제목 + " ") * 3 + 본문)과 같은 문자열 생성
+    (형태소 분석을 다시 하지 않음)
+    """
+    title = aggr_forms(parse_pos(pos.get("title", "")))
+    content = aggr_forms(parse_pos(pos.get("content", "")))
+    return " ".join(title * 3 + content)
 
 
 
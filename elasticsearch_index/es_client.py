@@ -0,0 +1,87 @@
+# <elasticsearch 연결 객체(sync / async)를 한 곳에서 생성하고 공유하는 모듈>
+import os
+from elasticsearch import Elasticsearch, AsyncElasticsearch
+from logger import Logger
+
+logger = Logger().get_logger(__name__)
+
+ES_HOST = "http://localhost:9200"
+ES_USER = "elastic"
+ES_PASS = "elastic"
+
+# 커넥션 풀 / 타임아웃 설정
+ES_POOL_SIZE = int(os.getenv("ES_POOL_SIZE", "20"))              # 노드당 keep-alive 커넥션 수
+ES_HTTP_COMPRESS = os.getenv("ES_HTTP_COMPRESS", "1") == "1"     # 요청/응답 gzip 압축
+ES_REQUEST_TIMEOUT = float(os.getenv("ES_REQUEST_TIMEOUT", "10"))  # 기본 요청 타임아웃(초)
+ES_MAX_RETRIES = int(os.getenv("ES_MAX_RETRIES", "2"))
+
+# 호출 유형별 타임아웃(초) - es.options(request_timeout=...)로 개별 호출에 적용
+TIMEOUT_FAST = 3      # 단건 조회 / mget (화면 렌더링)
+TIMEOUT_SEARCH = 10   # 일반 검색
+TIMEOUT_BATCH = 300   # 통계 집계, 배치 작업
+
+_es = None
+_es_pid = None
+_async_es = None
+
+
+def _client_kwargs(pool_size: int = None, http_compress: bool = None, request_timeout: float = None):
+    return {
+        "basic_auth": (ES_USER, ES_PASS),
+        "verify_certs": False,
+        "ssl_show_warn": False,
+        "connections_per_node": pool_size or ES_POOL_SIZE,
+        "http_compress": ES_HTTP_COMPRESS if http_compress is None else http_compress,
+        "request_timeout": request_timeout or ES_REQUEST_TIMEOUT,
+        "max_retries": ES_MAX_RETRIES,
+        "retry_on_timeout": True,
+    }
+
+
+def get_es(**kwargs) -> Elasticsearch:
+    """
+    프로세스 공용 동기 클라이언트를 반환합니다.
+    fork된 자식 프로세스(스케줄러 작업)는 부모의 소켓을 공유하지 않도록 새로 생성합니다.
+    """
+    global _es, _es_pid
+    if _es is None or _es_pid != os.getpid():
+        logger.info(f"ES Client 생성 (pool={kwargs.get('pool_size') or ES_POOL_SIZE})")
+        _es = Elasticsearch(ES_HOST, **_client_kwargs(**kwargs))
+        _es_pid = os.getpid()
+    return _es
+
+
+def get_async_es(**kwargs) -> AsyncElasticsearch:
+    """
+    FastAPI 이벤트 루프에서 사용하는 비동기 클라이언트를 반환합니다.
+    async def 핸들러에서는 이 클라이언트를 await 해야 이벤트 루프가 막히지 않습니다.
+    """
+    global _async_es
+    if _async_es is None:
+        logger.info("Async ES Client 생성")
+        _async_es = AsyncElasticsearch(ES_HOST, **_client_kwargs(**kwargs))
+    return _async_es
+
+
+class _ProcessLocalES:
+    """
+    모듈 변수(es)로 import해도 호출할 때마다 get_es()를 거치는 위임 객체
+    -> 모듈을 fork 전에 import했더라도 자식 프로세스에서는 자기 클라이언트를 사용
+    """
+
+    def __getattr__(self, name):
+        return getattr(get_es(), name)
+
+    def __repr__(self):
+        return f"<process-local ES client (pid={os.getpid()})>"
+
+
+es = _ProcessLocalES() # 공용 elasticsearch 연결 객체 (from elasticsearch_index.es_client import es)
+
+
+async def close_async_es():
+    global _async_es
+    if _async_es is not None:
+        await _async_es.close()
+        _async_es = None
+        logger.info("Async ES Client 종료")
@@ -1,20 +1,11 @@
 from logger import Logger
-from elasticsearch import Elasticsearch
+from elasticsearch_index.es_client import es # 공용 elasticsearch 연결 객체 (프로세스별 클라이언트로 위임)
 from datetime import datetime, timezone
 
 logger = Logger().get_logger(__name__)
 
-ES_HOST = "http://localhost:9200"
-ES_USER = "elastic"
-ES_PASS = "elastic"
 ES_INDEX = "err_crawling"
 
-es = Elasticsearch( # elasticsearch 연결 객체 생성
-    ES_HOST,
-    basic_auth=(ES_USER, ES_PASS),
-    verify_certs=False,
-    ssl_show_warn=False # type: ignore
-)
 
 
 def index_error_log(error_message: str, error_site: str):
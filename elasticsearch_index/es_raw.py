@@ -1,24 +1,12 @@
 # <elasticsearch의 raw_news 생성 & index에 데이터를 추가, 삭제하는 함수 정의>
 from logger import Logger
-from elasticsearch import Elasticsearch
-from kiwipiepy import Kiwi
+from elasticsearch_index.es_client import es, TIMEOUT_FAST, TIMEOUT_SEARCH, TIMEOUT_BATCH # es : 공용 연결 객체 (프로세스별 클라이언트로 위임)
+from elasticsearch_index.kiwi_client import tokenize_many
 
 logger = Logger().get_logger(__name__)
 
-ES_HOST = "http://localhost:9200"
-ES_USER = "elastic"
-ES_PASS = "elastic"
 ES_INDEX = "news_raw"
 
-es = Elasticsearch( # elasticsearch 연결 객체 생성
-    ES_HOST,
-    basic_auth=(ES_USER, ES_PASS),
-    verify_certs=False,
-    ssl_show_warn=False # type: ignore
-)
-
-kiwi = Kiwi()
-
 
 # 기사 meta index
 def ensure_news_raw():
@@ -59,6 +47,8 @@ def ensure_news_raw():
                     "type": "text", "analyzer": "korean_whitespace"
                 },
                 "classified": {"type":"boolean"},
+                "npti": {"type":"keyword"}, # 기사 NPTI 코드 (classify_npti_fast가 기록) -> term 필터용
+                **POS_FIELD,
             }
         }
     }
@@ -67,6 +57,8 @@ def ensure_news_raw():
         logger.info(f"이미 존재하는 index : {ES_INDEX}")
         cnt = es.count(index=ES_INDEX)["count"]  # raw_news 데이터 수를 cnt 변수에 저장
         logger.info(f"문서 수 : {cnt}")
+        ensure_npti_field()
+        ensure_pos_field()
         return None
 
     try:
@@ -79,18 +71,80 @@ def ensure_news_raw():
         logger.error(f"index 생성 오류 : {e}")
 
 
-def tokens(row:dict, kiwi: Kiwi):
-    def analyze_token(text:str):
-        text = row.get(text,"")
-        if not text.strip():
-            return []
+# 기존 index에 npti keyword 필드 추가 (이미 dynamic mapping(text)으로 잡혀 있으면 npti.keyword 사용)
+_npti_field = None
+def ensure_npti_field():
+    global _npti_field
+    try:
+        mapping = es.indices.get_mapping(index=ES_INDEX)[ES_INDEX]["mappings"].get("properties", {})
+        npti_mapping = mapping.get("npti")
+        if npti_mapping is None:
+            es.indices.put_mapping(index=ES_INDEX, properties={"npti": {"type": "keyword"}})
+            logger.info(f"{ES_INDEX} npti keyword 필드 추가")
+            _npti_field = "npti"
+        elif npti_mapping.get("type") == "keyword":
+            _npti_field = "npti"
+        else:
+            _npti_field = "npti.keyword"
+            logger.warning(f"{ES_INDEX} npti 필드가 {npti_mapping.get('type')} 타입 -> npti.keyword로 필터링")
+    except Exception as e:
+        logger.error(f"npti 필드 확인 오류 : {e}")
+    return _npti_field
 
-        tokens = kiwi.tokenize(text)
-        tokens_list = " ".join([token.form for token in tokens])
-        return tokens_list
 
-    return {"title_tokens": analyze_token('title'),
-        "content_tokens": analyze_token('content')}
+def npti_filter(npti_code:str):
+    # NPTI 코드로 기사 필터링하는 term 조건
+    field = _npti_field or ensure_npti_field() or "npti"
+    return {"term": {field: npti_code}}
+
+
+# 수집 시 형태소 분석 결과(품사 포함)를 1번만 저장 -> news_aggr 등은 다시 분석하지 않고 재사용
+# {"title": "형태/품사 형태/품사 ...", "content": "..."} - 검색하지 않으므로 색인 안 함
+POS_FIELD = {"pos": {"type": "object", "enabled": False}}
+
+def ensure_pos_field():
+    try:
+        es.indices.put_mapping(index=ES_INDEX, properties=POS_FIELD)
+    except Exception as e:
+        logger.error(f"pos 필드 확인 오류 : {e}")
+
+
+def pos_string(analyzed) -> str:
+    return " ".join(f"{token.form.replace(' ', '_')}/{token.tag}" for token in analyzed)
+
+
+def parse_pos(pos_str: str):
+    """pos_string 결과 -> [(형태, 품사), ...]"""
+    pairs = []
+    for item in (pos_str or "").split():
+        form, _, tag = item.rpartition("/")
+        pairs.append((form, tag))
+    return pairs
+
+
+def tokens(rows, kiwi=None):
+    """
+    rows : {"title", "content"} 1건 또는 여러 건(list) -> 같은 형태(dict / list)로 반환
+    여러 건이면 제목 / 본문을 한 번에 Kiwi 배치 분석 (작업 스레드 병렬 처리)
+    """
+    single = isinstance(rows, dict)
+    rows = [rows] if single else list(rows)
+    fields = ("title", "content")
+    analyzed = tokenize_many([row.get(field) or "" for row in rows for field in fields], kiwi)
+
+    results = []
+    for k, row in enumerate(rows):
+        result = {"pos": {}}
+        for j, field in enumerate(fields):
+            field_tokens = analyzed[k * len(fields) + j]
+            if not field_tokens:
+                result[f"{field}_tokens"] = []
+                result["pos"][field] = ""
+                continue
+            result[f"{field}_tokens"] = " ".join([token.form for token in field_tokens])
+            result["pos"][field] = pos_string(field_tokens)
+        results.append(result)
+    return results[0] if single else results
 
 
 def index_sample_row(row:dict): # raw_news 데이터를 indexing하는 함수
@@ -111,14 +165,37 @@ def search_news_row(id_:str):
 
 def search_news_condition(search_condition:dict):
     try:
-        result = es.search(index=ES_INDEX, body=search_condition, request_timeout=300)
+        result = es.options(request_timeout=TIMEOUT_BATCH).search(index=ES_INDEX, body=search_condition)
         return result
     except Exception as e:
         logger.error(e)
         return False
 
+# 여러 검색 조건을 한 번의 요청(_msearch)으로 실행 -> 조건 순서대로 응답 리스트 반환
+# request_timeout : 화면 조회는 기본값(TIMEOUT_SEARCH), 배치 작업은 TIMEOUT_BATCH를 넘김
+def msearch_news_condition(search_conditions:list, request_timeout: float = TIMEOUT_SEARCH):
+    searches = []
+    for body in search_conditions:
+        searches.append({"index": ES_INDEX})
+        searches.append(body)
+    try:
+        result = es.options(request_timeout=request_timeout).msearch(searches=searches)
+        return result["responses"]
+    except Exception as e:
+        logger.error(e)
+        return False
 
 
+# 여러 기사를 _id(news_id)로 한 번에 조회 (_mget) -> {news_id: _source} (없는 기사는 제외)
+def mget_news(ids:list, source:list, request_timeout: float = TIMEOUT_FAST):
+    if not ids:
+        return {}
+    try:
+        result = es.options(request_timeout=request_timeout).mget(index=ES_INDEX, ids=list(ids), source=source)
+        return {doc["_id"]: doc.get("_source", {}) for doc in result["docs"] if doc.get("found")}
+    except Exception as e:
+        logger.error(e)
+        return {}
 
 
 if __name__ == "__main__": # 이 파일에서 직접 실행할 때만 아래 내용이 실행되도록 하는 조건문
@@ -1,23 +1,12 @@
 # <elasticsearch의 raw_news 생성 & index에 데이터를 추가, 삭제하는 함수 정의>
 from logger import Logger
-from elasticsearch import Elasticsearch
+from elasticsearch_index.es_client import es # 공용 elasticsearch 연결 객체 (프로세스별 클라이언트로 위임)
 from kiwipiepy import Kiwi
 
-kiwi = Kiwi()
-
 logger = Logger().get_logger(__name__)
 
-ES_HOST = "http://localhost:9200"
-ES_USER = "elastic"
-ES_PASS = "elastic"
 ES_INDEX = "sample_index"
 
-es = Elasticsearch( # elasticsearch 연결 객체 생성
-    ES_HOST,
-    basic_auth=(ES_USER, ES_PASS),
-    verify_certs=False,
-    ssl_show_warn=False # type: ignore
-)
 
 
 def ensure_index():
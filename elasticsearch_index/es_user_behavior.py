@@ -1,21 +1,16 @@
+import asyncio
+import time
 from collections import defaultdict
 
 from logger import Logger
-from elasticsearch import Elasticsearch,helpers
+from elasticsearch import helpers
+from elasticsearch.helpers import async_bulk
+from elasticsearch_index.es_client import es, get_async_es, TIMEOUT_SEARCH # es : 공용 연결 객체 (프로세스별 클라이언트로 위임)
 
 logger = Logger().get_logger(__name__)
 
-ES_HOST = "http://localhost:9200"
-ES_USER = "elastic"
-ES_PASS = "elastic"
 ES_INDEX = "user_behavior"
 
-es = Elasticsearch( # elasticsearch 연결 객체 생성
-    ES_HOST,
-    basic_auth=(ES_USER, ES_PASS),
-    verify_certs=False,
-    ssl_show_warn=False # type: ignore
-)
 
 def ensure_index():
     body = {
@@ -73,6 +68,107 @@ def index_user_behavior(behavior_list:list): # raw_news 데이터를 indexing하
         logger.error(f"ES Indexing 실패: {e}")
         return 0
 
+# =========================
+# /log/behavior 적재 버퍼
+# - 요청 핸들러는 큐에 넣고 바로 응답, 백그라운드 task가 모아서 async bulk 적재
+# - FLUSH_DOCS건이 모이거나 FLUSH_INTERVAL초가 지나면 flush
+# - 큐가 가득 차면(ES 지연/장애) put()이 False를 반환 -> 핸들러에서 503 응답
+# - 서버 종료 시 stop()에서 남은 로그를 모두 적재
+# =========================
+class BehaviorBuffer:
+    def __init__(self, max_pending: int = 5000, flush_docs: int = 1000, flush_interval: float = 1.0,
+                 max_retries: int = 3, put_timeout: float = 0.5):
+        self.max_pending = max_pending        # 큐에 쌓을 수 있는 beacon 수
+        self.flush_docs = flush_docs          # 한 번에 bulk 할 최대 문서 수
+        self.flush_interval = flush_interval  # 최대 대기 시간(초)
+        self.max_retries = max_retries
+        self.put_timeout = put_timeout
+        self._queue = None
+        self._task = None
+
+    def start(self):
+        if self._task is None:
+            self._queue = asyncio.Queue(maxsize=self.max_pending)
+            self._task = asyncio.create_task(self._run())
+            logger.info(f"behavior 적재 버퍼 시작 (flush {self.flush_docs}건 / {self.flush_interval}초)")
+
+    async def put(self, docs: list) -> bool:
+        if not docs:
+            return True
+        if self._queue is None: # 버퍼 미가동(테스트/스크립트 실행) -> 바로 적재
+            return await asyncio.to_thread(index_user_behavior, docs) > 0
+        try:
+            self._queue.put_nowait(docs)
+            return True
+        except asyncio.QueueFull:
+            pass
+        try:
+            await asyncio.wait_for(self._queue.put(docs), timeout=self.put_timeout)
+            return True
+        except asyncio.TimeoutError:
+            logger.warning(f"behavior 버퍼 포화 ({self._queue.qsize()}건 대기) -> 로그 거부")
+            return False
+
+    async def _collect(self):
+        # 첫 beacon이 올 때까지 대기 후, flush_docs / flush_interval 중 먼저 도달할 때까지 모음
+        # 종료 신호(None)를 받으면 (batch, True) 반환
+        docs = await self._queue.get()
+        if docs is None:
+            return [], True
+        batch = list(docs)
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.flush_docs:
+            remain = deadline - time.monotonic()
+            if remain <= 0:
+                break
+            try:
+                docs = await asyncio.wait_for(self._queue.get(), timeout=remain)
+            except asyncio.TimeoutError:
+                break
+            if docs is None:
+                return batch, True
+            batch.extend(docs)
+        return batch, False
+
+    async def _flush(self, batch: list):
+        if not batch:
+            return 0
+        actions = [{"_index": ES_INDEX, "_source": doc} for doc in batch]
+        for attempt in range(1, self.max_retries + 1):
+            try:
+                success, errors = await async_bulk(get_async_es(), actions, raise_on_error=False)
+                if errors:
+                    logger.error(f"ES Bulk Insert 일부 에러 발생: {len(errors)}건 {errors[:3]}")
+                logger.info(f"ES behavior 적재 성공: {success}건")
+                return success
+            except Exception as e:
+                logger.error(f"ES behavior 적재 실패 ({attempt}/{self.max_retries}): {e}")
+                if attempt < self.max_retries:
+                    await asyncio.sleep(min(2 ** attempt, 10))
+        logger.error(f"ES behavior 적재 최종 실패 -> {len(batch)}건 유실")
+        return 0
+
+    async def _run(self):
+        while True:
+            batch, stopping = await self._collect()
+            await self._flush(batch)
+            if stopping:
+                break
+
+    async def stop(self):
+        if self._task is None:
+            return
+        # 종료 신호는 큐 맨 뒤에 들어가므로 앞에 쌓인 로그는 모두 적재된 뒤 종료됨
+        remain = self._queue.qsize()
+        await self._queue.put(None)
+        await self._task
+        logger.info(f"behavior 적재 버퍼 종료 (잔여 beacon {remain}건 적재)")
+        self._task = None
+        self._queue = None
+
+
+behavior_buffer = BehaviorBuffer()
+
 def search_user_behavior(user_id: str, start_timestamp):
     body = {
         "query": {
@@ -95,7 +191,7 @@ def search_user_behavior(user_id: str, start_timestamp):
         "size": 10000
     }
     try:
-        response = es.search(index="user_behavior", body=body)
+        response = es.options(request_timeout=TIMEOUT_SEARCH).search(index="user_behavior", body=body)
 
         # 검색된 문서들의 _source만 리스트로 반환
         hits = response['hits']['hits']
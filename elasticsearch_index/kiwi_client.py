@@ -0,0 +1,36 @@
+# <Kiwi 형태소 분석기를 프로세스당 1개만 생성하고 공유하는 모듈>
+import os
+from logger import Logger
+
+logger = Logger().get_logger(__name__)
+
+# 배치 분석(kiwi.tokenize(리스트)) 시 사용할 작업 스레드 수
+KIWI_WORKERS = int(os.getenv("KIWI_WORKERS", str(max(1, min(4, (os.cpu_count() or 2) - 1)))))
+
+_kiwi = None
+_kiwi_pid = None
+
+
+def get_kiwi():
+    """
+    프로세스 공용 Kiwi를 반환합니다. (처음 호출될 때 생성)
+    fork된 자식 프로세스는 부모의 작업 스레드를 물려받지 못하므로 새로 생성합니다.
+    """
+    global _kiwi, _kiwi_pid
+    if _kiwi is None or _kiwi_pid != os.getpid():
+        from kiwipiepy import Kiwi
+        logger.info(f"Kiwi 생성 (workers={KIWI_WORKERS})")
+        _kiwi = Kiwi(num_workers=KIWI_WORKERS)
+        _kiwi_pid = os.getpid()
+    return _kiwi
+
+
+def tokenize_many(texts: list, kiwi=None) -> list:
+    """여러 문장을 한 번에 분석 (Kiwi 작업 스레드로 병렬 처리) - 빈 문자열은 빈 결과"""
+    kiwi = kiwi or get_kiwi()
+    results = [[] for _ in texts]
+    targets = [i for i, text in enumerate(texts) if text and text.strip()]
+    if targets:
+        for i, analyzed in zip(targets, kiwi.tokenize([texts[i] for i in targets])):
+            results[i] = analyzed
+    return results
@@ -1,36 +1,46 @@
+import startup_profile
+startup_profile.install() # 모듈별 import 시간 측정 (다른 import보다 먼저)
 from fastapi import FastAPI, Depends, Query, Request, Body, HTTPException
 from fastapi.responses import FileResponse
 from starlette.responses import JSONResponse, RedirectResponse, HTMLResponse
 from starlette.staticfiles import StaticFiles
-import pandas as pd
 import asyncio
-from algorithm.user_NPTI import model_predict_proba
-from bigkinds_crawling.scheduler import sch_start, result_queue
-from bigkinds_crawling.sample import sample_crawling, get_sample
+from algorithm.user_NPTI import model_predict_proba_batch, get_model
+from bigkinds_crawling.scheduler import sch_start, stop_workers, result_queue, init_scheduler_tables
 from logger import Logger
+from ttl_cache import TTLCache, RefreshingCache
 from typing import Optional
-from bigkinds_crawling.news_raw import news_crawling, get_news_raw, search_article
-from bigkinds_crawling.news_aggr_grouping import news_aggr, related_news
+from bigkinds_crawling.news_raw import get_news_raw, search_article_async
+from bigkinds_crawling.news_related import related_news_by_id_async
 from sqlalchemy.orm import Session
-from database import get_db
-from db_index.db_npti_type import get_all_npti_type, get_npti_type_by_group, npti_type_response, NptiTypeTable
-from db_index.db_npti_code import get_all_npti_codes, get_npti_code_by_code, npti_code_response, NptiCodeTable
+from database import get_db, SessionLocal
+from db_index.db_npti_type import get_all_npti_type, get_npti_type_by_group, npti_type_response
+from db_index.db_npti_code import get_all_npti_codes, get_npti_code_by_code, npti_code_response
+from db_index.db_npti_cache import get_npti_reference, load_npti_reference, invalidate_npti_reference, \
+    npti_reference_version
 from db_index.db_npti_question import get_all_npti_questions, get_npti_questions_by_axis, npti_question_response
 from db_index.db_user_info import UserCreateRequest, insert_user, authenticate_user, deactivate_user, get_my_page_data, \
     UserInfo, verify_password, UserUpdate, hash_password, get_user_info
 from db_index.db_user_npti import get_user_npti_info, finalize_score
 from sqlalchemy import text
 from starlette.middleware.sessions import SessionMiddleware
-from elasticsearch import Elasticsearch, ConnectionError as ESConnectionError
+from elasticsearch import ConnectionError as ESConnectionError
+from elasticsearch_index.es_client import es, get_async_es, close_async_es, TIMEOUT_SEARCH
 from datetime import timedelta, datetime, timezone
 from db_index.db_user_answers import insert_user_answers
 from db_index.db_user_npti import insert_user_npti
+from db_index.db_user_npti_daily import init_user_npti_daily
+from db_index.db_article_stats import init_article_stats
 import json
-from elasticsearch_index.es_user_behavior import index_user_behavior, search_user_behavior
-from db_index.db_user_npti import UserNPTITable, UserNPTIResponse
-from elasticsearch_index.es_raw import ES_INDEX, search_news_condition
-from db_index.db_articles_NPTI import ArticlesNPTI
+import time
+import base64
+from elasticsearch_index.es_user_behavior import search_user_behavior, behavior_buffer
+from db_index.db_user_npti import UserNPTIResponse
+from elasticsearch_index.es_raw import ES_INDEX, search_news_condition, msearch_news_condition, npti_filter, ensure_npti_field, \
+    mget_news
+from db_index.db_articles_NPTI import get_articles_npti_by_ids
 import math
+import numpy as np
 from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 
@@ -64,17 +74,28 @@ def main():
 async def view_page():
     return FileResponse("view/html/view.html")
 
+# 기사 상세 payload 캐시 (속보 기사에 조회가 몰릴 때 ES 요청 없이 응답)
+article_cache = TTLCache(maxsize=2048, ttl=60, name="article")
+
 @app.get("/article/{news_id}")
 async def get_article(news_id:str):
-    news_info = search_article(news_id)
-    related = related_news(news_info["title"], news_id, news_info["category"])
-    news_info["related_news"] = related
-    print(f"related : {related}")
-    if news_info:
-        return JSONResponse(content=news_info,  status_code=200)
-    else:
+    cached = article_cache.get(news_id)
+    if cached is not None:
+        return JSONResponse(content=cached, status_code=200)
+
+    # 기사 GET과 연관 기사 검색을 동시에 요청
+    news_info, related = await asyncio.gather(
+        search_article_async(news_id),
+        related_news_by_id_async(news_id),
+    )
+    if not news_info:
         return JSONResponse(content=None, status_code=404)
 
+    news_info["related_news"] = related
+    if related is not None: # 연관 기사 검색 실패 시 캐시하지 않음
+        article_cache.set(news_id, news_info)
+    return JSONResponse(content=news_info, status_code=200)
+
 
 # JS의 sendBeacon('/log/behavior') 경로와 일치시킴
 @app.post("/log/behavior")
@@ -108,11 +129,11 @@ async def collect_behavior_log(request: Request):
             }
             processed_docs.append(doc)
 
-        # 4. [저장] ES 인덱싱
+        # 4. [저장] 적재 버퍼에 넣고 바로 응답 (ES bulk는 백그라운드에서 일괄 처리)
         if processed_docs:
-            count = index_user_behavior(processed_docs)
-            print(f"[Log] User:{user_id} | News:{news_id} | {count} 개 데이터 저장 완료")
-            return {"status": "ok", "message": f"{count}개 로그 저장"}
+            if not await behavior_buffer.put(processed_docs):
+                return JSONResponse(status_code=503, content={"status": "busy", "message": "로그 적재 지연 - 잠시 후 재시도"})
+            return {"status": "ok", "message": f"{len(processed_docs)}개 로그 접수"}
         else:
             return {"status": "ok", "message": "저장할 로그 없음"}
 
@@ -125,6 +146,7 @@ async def collect_behavior_log(request: Request):
 def sample(max_pages: int = 90):
     logger.info(f"API 호출: 크롤링 시작 (최대 {max_pages} 페이지)")
     try:
+        from bigkinds_crawling.sample import sample_crawling
         # 비즈니스 로직 호출
         result = sample_crawling(max_pages=max_pages)
         return {"status": "success","count": len(result),"data": result}
@@ -137,6 +159,7 @@ def sample(max_pages: int = 90):
 def sample_csv(q: Optional[str] = None):
     logger.info(f"ES 데이터 요청 수신 (query: {q})")
     try:
+        from bigkinds_crawling.sample import get_sample
         result = get_sample(q)
         if result is None:
             return {"status": "error", "message": "데이터를 가져올 수 없습니다."}
@@ -150,6 +173,7 @@ def sample_csv(q: Optional[str] = None):
 def news_raw(max_pages: int = 5):
     logger.info(f"크롤링 시작: 최대 {max_pages} 페이지")
     try:
+        from bigkinds_crawling.news_raw import news_crawling
         # sample.py의 crawling 함수 호출
         result = news_crawling(max_pages=max_pages)
         return {"status": "success","count": len(result),"data": result}
@@ -168,6 +192,7 @@ async def scheduler_start():
 
 @app.get("/news_aggr")
 def news_aggr_start():
+    from bigkinds_crawling.news_aggr_grouping import news_aggr
     tfid = news_aggr()
     return tfid
 
@@ -196,9 +221,11 @@ async def get_questions(request: Request, db: Session = Depends(get_db)):
     if not request.session.get("user_id"):
         return JSONResponse(status_code=401, content={"message": "로그인 필요"})
 
-    query = text("SELECT question_id, question_text, npti_axis, question_ratio FROM npti_question")
-    result = db.execute(query).fetchall()
-    return [dict(row._mapping) for row in result]
+    # 캐시된 npti_question에서 화면에 필요한 컬럼만 반환
+    return [
+        {k: row[k] for k in ("question_id", "question_text", "npti_axis", "question_ratio")}
+        for row in get_all_npti_questions(db)
+    ]
 
 
 @app.post("/test")
@@ -291,11 +318,6 @@ def main():
     return FileResponse("view/html/search.html")
 
 
-es = Elasticsearch(
-    "http://localhost:9200",
-    basic_auth=("elastic", "elastic"),
-    verify_certs=False
-)
 
 FIELD_MAP = {
     "title": "title_tokens",
@@ -337,7 +359,7 @@ def search_news(payload: dict = Body(...)):
 
     try:
         # 3. ES 검색 실행 (JS 렌더링에 필요한 필드들을 _source에 명시)
-        res = es.search(
+        res = es.options(request_timeout=TIMEOUT_SEARCH).search(
             index="news_raw",
             body=search_condition,
             _source=["title", "content", "media", "category", "img", "pubdate"]
@@ -397,6 +419,21 @@ def npti_question_list(db: Session = Depends(get_db)):
     except Exception as e:
         logger.error(f"실행 중 오류 발생: {e}")
 
+# 관리자 - npti_type / npti_code / npti_question 수정 후 캐시 갱신
+@app.post("/npti/reference/refresh")
+def npti_reference_refresh(request: Request, db: Session = Depends(get_db)):
+    user_id = request.session.get("user_id")
+    sql = text("select admin from user_info where user_id = :user_id")
+    if not user_id or db.execute(sql, {"user_id": user_id}).scalar() != 0:
+        return JSONResponse(status_code=403, content={"message": "관리자만 접근 가능합니다."})
+    invalidate_npti_reference()
+    load_npti_reference(db)
+    return npti_reference_version()
+
+@app.get("/npti/reference/version")
+def npti_reference_version_info():
+    return npti_reference_version()
+
 # 사용자
 @app.get("/npti/questions/axis", response_model=list[npti_question_response])
 def npti_question_by_axis(axis: str = Query(...), db: Session = Depends(get_db)):
@@ -516,16 +553,10 @@ def logout(request: Request):
 @app.get("/api/about")
 def get_about(db: Session = Depends(get_db)):
 
-    # 1. NPTI 기준 (npti_type)
-    type_rows = db.execute("""
-        SELECT npti_group, npti_type, npti_kor
-        FROM npti_type
-        ORDER BY npti_group, npti_type
-    """).fetchall()
-
+    # 1. NPTI 기준 (npti_type) - 캐시 조회
     grouped = {}
-    for r in type_rows:
-        grouped.setdefault(r.npti_group, []).append(r)
+    for r in get_all_npti_type(db):
+        grouped.setdefault(r["npti_group"], []).append(r)
 
     criteria = []
     for group, items in grouped.items():
@@ -533,30 +564,23 @@ def get_about(db: Session = Depends(get_db)):
             left, right = items
             criteria.append({
                 "title": group.capitalize(),
-                "left": f"{left.npti_type} - {left.npti_kor}",
-                "right": f"{right.npti_type} - {right.npti_kor}"
+                "left": f"{left['npti_type']} - {left['npti_kor']}",
+                "right": f"{right['npti_type']} - {right['npti_kor']}"
             })
 
-    # 2. NPTI 성향 (npti_code)
-    code_rows = db.execute("""
-        SELECT npti_code, type_nick, type_de,
-               length_type, article_type, info_type, view_type
-        FROM npti_code
-        ORDER BY npti_code
-    """).fetchall()
-
+    # 2. NPTI 성향 (npti_code) - 캐시 조회
     guides = []
-    for r in code_rows:
+    for r in get_all_npti_codes(db):
         guides.append({
-            "code": r.npti_code,
-            "name": r.type_nick,
-            "desc": r.type_de,
+            "code": r["npti_code"],
+            "name": r["type_nick"],
+            "desc": r["type_de"],
             "pref": "",  # 또는 실제 선호 설명 컬럼
             "types": [
-                r.length_type,
-                r.article_type,
-                r.info_type,
-                r.view_type
+                r["length_type"],
+                r["article_type"],
+                r["information_type"],
+                r["view_type"]
             ]
         })
 
@@ -630,91 +654,81 @@ async def get_user_npti(request: Request,db: Session = Depends(get_db)):
     if not user_id:
         raise HTTPException(status_code=401, detail="Not authenticated")
 
-    # user_npti와 npti_code 테이블 조인 (기본 정보 및 별칭 조회)
-    result = db.query(
-        UserNPTITable,
-        NptiCodeTable.type_nick
-    ).join(
-        NptiCodeTable, UserNPTITable.npti_code == NptiCodeTable.npti_code
-    ).filter(
-        UserNPTITable.user_id == user_id
-    ).order_by(
-        UserNPTITable.updated_at.desc()
-    ).first()
+    # 최신 user_npti 1건만 DB 조회, 별칭(type_nick)과 한글명은 기준 데이터 캐시에서 조회
+    user_data = get_user_npti_info(db, user_id)
+    code_info = get_npti_code_by_code(db, user_data["npti_code"]) if user_data else None
 
     # 유저는 있으나 NPTI 없음 → 404
-    if not result:
+    if not code_info:
         raise HTTPException(status_code=404, detail="NPTI data not found")
 
-    user_data, type_nick = result
-    npti_code_str = user_data.npti_code
-
-    # 각 알파벳에 매칭되는 npti_kor 값 가져오기 (npti_type 테이블 조회)
-    # npti_type 테이블에서 NPTI_type 컬럼이 코드에 포함된 것들만 조회
-    chars = list(npti_code_str)
-    type_items = db.query(NptiTypeTable) \
-        .filter(NptiTypeTable.NPTI_type.in_(chars)) \
-        .all()
+    npti_code_str = user_data["npti_code"]
+    type_nick = code_info["type_nick"]
 
-    # 순서(S-T-F-N)에 맞게 딕셔너리로 맵핑 생성
-    kor_map = {item.NPTI_type: item.npti_kor for item in type_items}
+    # 순서(S-T-F-N)에 맞게 각 알파벳의 npti_kor 매핑
     # 최종 리스트 생성 (예: ["짧은", "이야기형", "객관적", "비판적"])
-    npti_kor_list = [kor_map.get(c, "") for c in chars]
+    type_by_char = get_npti_reference(db)["type_by_char"]
+    chars = list(npti_code_str)
+    npti_kor_list = [type_by_char.get(c, {}).get("npti_kor", "") for c in chars]
 
     return {
         "npti_code": npti_code_str,
         "type_nick": type_nick,
         "npti_kor_list": npti_kor_list,
-        "updated_at": user_data.updated_at
+        "updated_at": user_data["updated_at"]
     }
 
 
+def encode_cursor(sort_values:list):
+    return base64.urlsafe_b64encode(json.dumps(sort_values, ensure_ascii=False).encode()).decode()
+
+def decode_cursor(cursor:str):
+    try:
+        return json.loads(base64.urlsafe_b64decode(cursor.encode()).decode())
+    except Exception:
+        raise HTTPException(status_code=400, detail="잘못된 cursor 값입니다.")
+
 @app.get("/curated/news")
 async def get_curated_news(
         npti: str = Query(...),
         category: str = "all",
         sort_type: str = "accuracy",
         page: int = 1,
-        db: Session = Depends(get_db)
+        cursor: Optional[str] = None,  # 이전 응답의 next_cursor (search_after 페이지네이션)
+        exact_total: bool = False      # True일 때만 정확한 total 계산 (기본은 10000건까지 근사치)
 ):
 
     ITEMS_PER_PAGE = 20  # 한 페이지에 기사 20개
-    offset = (page - 1) * ITEMS_PER_PAGE
-
-    # DB에서 해당 NPTI_code를 가진 news_id 리스트를 먼저 가져옴
-    news_ids = db.query(ArticlesNPTI.news_id).filter(
-        ArticlesNPTI.NPTI_code == npti
-    ).all()
-
-    id_list = [id[0] for id in news_ids]
-    if not id_list:
-        return {"articles": [], "total": 0}
 
-    # ES 쿼리 작성
+    # news_raw의 npti(keyword) 필드로 바로 필터링 -> MySQL 조회 및 거대한 terms 필터 제거
     body = {
-        "track_total_hits": True,
-        "from": offset,
+        "track_total_hits": True if exact_total else 10000,
         "size": ITEMS_PER_PAGE,
         "query": {
             "bool": {
-                "must": [{"terms": {"news_id": id_list}}]
+                "filter": [npti_filter(npti)]
             }
         }
     }
 
     if category != "all":
-        body["query"]["bool"]["filter"] = [
+        body["query"]["bool"]["filter"].append(
             {"match": {"category": category}}  #term 쓰려면 ES 매핑 수정해야함
-        ]
+        )
 
-    # 3. 정렬 조건 처리
+    # 3. 정렬 조건 처리 (search_after를 위해 news_id를 tie-breaker로 추가)
     if sort_type == "latest":
-        body["sort"] = [{"pubdate": {"order": "desc"}}]
+        body["sort"] = [{"pubdate": {"order": "desc"}}, {"news_id": {"order": "asc"}}]
     else:
-        body["sort"] = [{"_score": {"order": "desc"}}]
+        body["sort"] = [{"_score": {"order": "desc"}}, {"news_id": {"order": "asc"}}]
+
+    if cursor:
+        body["search_after"] = decode_cursor(cursor)
+    else:
+        body["from"] = (page - 1) * ITEMS_PER_PAGE
 
     try:
-        res = es.search(index=ES_INDEX, body=body)
+        res = await get_async_es().options(request_timeout=TIMEOUT_SEARCH).search(index=ES_INDEX, body=body)
         hits = res["hits"]["hits"]
 
         # 3. 기존 search_article의 데이터 가공 방식을 그대로 활용
@@ -731,10 +745,13 @@ async def get_curated_news(
                 "category": src.get("category", "")
             })
 
-        total_count = res["hits"]["total"]["value"]
+        total = res["hits"]["total"]
+        next_cursor = encode_cursor(hits[-1]["sort"]) if len(hits) == ITEMS_PER_PAGE else None
         return {
             "articles": articles,
-            "total": total_count,
+            "total": total["value"],
+            "total_relation": total["relation"],  # "eq": 정확한 값, "gte": 근사치(이상)
+            "next_cursor": next_cursor,
             "sort":body["sort"][0]
         }
     except Exception as e:
@@ -755,52 +772,42 @@ def update_user_npti(request: Request, db: Session = Depends(get_db)):
     negative_score = latest_user_npti.get("negative_score")
     latest_update_time = latest_user_npti.get('timestamp')
     behavior_log_per_news = search_user_behavior(user_id, latest_update_time) # [[{},{}],[{},{},{},],[{}]] 형태
-    for behavior_log in behavior_log_per_news: # [{},{}]
-        if not behavior_log:
-            continue
-        result = model_predict_proba(behavior_log)# {userid:, news_id:, dwell time:, final_read_time:, reading_efficiency: } 같은 dictionary
-        reading_efficiency = result.get('reading_efficiency')
-        id = result.get('news_id')
-        body = {"query": {"term": {"news_id": id}},"_source": ["content"]}
-        response = search_news_condition(body)
-        n_word = 0
-        if response and response['hits']['hits']:
-            source_data = response['hits']['hits'][0]['_source']
-            content = source_data.get('content',"")
-            if content :
-                n_word = len(content.split())
-                print(f"news_id : {id} | n_word : {n_word}")
-        interest_score = min(1, reading_efficiency * (math.log(n_word+1) / math.log(501)))*10
-        result = db.query(ArticlesNPTI).filter(ArticlesNPTI.news_id == id).first()
-        news_length_type = result.length_type
-        news_article_type = result.article_type
-        news_info_type = result.info_type
-        news_view_type = result.view_type
+
+    # 1. 기사별 읽기 효율 예측 {userid:, news_id:, dwell time:, final_read_time:, reading_efficiency: }
+    predictions = model_predict_proba_batch(behavior_log_per_news)
+    news_ids = list({p.get('news_id') for p in predictions})
+
+    # 2. 본문(단어 수)은 ES mget 1번, 기사 NPTI는 IN 쿼리 1번으로 일괄 조회
+    contents = mget_news(news_ids, ["content"])
+    articles_npti = get_articles_npti_by_ids(db, news_ids)
+
+    # 3. 분류 결과가 있는 기사만 점수 반영
+    targets = [p for p in predictions if p.get('news_id') in articles_npti]
+    if targets:
+        efficiency = np.array([p.get('reading_efficiency') for p in targets], dtype=float)
+        n_word = np.array([len((contents.get(p.get('news_id'), {}).get('content') or "").split()) for p in targets])
+        interest_score = np.minimum(1, efficiency * (np.log(n_word + 1) / math.log(501))) * 10
+
+        # 축별 부호 : L/C/F/P 기사면 +1, S/T/I/N 기사면 -1 -> (기사 수, 4) 행렬
+        sign = np.array([
+            [1 if articles_npti[p.get('news_id')].length_type == "L" else -1,
+             1 if articles_npti[p.get('news_id')].article_type == "C" else -1,
+             1 if articles_npti[p.get('news_id')].info_type == "F" else -1,
+             1 if articles_npti[p.get('news_id')].view_type == "P" else -1]
+            for p in targets
+        ])
         # user_npti 점수에 interest_score 반영하는 로직 !!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!! (까먹으면 안됨)
-        if news_length_type == "L":
-            long_score += interest_score
-            short_score -= interest_score
-        else:
-            short_score += interest_score
-            long_score -= interest_score
-        if news_article_type == "C":
-            content_score += interest_score
-            tale_score -= interest_score
-        else:
-            tale_score += interest_score
-            content_score -= interest_score
-        if news_info_type == "F":
-            fact_score += interest_score
-            insight_score -= interest_score
-        else:
-            insight_score += interest_score
-            fact_score -= interest_score
-        if news_view_type == "P":
-            positive_score += interest_score
-            negative_score -= interest_score
-        else:
-            negative_score += interest_score
-            positive_score -= interest_score
+        delta_long, delta_content, delta_fact, delta_positive = (sign * interest_score[:, None]).sum(axis=0)
+        long_score += delta_long
+        short_score -= delta_long
+        content_score += delta_content
+        tale_score -= delta_content
+        fact_score += delta_fact
+        insight_score -= delta_fact
+        positive_score += delta_positive
+        negative_score -= delta_positive
+    print(f"user_npti 갱신 대상 기사 : {len(targets)}/{len(predictions)}")
+
     final_long_score = finalize_score(long_score)
     final_short_score = 100 - final_long_score
     final_tale_score = finalize_score(tale_score)
@@ -815,14 +822,13 @@ def update_user_npti(request: Request, db: Session = Depends(get_db)):
     final_view_type = "N" if final_negative_score > final_positive_score else "P"
     final_user_npti = final_length_type+final_article_type+final_info_type+final_view_type
     updated_at = datetime.now(timezone(timedelta(hours=9))).strftime('%Y-%m-%d %H:%M:%S')
-    query = text("SELECT type_nick, type_de FROM npti_code WHERE npti_code = :code")
-    description = db.execute(query, {"code": final_user_npti}).fetchone()
+    description = get_npti_code_by_code(db, final_user_npti)
     params = {
         "latest_update_time":latest_update_time,
         "user_id": user_id,
         "npti_code": final_user_npti,
-        "type_nick" : description[0],
-        "type_de" : description[1],
+        "type_nick" : description["type_nick"],
+        "type_de" : description["type_de"],
         "long_score": final_long_score,
         "short_score": final_short_score,
         "content_score": final_content_score,
@@ -851,96 +857,113 @@ async def update_state_loop():
                 print("New breaking news data updated!")
         await asyncio.sleep(1)
 
+async def warmup():
+    """요청 처리에 꼭 필요하지 않은 초기화 (테이블 / 필드 확인, 캐시 / 모델 로드) - 서버 시작을 막지 않도록 백그라운드 실행"""
+    steps = [
+        (init_scheduler_tables, "스케줄러 테이블 / news_aggr index 확인"),
+        (ensure_npti_field, "npti 필터 필드(keyword) 확인"),
+        (load_npti_reference, "NPTI 기준 데이터 캐시 로드 (실패 시 첫 조회 때 재시도)"),
+        (init_user_npti_daily, "회원 NPTI 일별 스냅샷 테이블 확인"),
+        (init_article_stats, "기사 통계 롤업 테이블 확인"),
+        (get_model, "읽기 효율 모델 로드"),
+    ]
+    for func, desc in steps:
+        started = time.perf_counter()
+        try:
+            await asyncio.to_thread(func)
+            logger.info(f"[warmup] {desc} : {time.perf_counter() - started:.2f}초")
+        except Exception as e:
+            logger.error(f"[warmup] {desc} 실패 : {e}")
+    startup_profile.mark("warm")
+
+
 @app.on_event("startup")
 async def startup_event():
     if not sch.running:
         sch.start()
     app.state.breaking_news = {'msg':'스케쥴러 가동 중 - 데이터 준비 중'} # 초기값
+    behavior_buffer.start() # /log/behavior 적재 버퍼
     asyncio.create_task(update_state_loop())
+    app.state.warmup_task = asyncio.create_task(warmup())
+    startup_profile.mark("ready")
+    logger.info(startup_profile.format_report())
+
+
+# 첫 요청 도착 / 응답 시각 기록 (startup_profile.report()의 marks)
+@app.middleware("http")
+async def first_request_timer(request: Request, call_next):
+    startup_profile.mark("first_request")
+    response = await call_next(request)
+    startup_profile.mark("first_response")
+    return response
+
+
+@app.get("/startup/report")
+async def startup_report(top: int = 20):
+    return startup_profile.report(top)
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    await behavior_buffer.stop() # 남은 행동 로그 적재 후 종료
+    await asyncio.to_thread(stop_workers) # 스케줄러 상주 워커 종료
+    await close_async_es()
 
 @app.get("/render_breaking")
-def render_breaking():
+async def render_breaking():
+    # news_aggr 작업이 대표 기사(id, title)까지 계산해서 넘겨주므로 ES 조회 없이 메모리만 읽음
     grouping_result = getattr(app.state, "breaking_news", {"msg": "데이터가 아직 없습니다."})
-    breaking_topic = grouping_result.get('final_group') # None or ['news_id1', 'news_id2']
-    if not breaking_topic:
+    id_title_list = grouping_result.get('breaking_news') # None or [{"id":, "title":, "timestamp":}]
+    if not id_title_list:
         return {"breaking_news": None, "msg":"데이터 없음"}
-    id_title_list = []
-    for topic in breaking_topic:
-        query = {"size": 1,"_source": ["news_id", "title", "timestamp"],
-          "query": {"terms": {"news_id": topic}},
-          "sort": [{"timestamp": {"order": "desc"}}]}
-        res = search_news_condition(query)
-        if res and res.get("hits") and res["hits"]["hits"]:
-            first_hit = res["hits"]["hits"][0]["_source"]
-            id_title = {"id":first_hit["news_id"], "title":first_hit["title"]}
-            id_title_list.append(id_title)
-
     return {"breaking_news": id_title_list, "msg":"데이터 있음"}
 
+CATEGORY_LIST = ["정치", "경제", "사회", "생활/문화", "IT/과학", "세계", "스포츠", "연예", "지역"]
+
+def to_news_item(src:dict):
+    return {"news_id": src.get("news_id", ""),
+            "title": src.get("title", ""),
+            "desc": src.get("content", ""),
+            "img": src.get("img", ""),
+            "link": f"/article?news_id={src['news_id']}"}
+
 @app.get("/render_general")
 def render_general(category:str):
     news_list = []
     if category == "전체" or category == 'all':
-        cate_list = ["정치", "경제", "사회", "생활/문화", "IT/과학", "세계", "스포츠","연예","지역"]
-        for category in cate_list:
-            query = {"query": {"match":{"category":category}}, "sort": [{"pubdate": {"order": "desc"}}],
-                     "size": 1, "_source": ["news_id", "title", "content", "img"]}
-            res = search_news_condition(query)
-            src = res["hits"]["hits"][0]["_source"]
-            news_item = {"news_id": src.get("news_id", ""),
-                         "title": src.get("title", ""),
-                         "desc": src.get("content", ""),
-                         "img": src.get("img", ""),
-                         "link": f"/article?news_id={src['news_id']}"}
-            news_list.append(news_item)
+        # 카테고리별 최신 1건 -> 9개 검색을 _msearch 한 번으로 처리
+        queries = [{"query": {"match":{"category":cate}}, "sort": [{"pubdate": {"order": "desc"}}],
+                    "size": 1, "_source": ["news_id", "title", "content", "img"]} for cate in CATEGORY_LIST]
+        responses = msearch_news_condition(queries) or []
+        for res in responses:
+            hits = res.get("hits", {}).get("hits", [])
+            if hits:
+                news_list.append(to_news_item(hits[0]["_source"]))
     else :
         query = {"query": {"match":{"category":category}}, "sort": [{"pubdate": {"order": "desc"}}],
                  "size": 9, "_source": ["news_id", "title", "content", "img"]}
         res = search_news_condition(query)
         for hit in res["hits"]["hits"]:
-            src = hit["_source"]
-            news_item = {"news_id": src.get("news_id", ""),
-                         "title": src.get("title", ""),
-                         "desc": src.get("content", ""),
-                         "img": src.get("img", ""),
-                         "link": f"/article?news_id={src['news_id']}"}
-            news_list.append(news_item)
+            news_list.append(to_news_item(hit["_source"]))
     return news_list
 
 @app.get("/render_general_npti")
-def render_general(category:str, npti_code:str, db: Session = Depends(get_db)):
+def render_general(category:str, npti_code:str):
     news_list = []
-    sql = text("select news_id from articles_npti where npti_code = :code")
-    params = {"code":npti_code}
-    news_ids = db.execute(sql, params).scalars().fetchall()
-    if not news_ids:
-        return []
     if category == "전체" or category == 'all':
-        cate_list = ["정치", "경제", "사회", "생활/문화", "IT/과학", "세계", "스포츠", "연예", "지역"]
-        for category in cate_list:
-            query = {"size": 1,"_source": ["news_id", "title", "content", "img"],"sort": [{"pubdate": {"order": "desc"}}],
-                    "query": {"bool": {"must": {"match":{"category":category}},"filter": [{"terms": {"news_id": news_ids}}]}}}
-            res = search_news_condition(query)
-            if res["hits"]["hits"]:
-                src = res["hits"]["hits"][0]["_source"]
-                news_item = {"news_id": src.get("news_id", ""),
-                             "title": src.get("title", ""),
-                             "desc": src.get("content", ""),
-                             "img": src.get("img", ""),
-                             "link": f"/article?news_id={src['news_id']}"}
-                news_list.append(news_item)
+        queries = [{"size": 1,"_source": ["news_id", "title", "content", "img"],"sort": [{"pubdate": {"order": "desc"}}],
+                    "query": {"bool": {"must": {"match":{"category":cate}},"filter": [npti_filter(npti_code)]}}}
+                   for cate in CATEGORY_LIST]
+        responses = msearch_news_condition(queries) or []
+        for res in responses:
+            hits = res.get("hits", {}).get("hits", [])
+            if hits:
+                news_list.append(to_news_item(hits[0]["_source"]))
     else :
         query = {"size": 9,"_source": ["news_id", "title", "content", "img"],"sort": [{"pubdate": {"order": "desc"}}],
-            "query": {"bool": {"must": {"match":{"category":category}},"filter": [{"terms": {"news_id": news_ids}}]}}}
+            "query": {"bool": {"must": {"match":{"category":category}},"filter": [npti_filter(npti_code)]}}}
         res = search_news_condition(query)
         for hit in res["hits"]["hits"]:
-            src = hit["_source"]
-            news_item = {"news_id": src.get("news_id", ""),
-                         "title": src.get("title", ""),
-                         "desc": src.get("content", ""),
-                         "img": src.get("img", ""),
-                         "link": f"/article?news_id={src['news_id']}"}
-            news_list.append(news_item)
+            news_list.append(to_news_item(hit["_source"]))
     return news_list
 
 @app.get("/profile-edit")
@@ -1040,6 +1063,32 @@ def dashboard(request: Request, db: Session = Depends(get_db)):
         return RedirectResponse(url="/")
 
 
+# =========================================================
+# 관리자 대시보드 통계 공통
+# - 각 쿼리는 별도 세션(커넥션)으로 dashboard_cache 스레드 풀에서 동시에 실행
+# - 결과는 집계 단위별 TTL로 캐시, TTL 80%가 지나면 응답은 캐시로 하고 백그라운드에서 갱신
+# =========================================================
+dashboard_cache = RefreshingCache(max_workers=8, name="dashboard")
+STAT_TTL_NOW = 30       # 현재 분포 (진단/분류가 생기면 바로 변함)
+STAT_TTL_DAY = 60       # 최근 7일 (오늘 값만 변함)
+STAT_TTL_WEEK = 300     # 최근 4주
+STAT_TTL_MONTH = 600    # 최근 6개월
+STAT_TTL_MEMBER = 300   # 연령대 / 성별 (가입/탈퇴 시에만 변함)
+
+def with_session(func):
+    # 스레드 풀에서 실행할 수 있도록 세션을 직접 열고 닫는 함수로 감쌈
+    def run():
+        db = SessionLocal()
+        try:
+            return func(db)
+        finally:
+            db.close()
+    return run
+
+def query_rows(sql):
+    return with_session(lambda db: [dict(row._asdict()) for row in db.execute(sql).fetchall()])
+
+
 @app.get("/members_statistics")
 def members_statistics(db: Session = Depends(get_db)):
     today_str = datetime.now(timezone(timedelta(hours=9))).strftime('%Y-%m-%d')
@@ -1059,33 +1108,25 @@ def members_statistics(db: Session = Depends(get_db)):
     def row_to_dict(row):
         return dict(row._asdict()) if row else {}
 
+    # 집계는 모두 user_npti_daily 조회 (이월은 스케줄러 작업 / 회원 저장 시 당일 행 upsert로 유지)
+
     try:
         # =========================================================
         # 1. NPTI 회원 분포 (Pie Chart용)
         # =========================================================
 
         # 1-1) NPTI 코드별 비율 -------------------------------- 쿼리 검증 완료
-        sql1_1 = text("""
-            WITH LatestUserNPTI AS (
-                SELECT 
-                    user_id,  
-                    npti_code,
-                    ROW_NUMBER() OVER (PARTITION BY user_id ORDER BY updated_at DESC) as rn
-                FROM user_npti
-            )
+        sql1_1 = text(f"""
             SELECT 
-                IFNULL(L.npti_code, '미진단') AS npti_code, 
+                IFNULL(D.npti_code, '미진단') AS npti_code, 
                 COUNT(*) as count 
             FROM user_info U
-            LEFT JOIN LatestUserNPTI L 
-                ON U.user_id = L.user_id AND L.rn = 1 
+            LEFT JOIN user_npti_daily D 
+                ON U.user_id = D.user_id AND D.snapshot_date = '{today_str}'
             WHERE U.activation = 1 AND U.admin = 1
-            GROUP BY IFNULL(L.npti_code, '미진단')
+            GROUP BY IFNULL(D.npti_code, '미진단')
             ORDER BY count DESC;
         """)
-        result1_1 = rows_to_dict(db.execute(sql1_1).fetchall())
-        print('result1_1 완료')
-
 
         # 1-2) 연령대별 비율 ----------------------------------- 쿼리 검증 완료
         sql1_2 = text("""
@@ -1104,40 +1145,42 @@ def members_statistics(db: Session = Depends(get_db)):
             GROUP BY age_group 
             ORDER BY age_group;
         """)
-        # DB 실행 결과
-        result1_2_1 = rows_to_dict(db.execute(sql1_2).fetchall())
-        # [후처리] 모든 연령대 카테고리 정의
-        all_groups = ['10대 이하', '20대', '30대', '40대', '50대', '60대 이상']
-        # 딕셔너리로 변환하여 매핑 (예: {'20대': 50, '10대 이하': 15 ...})
-        result_map = {row['age_group']: row['count'] for row in result1_2_1}
-        # 빈 카테고리는 0으로 채워서 최종 리스트 생성
-        result1_2 = [
-            {'age_group': group, 'count': result_map.get(group, 0)}
-            for group in all_groups
-        ]
-        print(result1_2) # 결과: 모든 연령대가 순서대로 존재하며, 없는 그룹은 count: 0으로 보장됨
+        def load1_2(db):
+            # DB 실행 결과
+            result1_2_1 = rows_to_dict(db.execute(sql1_2).fetchall())
+            # [후처리] 모든 연령대 카테고리 정의
+            all_groups = ['10대 이하', '20대', '30대', '40대', '50대', '60대 이상']
+            # 딕셔너리로 변환하여 매핑 (예: {'20대': 50, '10대 이하': 15 ...})
+            result_map = {row['age_group']: row['count'] for row in result1_2_1}
+            # 빈 카테고리는 0으로 채워서 최종 리스트 생성
+            result1_2 = [
+                {'age_group': group, 'count': result_map.get(group, 0)}
+                for group in all_groups
+            ]
+            return result1_2 # 결과: 모든 연령대가 순서대로 존재하며, 없는 그룹은 count: 0으로 보장됨
 
         # 1-3) 성별 비율 --------------------------------------- 쿼리 검증 완료
         sql1_3 = text("""SELECT user_gender, COUNT(*) as count FROM user_info 
             WHERE activation = 1 and admin = 1 GROUP BY user_gender;""")
 
-        # 1. DB 결과 가져오기 (데이터가 있는 성별만 나옴)
-        result1_3_raw = rows_to_dict(db.execute(sql1_3).fetchall())
+        def load1_3(db):
+            # 1. DB 결과 가져오기 (데이터가 있는 성별만 나옴)
+            result1_3_raw = rows_to_dict(db.execute(sql1_3).fetchall())
 
-        # 2. [후처리] 0값 채우기
-        # 보장해야 할 키값 목록 (0과 1)
-        target_genders = [0, 1]
+            # 2. [후처리] 0값 채우기
+            # 보장해야 할 키값 목록 (0과 1)
+            target_genders = [0, 1]
 
-        # 검색 속도를 위해 DB 결과를 딕셔너리로 변환 ( {0: 15, 1: 20} 형태 )
-        gender_map = {row['user_gender']: row['count'] for row in result1_3_raw}
+            # 검색 속도를 위해 DB 결과를 딕셔너리로 변환 ( {0: 15, 1: 20} 형태 )
+            gender_map = {row['user_gender']: row['count'] for row in result1_3_raw}
 
-        # 타겟 리스트(0, 1)를 순회하며 데이터가 없으면 count: 0으로 설정
-        result1_3 = [
-            {'user_gender': g, 'count': gender_map.get(g, 0)}
-            for g in target_genders
-        ]
+            # 타겟 리스트(0, 1)를 순회하며 데이터가 없으면 count: 0으로 설정
+            result1_3 = [
+                {'user_gender': g, 'count': gender_map.get(g, 0)}
+                for g in target_genders
+            ]
 
-        print('result1_3 (성별 0, 1 포함) 완료')
+            return result1_3
 
         # =========================================================
         # 2. NPTI 코드별 변화 추이 (Line Graph용)
@@ -1153,50 +1196,32 @@ def members_statistics(db: Session = Depends(get_db)):
                 FROM Past7Days
                 WHERE date_period < '{today_str}'
             ),
-            AllNPTICodes AS (
-                -- 2. [코드 목록] 존재하는 모든 NPTI 코드 가져오기 (16개 유형 등)
-                -- (npti_code 테이블이 있다고 가정, 만약 없다면 DISTINCT npti_code FROM user_npti 사용)
-                SELECT npti_code FROM npti_code
-            ),
-            DateCodeGrid AS (
-                -- 3. [그리드 생성] (7일 날짜) x (모든 NPTI 코드) 조합 생성
-                -- 데이터가 없어도 이 조합은 무조건 존재해야 함
-                SELECT d.date_period, c.npti_code
-                FROM Past7Days d
-                CROSS JOIN AllNPTICodes c
-            ),
-            DailySnapshot AS (
-                -- 4. [실제 데이터] 유저별 일자별 최종 상태 계산
-                SELECT 
-                    d.date_period,
-                    u.npti_code,
-                    ROW_NUMBER() OVER (
-                        PARTITION BY d.date_period, u.user_id 
-                        ORDER BY u.updated_at DESC
-                    ) as rn
-                FROM Past7Days d
-                LEFT JOIN user_npti u
-                    ON u.updated_at < d.date_period + INTERVAL 1 DAY
+            ActiveSnapshot AS (
+                -- 회원 NPTI 일별 스냅샷 (활성 일반 회원만)
+                SELECT D.snapshot_date, D.npti_code, D.length_type, D.article_type, D.info_type, D.view_type
+                FROM user_npti_daily D
                 JOIN user_info ui
-                    ON u.user_id = ui.user_id
+                    ON D.user_id = ui.user_id
                 WHERE ui.activation = 1 AND ui.admin = 1
+                  AND D.snapshot_date BETWEEN '{today_str}' - INTERVAL 6 DAY AND '{today_str}'
             )
             SELECT 
                 G.date_period, 
                 G.npti_code, 
-                -- 5. 그리드(G)를 기준으로 데이터(S)를 붙여서 카운트
-                COUNT(CASE WHEN S.rn = 1 THEN 1 END) as user_count
-            FROM DateCodeGrid G
-            LEFT JOIN DailySnapshot S
-              ON G.date_period = S.date_period 
-              AND G.npti_code = S.npti_code
+                -- 2. (7일 날짜) x (모든 NPTI 코드) 그리드에 스냅샷을 붙여서 카운트 (없으면 0)
+                COUNT(S.npti_code) as user_count
+            FROM (
+                SELECT d.date_period, c.npti_code
+                FROM Past7Days d
+                CROSS JOIN npti_code c
+            ) G
+            LEFT JOIN ActiveSnapshot S
+              ON S.snapshot_date = G.date_period 
+              AND S.npti_code = G.npti_code
             GROUP BY G.date_period, G.npti_code
             ORDER BY G.date_period ASC, G.npti_code ASC;
         """)
 
-        result2_1 = rows_to_dict(db.execute(sql2_1).fetchall())
-        print('result2_1 (최근 7일 누적 - 0포함) 완료')
-
         # 2-2) 주별 누적 (해당 주차 기준, 모든 유저의 최종 상태) --------------- 쿼리 검증 완료
         sql2_2 = text(f"""
             WITH RECURSIVE Past4Weeks AS (
@@ -1207,33 +1232,19 @@ def members_statistics(db: Session = Depends(get_db)):
                 FROM Past4Weeks
                 WHERE week_start > '{this_monday_str}' - INTERVAL 3 WEEK
             ),
-            AllNPTICodes AS (
-                -- 2. [코드 목록] 모든 NPTI 코드 가져오기 (16개 유형)
-                SELECT npti_code FROM npti_code
-            ),
-            WeekCodeGrid AS (
-                -- 3. [그리드 생성] (4주) x (모든 NPTI 코드) 조합
-                -- 데이터 유무와 상관없이 무조건 존재하는 뼈대
-                SELECT w.week_start, c.npti_code
-                FROM Past4Weeks w
-                CROSS JOIN AllNPTICodes c
+            WeekSnapDate AS (
+                -- 해당 주차 일요일(이번 주는 오늘) 스냅샷 기준
+                SELECT week_start, LEAST(DATE(week_start + INTERVAL 6 DAY), DATE('{today_str}')) AS snapshot_date
+                FROM Past4Weeks
             ),
-            WeeklySnapshot AS (
-                -- 4. [실제 데이터] 주차별 유저의 최종 상태 스냅샷
-                SELECT 
-                    w.week_start,
-                    u.npti_code,
-                    ROW_NUMBER() OVER (
-                        PARTITION BY w.week_start, u.user_id 
-                        ORDER BY u.updated_at DESC
-                    ) as rn
-                FROM Past4Weeks w
-                LEFT JOIN user_npti u
-                    -- 해당 주차 일요일 밤(다음주 월요일 0시)까지의 누적 기록
-                    ON u.updated_at < w.week_start + INTERVAL 1 WEEK
+            ActiveSnapshot AS (
+                -- 회원 NPTI 일별 스냅샷 (활성 일반 회원만)
+                SELECT D.snapshot_date, D.npti_code, D.length_type, D.article_type, D.info_type, D.view_type
+                FROM user_npti_daily D
                 JOIN user_info ui
-                    ON u.user_id = ui.user_id
+                    ON D.user_id = ui.user_id
                 WHERE ui.activation = 1 AND ui.admin = 1
+                  AND D.snapshot_date BETWEEN '{this_monday_str}' - INTERVAL 3 WEEK AND '{today_str}'
             )
             SELECT 
                 -- 날짜를 'YYYY-MM-DD ~ YYYY-MM-DD' 형태로 변환
@@ -1241,19 +1252,20 @@ def members_statistics(db: Session = Depends(get_db)):
 
                 G.npti_code, 
 
-                -- 5. 그리드(G)에 데이터(S)를 매핑하여 카운트 (없으면 0)
-                COUNT(CASE WHEN S.rn = 1 THEN 1 END) as user_count
-            FROM WeekCodeGrid G
-            LEFT JOIN WeeklySnapshot S
-              ON G.week_start = S.week_start 
-              AND G.npti_code = S.npti_code
+                -- 2. (4주) x (모든 NPTI 코드) 그리드에 주차 기준일 스냅샷을 매핑하여 카운트 (없으면 0)
+                COUNT(S.npti_code) as user_count
+            FROM (
+                SELECT w.week_start, w.snapshot_date, c.npti_code
+                FROM WeekSnapDate w
+                CROSS JOIN npti_code c
+            ) G
+            LEFT JOIN ActiveSnapshot S
+              ON S.snapshot_date = G.snapshot_date 
+              AND S.npti_code = G.npti_code
             GROUP BY G.week_start, G.npti_code
             ORDER BY G.week_start ASC, G.npti_code ASC;
         """)
 
-        result2_2 = rows_to_dict(db.execute(sql2_2).fetchall())
-        print('result2_2 (주간 기간 표시 - 0포함) 완료')
-
         # 2-3) 월별 누적 (해당 월 기준, 모든 유저의 최종 상태) ------------- 쿼리 검증 완료
         sql2_3 = text(f"""
             WITH RECURSIVE Past6Months AS (
@@ -1264,33 +1276,19 @@ def members_statistics(db: Session = Depends(get_db)):
                 FROM Past6Months
                 WHERE month_start > '{this_month_str}' - INTERVAL 5 MONTH
             ),
-            AllNPTICodes AS (
-                -- 2. [코드 목록] 모든 NPTI 코드 가져오기 (16개 유형)
-                SELECT npti_code FROM npti_code
-            ),
-            MonthCodeGrid AS (
-                -- 3. [그리드 생성] (6개월) x (모든 NPTI 코드) 조합
-                -- 데이터가 없어도 무조건 존재해야 하는 뼈대
-                SELECT m.month_start, c.npti_code
-                FROM Past6Months m
-                CROSS JOIN AllNPTICodes c
+            MonthSnapDate AS (
+                -- 해당 월 말일(이번 달은 오늘) 스냅샷 기준
+                SELECT month_start, LEAST(LAST_DAY(month_start), DATE('{today_str}')) AS snapshot_date
+                FROM Past6Months
             ),
-            MonthlySnapshot AS (
-                -- 4. [실제 데이터] 월별 유저의 최종 상태 스냅샷
-                SELECT 
-                    m.month_start,
-                    u.npti_code,
-                    ROW_NUMBER() OVER (
-                        PARTITION BY m.month_start, u.user_id 
-                        ORDER BY u.updated_at DESC
-                    ) as rn
-                FROM Past6Months m
-                LEFT JOIN user_npti u
-                    -- 해당 월의 말일(다음달 1일 0시 전)까지의 누적 기록
-                    ON u.updated_at < m.month_start + INTERVAL 1 MONTH
+            ActiveSnapshot AS (
+                -- 회원 NPTI 일별 스냅샷 (활성 일반 회원만)
+                SELECT D.snapshot_date, D.npti_code, D.length_type, D.article_type, D.info_type, D.view_type
+                FROM user_npti_daily D
                 JOIN user_info ui
-                    ON u.user_id = ui.user_id
+                    ON D.user_id = ui.user_id
                 WHERE ui.activation = 1 AND ui.admin = 1
+                  AND D.snapshot_date BETWEEN '{this_month_str}' - INTERVAL 5 MONTH AND '{today_str}'
             )
             SELECT 
                 -- 날짜를 'YYYY-MM' 형태로 변환
@@ -1298,54 +1296,42 @@ def members_statistics(db: Session = Depends(get_db)):
 
                 G.npti_code, 
 
-                -- 5. 그리드(G)에 데이터(S)를 매핑하여 카운트 (없으면 0)
-                COUNT(CASE WHEN S.rn = 1 THEN 1 END) as user_count
-            FROM MonthCodeGrid G
-            LEFT JOIN MonthlySnapshot S
-              ON G.month_start = S.month_start 
-              AND G.npti_code = S.npti_code
+                -- 2. (6개월) x (모든 NPTI 코드) 그리드에 월 기준일 스냅샷을 매핑하여 카운트 (없으면 0)
+                COUNT(S.npti_code) as user_count
+            FROM (
+                SELECT m.month_start, m.snapshot_date, c.npti_code
+                FROM MonthSnapDate m
+                CROSS JOIN npti_code c
+            ) G
+            LEFT JOIN ActiveSnapshot S
+              ON S.snapshot_date = G.snapshot_date 
+              AND S.npti_code = G.npti_code
             GROUP BY G.month_start, G.npti_code
             ORDER BY G.month_start ASC, G.npti_code ASC;
         """)
 
-        result2_3 = rows_to_dict(db.execute(sql2_3).fetchall())
-        print('result2_3 (최근 6개월 누적 - 0포함) 완료')
-
         # =========================================================
         # 3. NPTI 8개 속성별 분포 (Bar Chart용) ---------------------------------- 쿼리 검증 완료
         # =========================================================
-        sql3 = text("""
-            WITH LatestUserSnapshot AS (
-                SELECT 
-                    u.user_id,
-                    u.npti_code,
-                    -- 유저별 가장 최신 기록 순위 매기기
-                    ROW_NUMBER() OVER (PARTITION BY u.user_id ORDER BY u.updated_at DESC) as rn
-                FROM user_npti u
-            )
+        sql3 = text(f"""
             SELECT 
-                COUNT(CASE WHEN C.length_type = 'L' THEN 1 END) AS L_count,
-                COUNT(CASE WHEN C.length_type = 'S' THEN 1 END) AS S_count,
-
-                COUNT(CASE WHEN C.article_type = 'C' THEN 1 END) AS C_count,
-                COUNT(CASE WHEN C.article_type = 'T' THEN 1 END) AS T_count,
-
-                COUNT(CASE WHEN C.info_type = 'I' THEN 1 END) AS I_count,
-                COUNT(CASE WHEN C.info_type = 'F' THEN 1 END) AS F_count,
-
-                COUNT(CASE WHEN C.view_type = 'P' THEN 1 END) AS P_count,
-                COUNT(CASE WHEN C.view_type = 'N' THEN 1 END) AS N_count
-            FROM LatestUserSnapshot S
-            -- [핵심 수정] user_info 테이블과 조인하여 회원 상태 확인
-            JOIN user_info UI ON S.user_id = UI.user_id
-            -- NPTI 속성(L/S, C/T...) 정보를 가져오기 위해 조인
-            JOIN npti_code C ON S.npti_code = C.npti_code
-            WHERE S.rn = 1                 -- 최신 기록만
+                COUNT(CASE WHEN D.length_type = 'L' THEN 1 END) AS L_count,
+                COUNT(CASE WHEN D.length_type = 'S' THEN 1 END) AS S_count,
+
+                COUNT(CASE WHEN D.article_type = 'C' THEN 1 END) AS C_count,
+                COUNT(CASE WHEN D.article_type = 'T' THEN 1 END) AS T_count,
+
+                COUNT(CASE WHEN D.info_type = 'I' THEN 1 END) AS I_count,
+                COUNT(CASE WHEN D.info_type = 'F' THEN 1 END) AS F_count,
+
+                COUNT(CASE WHEN D.view_type = 'P' THEN 1 END) AS P_count,
+                COUNT(CASE WHEN D.view_type = 'N' THEN 1 END) AS N_count
+            FROM user_npti_daily D
+            JOIN user_info UI ON D.user_id = UI.user_id
+            WHERE D.snapshot_date = '{today_str}'  -- 오늘 스냅샷 = 회원별 최신 기록
               AND UI.activation = 1        -- 활성화된 회원만
               AND UI.admin = 1;            -- 일반 회원만
         """)
-        result3 = row_to_dict(db.execute(sql3).fetchone())
-        print('result3 완료')
 
         # =========================================================
         # 4. NPTI 8개 속성별 변화 추이 (Line Graph용)
@@ -1361,50 +1347,38 @@ def members_statistics(db: Session = Depends(get_db)):
                 FROM Past7Days
                 WHERE date_period < '{today_str}'
             ),
-            DailySnapshot AS (
-                -- 2. [스냅샷] 날짜별 유저들의 최종 상태
-                SELECT 
-                    d.date_period,
-                    u.npti_code,
-                    ROW_NUMBER() OVER (
-                        PARTITION BY d.date_period, u.user_id 
-                        ORDER BY u.updated_at DESC
-                    ) as rn
-                FROM Past7Days d
-                LEFT JOIN user_npti u
-                    ON u.updated_at < d.date_period + INTERVAL 1 DAY
+            ActiveSnapshot AS (
+                -- 회원 NPTI 일별 스냅샷 (활성 일반 회원만)
+                SELECT D.snapshot_date, D.npti_code, D.length_type, D.article_type, D.info_type, D.view_type
+                FROM user_npti_daily D
                 JOIN user_info ui
-                    ON u.user_id = ui.user_id
+                    ON D.user_id = ui.user_id
                 WHERE ui.activation = 1 AND ui.admin = 1
+                  AND D.snapshot_date BETWEEN '{today_str}' - INTERVAL 6 DAY AND '{today_str}'
             )
             SELECT 
                 P.date_period,
 
-                -- 4. 유효한 데이터(rn=1)가 있을 때만 카운트, 없으면 0
-                COUNT(CASE WHEN S.rn = 1 AND C.length_type = 'L' THEN 1 END) AS L_count,
-                COUNT(CASE WHEN S.rn = 1 AND C.length_type = 'S' THEN 1 END) AS S_count,
+                -- 2. 날짜별 스냅샷의 4축 타입 카운트, 없으면 0
+                COUNT(CASE WHEN S.length_type = 'L' THEN 1 END) AS L_count,
+                COUNT(CASE WHEN S.length_type = 'S' THEN 1 END) AS S_count,
 
-                COUNT(CASE WHEN S.rn = 1 AND C.article_type = 'C' THEN 1 END) AS C_count,
-                COUNT(CASE WHEN S.rn = 1 AND C.article_type = 'T' THEN 1 END) AS T_count,
+                COUNT(CASE WHEN S.article_type = 'C' THEN 1 END) AS C_count,
+                COUNT(CASE WHEN S.article_type = 'T' THEN 1 END) AS T_count,
 
-                COUNT(CASE WHEN S.rn = 1 AND C.info_type = 'I' THEN 1 END) AS I_count,
-                COUNT(CASE WHEN S.rn = 1 AND C.info_type = 'F' THEN 1 END) AS F_count,
+                COUNT(CASE WHEN S.info_type = 'I' THEN 1 END) AS I_count,
+                COUNT(CASE WHEN S.info_type = 'F' THEN 1 END) AS F_count,
 
-                COUNT(CASE WHEN S.rn = 1 AND C.view_type = 'P' THEN 1 END) AS P_count,
-                COUNT(CASE WHEN S.rn = 1 AND C.view_type = 'N' THEN 1 END) AS N_count
+                COUNT(CASE WHEN S.view_type = 'P' THEN 1 END) AS P_count,
+                COUNT(CASE WHEN S.view_type = 'N' THEN 1 END) AS N_count
 
             FROM Past7Days P  -- [핵심] 기준이 되는 타임라인을 먼저 둡니다.
-            LEFT JOIN DailySnapshot S
-                ON P.date_period = S.date_period 
-            LEFT JOIN npti_code C 
-                ON S.npti_code = C.npti_code
+            LEFT JOIN ActiveSnapshot S
+                ON S.snapshot_date = P.date_period 
             GROUP BY P.date_period
             ORDER BY P.date_period ASC;
         """)
 
-        result4_1 = rows_to_dict(db.execute(sql4_1).fetchall())
-        print('result4_1 (최근 7일 상세 분포 - 0포함) 완료')
-
         # 4-2) 주별 (누적 기준)
         sql4_2 = text(f"""
             WITH RECURSIVE Past4Weeks AS (
@@ -1415,51 +1389,44 @@ def members_statistics(db: Session = Depends(get_db)):
                 FROM Past4Weeks
                 WHERE week_start > '{this_monday_str}' - INTERVAL 3 WEEK
             ),
-            WeeklySnapshot AS (
-                -- 2. [스냅샷] 주차별 유저들의 최종 상태
-                SELECT 
-                    w.week_start,
-                    u.npti_code,
-                    ROW_NUMBER() OVER (
-                        PARTITION BY w.week_start, u.user_id 
-                        ORDER BY u.updated_at DESC
-                    ) as rn
-                FROM Past4Weeks w
-                LEFT JOIN user_npti u
-                    ON u.updated_at < w.week_start + INTERVAL 1 WEEK
+            WeekSnapDate AS (
+                -- 해당 주차 일요일(이번 주는 오늘) 스냅샷 기준
+                SELECT week_start, LEAST(DATE(week_start + INTERVAL 6 DAY), DATE('{today_str}')) AS snapshot_date
+                FROM Past4Weeks
+            ),
+            ActiveSnapshot AS (
+                -- 회원 NPTI 일별 스냅샷 (활성 일반 회원만)
+                SELECT D.snapshot_date, D.npti_code, D.length_type, D.article_type, D.info_type, D.view_type
+                FROM user_npti_daily D
                 JOIN user_info ui
-                    ON u.user_id = ui.user_id
+                    ON D.user_id = ui.user_id
                 WHERE ui.activation = 1 AND ui.admin = 1
+                  AND D.snapshot_date BETWEEN '{this_monday_str}' - INTERVAL 3 WEEK AND '{today_str}'
             )
             SELECT 
                 -- 날짜를 'YYYY-MM-DD ~ YYYY-MM-DD' 형태로 변환
                 CONCAT(P.week_start, '\n~ ', DATE_ADD(P.week_start, INTERVAL 6 DAY)) AS date_period,
 
-                -- 4. 유효한 데이터(rn=1)가 있을 때만 카운트, 없으면 0
-                COUNT(CASE WHEN S.rn = 1 AND C.length_type = 'L' THEN 1 END) AS L_count,
-                COUNT(CASE WHEN S.rn = 1 AND C.length_type = 'S' THEN 1 END) AS S_count,
+                -- 2. 주차 기준일 스냅샷의 4축 타입 카운트, 없으면 0
+                COUNT(CASE WHEN S.length_type = 'L' THEN 1 END) AS L_count,
+                COUNT(CASE WHEN S.length_type = 'S' THEN 1 END) AS S_count,
 
-                COUNT(CASE WHEN S.rn = 1 AND C.article_type = 'C' THEN 1 END) AS C_count,
-                COUNT(CASE WHEN S.rn = 1 AND C.article_type = 'T' THEN 1 END) AS T_count,
+                COUNT(CASE WHEN S.article_type = 'C' THEN 1 END) AS C_count,
+                COUNT(CASE WHEN S.article_type = 'T' THEN 1 END) AS T_count,
 
-                COUNT(CASE WHEN S.rn = 1 AND C.info_type = 'I' THEN 1 END) AS I_count,
-                COUNT(CASE WHEN S.rn = 1 AND C.info_type = 'F' THEN 1 END) AS F_count,
+                COUNT(CASE WHEN S.info_type = 'I' THEN 1 END) AS I_count,
+                COUNT(CASE WHEN S.info_type = 'F' THEN 1 END) AS F_count,
 
-                COUNT(CASE WHEN S.rn = 1 AND C.view_type = 'P' THEN 1 END) AS P_count,
-                COUNT(CASE WHEN S.rn = 1 AND C.view_type = 'N' THEN 1 END) AS N_count
+                COUNT(CASE WHEN S.view_type = 'P' THEN 1 END) AS P_count,
+                COUNT(CASE WHEN S.view_type = 'N' THEN 1 END) AS N_count
 
-            FROM Past4Weeks P -- [핵심] 기준이 되는 타임라인을 먼저 둡니다.
-            LEFT JOIN WeeklySnapshot S
-                ON P.week_start = S.week_start
-            LEFT JOIN npti_code C 
-                ON S.npti_code = C.npti_code
+            FROM WeekSnapDate P -- [핵심] 기준이 되는 타임라인을 먼저 둡니다.
+            LEFT JOIN ActiveSnapshot S
+                ON S.snapshot_date = P.snapshot_date
             GROUP BY P.week_start
             ORDER BY P.week_start ASC;
         """)
 
-        result4_2 = rows_to_dict(db.execute(sql4_2).fetchall())
-        print('result4_2 (최근 4주 성향 상세 - 0포함) 완료')
-
         # 4-3) 월별 (누적 기준)
         sql4_3 = text(f"""
             WITH RECURSIVE Past6Months AS (
@@ -1470,72 +1437,70 @@ def members_statistics(db: Session = Depends(get_db)):
                 FROM Past6Months
                 WHERE month_start > '{this_month_str}' - INTERVAL 5 MONTH
             ),
-            MonthlySnapshot AS (
-                -- 2. [스냅샷] 월별 유저들의 최종 상태
-                SELECT 
-                    m.month_start,
-                    u.npti_code,
-                    ROW_NUMBER() OVER (
-                        PARTITION BY m.month_start, u.user_id 
-                        ORDER BY u.updated_at DESC
-                    ) as rn
-                FROM Past6Months m
-                LEFT JOIN user_npti u
-                    ON u.updated_at < m.month_start + INTERVAL 1 MONTH
+            MonthSnapDate AS (
+                -- 해당 월 말일(이번 달은 오늘) 스냅샷 기준
+                SELECT month_start, LEAST(LAST_DAY(month_start), DATE('{today_str}')) AS snapshot_date
+                FROM Past6Months
+            ),
+            ActiveSnapshot AS (
+                -- 회원 NPTI 일별 스냅샷 (활성 일반 회원만)
+                SELECT D.snapshot_date, D.npti_code, D.length_type, D.article_type, D.info_type, D.view_type
+                FROM user_npti_daily D
                 JOIN user_info ui
-                    ON u.user_id = ui.user_id
+                    ON D.user_id = ui.user_id
                 WHERE ui.activation = 1 AND ui.admin = 1
+                  AND D.snapshot_date BETWEEN '{this_month_str}' - INTERVAL 5 MONTH AND '{today_str}'
             )
             SELECT 
                 -- 날짜를 'YYYY-MM' 형태로 변환
                 DATE_FORMAT(P.month_start, '%Y-%m') AS date_period,
 
-                -- 4. 유효한 데이터(rn=1)가 있을 때만 카운트, 없으면 0
-                COUNT(CASE WHEN S.rn = 1 AND C.length_type = 'L' THEN 1 END) AS L_count,
-                COUNT(CASE WHEN S.rn = 1 AND C.length_type = 'S' THEN 1 END) AS S_count,
+                -- 2. 월 기준일 스냅샷의 4축 타입 카운트, 없으면 0
+                COUNT(CASE WHEN S.length_type = 'L' THEN 1 END) AS L_count,
+                COUNT(CASE WHEN S.length_type = 'S' THEN 1 END) AS S_count,
 
-                COUNT(CASE WHEN S.rn = 1 AND C.article_type = 'C' THEN 1 END) AS C_count,
-                COUNT(CASE WHEN S.rn = 1 AND C.article_type = 'T' THEN 1 END) AS T_count,
+                COUNT(CASE WHEN S.article_type = 'C' THEN 1 END) AS C_count,
+                COUNT(CASE WHEN S.article_type = 'T' THEN 1 END) AS T_count,
 
-                COUNT(CASE WHEN S.rn = 1 AND C.info_type = 'I' THEN 1 END) AS I_count,
-                COUNT(CASE WHEN S.rn = 1 AND C.info_type = 'F' THEN 1 END) AS F_count,
+                COUNT(CASE WHEN S.info_type = 'I' THEN 1 END) AS I_count,
+                COUNT(CASE WHEN S.info_type = 'F' THEN 1 END) AS F_count,
 
-                COUNT(CASE WHEN S.rn = 1 AND C.view_type = 'P' THEN 1 END) AS P_count,
-                COUNT(CASE WHEN S.rn = 1 AND C.view_type = 'N' THEN 1 END) AS N_count
+                COUNT(CASE WHEN S.view_type = 'P' THEN 1 END) AS P_count,
+                COUNT(CASE WHEN S.view_type = 'N' THEN 1 END) AS N_count
 
-            FROM Past6Months P -- [핵심] 기준이 되는 타임라인을 먼저 둡니다.
-            LEFT JOIN MonthlySnapshot S
-                ON P.month_start = S.month_start
-            LEFT JOIN npti_code C 
-                ON S.npti_code = C.npti_code
+            FROM MonthSnapDate P -- [핵심] 기준이 되는 타임라인을 먼저 둡니다.
+            LEFT JOIN ActiveSnapshot S
+                ON S.snapshot_date = P.snapshot_date
             GROUP BY P.month_start
             ORDER BY P.month_start ASC;
         """)
 
-        result4_3 = rows_to_dict(db.execute(sql4_3).fetchall())
-        print('result4_3 (최근 6개월 성향 상세 - 0포함) 완료')
-
-        time_now = datetime.now(timezone(timedelta(hours=9))).strftime('%Y-%m-%d %H:%M:%S')
-
         # =========================================================
-        # 5. 최종 리턴 (JSON)
+        # 5. 쿼리별 별도 세션으로 동시에 실행 + 결과 캐시 (집계 단위별 TTL, 만료 전 백그라운드 갱신)
         # =========================================================
-        return {
-            "result1_npti_code": result1_1,
-            "result1_age": result1_2,
-            "result1_gender": result1_3,
+        results = dashboard_cache.get_many({
+            "result1_npti_code": (STAT_TTL_NOW, query_rows(sql1_1)),
+            "result1_age": (STAT_TTL_MEMBER, with_session(load1_2)),
+            "result1_gender": (STAT_TTL_MEMBER, with_session(load1_3)),
 
-            "result2_day": result2_1,
-            "result2_week": result2_2,
-            "result2_month": result2_3,
+            "result2_day": (STAT_TTL_DAY, query_rows(sql2_1)),
+            "result2_week": (STAT_TTL_WEEK, query_rows(sql2_2)),
+            "result2_month": (STAT_TTL_MONTH, query_rows(sql2_3)),
 
-            "result3_npti_type": result3,
+            "result3_npti_type": (STAT_TTL_NOW, with_session(lambda _db: row_to_dict(_db.execute(sql3).fetchone()))),
 
-            "result4_day": result4_1,
-            "result4_week": result4_2,
-            "result4_month": result4_3,
-            "time_now": time_now
-        }
+            "result4_day": (STAT_TTL_DAY, query_rows(sql4_1)),
+            "result4_week": (STAT_TTL_WEEK, query_rows(sql4_2)),
+            "result4_month": (STAT_TTL_MONTH, query_rows(sql4_3)),
+        }, prefix=("members", today_str))
+        print('회원 통계 조회 완료')
+
+        time_now = datetime.now(timezone(timedelta(hours=9))).strftime('%Y-%m-%d %H:%M:%S')
+
+        # =========================================================
+        # 6. 최종 리턴 (JSON)
+        # =========================================================
+        return {**results, "time_now": time_now}
 
     except Exception as e:
         print(f"Error fetching statistics: {e}")
@@ -1553,302 +1518,76 @@ def articles_statistics(db: Session = Depends(get_db)):
         this_month_str = this_month_start.strftime('%Y-%m-%d')
         print(f'데이터 추출 시작')
 
-        # [Helper 함수] DB 결과를 딕셔너리 리스트로 변환
-        def rows_to_dict(result_proxy):
-            return [dict(row._asdict()) for row in result_proxy]
-
-        # [Helper 함수] 단일 행(1 row) 결과를 딕셔너리로 변환
-        def row_to_dict(row):
-            return dict(row._asdict()) if row else {}
-
-        start_date = today - timedelta(days=6)
-        start_date_str = start_date.strftime('%Y-%m-%d')
         TARGET_KEYS = ["정치", "경제", "사회", "생활/문화", "IT/과학", "세계", "스포츠", "연예", "지역"]
 
-        # 1. category별 수집 기사 추이(es)
-        # 1-1) 필드 : 일
-        query1_1 = {
-            "size": 0,
-            "runtime_mappings": {
-                "category_runtime": {
-                    "type": "keyword",
-                    "script": {
-                        # _source에서 값을 꺼내와 임시 keyword 필드로 만듦
-                        "source": "if (params['_source'].containsKey('category')) { emit(params['_source']['category'].toString()) }"
-                    }
-                }
-            },
-            "query": {
-                "range": {
-                    "pubdate": {
-                        "gte": start_date_str,
-                        "lte": today_str,
-                        "format": "yyyy-MM-dd"
-                    }
-                }
-            },
-            "aggs": {
-                "per_day": {
-                    "date_histogram": {
-                        "field": "pubdate",
-                        "calendar_interval": "day",
-                        "format": "yyyy-MM-dd",
-                        "min_doc_count": 0,
-                        "extended_bounds": {
-                            "min": start_date_str,
-                            "max": today_str
-                        }
-                    },
-                    "aggs": {
-                        "by_category": {
-                            "terms": {
-                                # 위에서 정의한 runtime 필드를 사용
-                                "field": "category_runtime",
-                                "size": 100,
-                                "min_doc_count": 0
-                            }
-                        }
-                    }
-                }
-            }
-        }
-
-        # 3. 검색 함수 실행
-        response = search_news_condition(query1_1)
-
-        # 4. [후처리] Grid 생성 (7일 x 16개 코드 = 0값 채우기)
-        result1_1 = []
-
-        if response:
-            # ES 결과를 조회하기 편한 Map 형태로 변환
-            # 구조: {'2026-01-08': {'ISTJ': 5}, ...}
-            daily_buckets = response['aggregations']['per_day']['buckets']
-            data_map = {}
-
-            for day_bucket in daily_buckets:
-                d_key = day_bucket['key_as_string']
-                cat_map = {}
-                for cat_bucket in day_bucket['by_category']['buckets']:
-                    cat_map[cat_bucket['key']] = cat_bucket['doc_count']
-                data_map[d_key] = cat_map
-
-            # 7일 날짜 순회
+        # 최근 6개월 '매월 1일' 목록 (5달 전 ~ 이번 달)
+        month_starts = []
+        for _i in range(5, -1, -1):
+            _cy, _cm = this_month_start.year, this_month_start.month - _i
+            while _cm <= 0:
+                _cy -= 1
+                _cm += 12
+            month_starts.append(this_month_start.replace(year=_cy, month=_cm, day=1))
+        week_starts = [this_monday - timedelta(weeks=_i) for _i in range(3, -1, -1)]
+
+        # 1. category별 수집 기사 추이 (article_stats_daily 'raw' 롤업, pubdate 기준)
+        # 6개월치 (일, category) 건수를 한 번에 읽어 일/주/월로 합산
+        sql1 = text("""
+            SELECT stat_date, category, SUM(article_count) AS count
+            FROM article_stats_daily
+            WHERE stat_kind = 'raw' AND stat_date BETWEEN :start AND :end
+            GROUP BY stat_date, category
+        """)
+        def load_raw(db):
+            raw_rows = db.execute(sql1, {"start": month_starts[0].strftime('%Y-%m-%d'), "end": today_str}).fetchall()
+
+            day_map, week_map, month_map = {}, {}, {}
+            for row in raw_rows:
+                _d = row.stat_date
+                _cnt = int(row.count)
+                _day_key = _d.strftime('%Y-%m-%d')
+                _week_key = (_d - timedelta(days=_d.weekday())).strftime('%Y-%m-%d')
+                _month_key = _d.strftime('%Y-%m')
+                for _map, _key in ((day_map, _day_key), (week_map, _week_key), (month_map, _month_key)):
+                    _cat_map = _map.setdefault(_key, {})
+                    _cat_map[row.category] = _cat_map.get(row.category, 0) + _cnt
+
+            # 1-1) 필드 : 일 (7일 x 9개 카테고리 = 0값 채우기)
+            result1_1 = []
             for i in range(7):
-                # 6일 전부터 오늘까지 날짜 생성
-                calc_date = today - timedelta(days=6 - i)
-                date_key = calc_date.strftime('%Y-%m-%d')
-
-                # 16개 코드 순회
+                date_key = (today - timedelta(days=6 - i)).strftime('%Y-%m-%d')
                 for key in TARGET_KEYS:
-                    # 데이터가 있으면 count, 없으면 0
-                    count = data_map.get(date_key, {}).get(key, 0)
-
                     result1_1.append({
                         "date_period": date_key,
-                        "category": key,  # category 값을 npti_code로 매핑
-                        "count": count
+                        "category": key,
+                        "count": day_map.get(date_key, {}).get(key, 0)
                     })
 
-            # 결과 확인
-            print('ES result (최근 7일 NPTI code별 집계 - 0포함) 완료')
-        else:
-            print("ES Search Failed")
-
-        # 1-2) 필드 : 주
-        week_npti_start_date = this_monday - timedelta(weeks=3)
-        week_npti_start_str = week_npti_start_date.strftime('%Y-%m-%d')
-
-        query1_2 = {
-            "size": 0,
-            "runtime_mappings": {
-                "category_runtime": {
-                    "type": "keyword",
-                    "script": {
-                        "source": "if (params['_source'].containsKey('category')) { emit(params['_source']['category'].toString()) }"
-                    }
-                }
-            },
-            "query": {
-                "range": {
-                    "pubdate": {
-                        "gte": week_npti_start_str,
-                        "lte": today_str,
-                        "format": "yyyy-MM-dd"
-                    }
-                }
-            },
-            "aggs": {
-                "per_week": {
-                    "date_histogram": {
-                        "field": "pubdate",
-                        "calendar_interval": "week",
-                        "format": "yyyy-MM-dd",
-                        "min_doc_count": 0,
-                        "extended_bounds": {
-                            "min": week_npti_start_str,
-                            "max": today_str
-                        }
-                    },
-                    "aggs": {
-                        "by_category": {
-                            "terms": {
-                                "field": "category_runtime",
-                                "size": 100,
-                                "min_doc_count": 0
-                            }
-                        }
-                    }
-                }
-            }
-        }
-
-        # 4. 검색 실행
-        # 변수명 변경: response -> es_resp_week_npti
-        es_resp_week_npti = search_news_condition(query1_2)
-
-        # 5. [후처리] Grid 생성
-        # 변수명 변경: final_result -> result_week_npti_list
-        result1_2 = []
-
-        if es_resp_week_npti:
-            # ES 결과 매핑용 딕셔너리
-            # 변수명 충돌 방지를 위해 내부 변수도 유니크하게 사용
-            week_buckets = es_resp_week_npti['aggregations']['per_week']['buckets']
-            week_data_map = {}
-
-            for _bucket in week_buckets:
-                _d_key = _bucket['key_as_string']
-                _cat_map = {}
-                for _c_bucket in _bucket['by_category']['buckets']:
-                    _cat_map[_c_bucket['key']] = _c_bucket['doc_count']
-                week_data_map[_d_key] = _cat_map
-
-            # 4주치 순회 (3주전 -> 2주전 -> 1주전 -> 이번주)
-            for _i in range(3, -1, -1):
-                _w_start = this_monday - timedelta(weeks=_i)
+            # 1-2) 필드 : 주 (3주전 -> 2주전 -> 1주전 -> 이번주)
+            result1_2 = []
+            for _w_start in week_starts:
                 _w_start_str = _w_start.strftime('%Y-%m-%d')
-                _w_end = _w_start + timedelta(days=6)
-
-                # 기간 문자열 생성
-                _period_str = f"{_w_start_str}\n~ {_w_end.strftime('%Y-%m-%d')}"
-
-                # 16개 코드 순회
+                _period_str = f"{_w_start_str}\n~ {(_w_start + timedelta(days=6)).strftime('%Y-%m-%d')}"
                 for _code in TARGET_KEYS:
-                    # 안전하게 값 가져오기 (없으면 0)
-                    _cnt = week_data_map.get(_w_start_str, {}).get(_code, 0)
-
                     result1_2.append({
                         "date_period": _period_str,
                         "category": _code,
-                        "count": _cnt
+                        "count": week_map.get(_w_start_str, {}).get(_code, 0)
                     })
-            # 결과 확인
-            print('result_week_npti_list (최근 4주 NPTI code별 집계 - 0포함) 완료')
-        else:
-            print("ES Search Failed (Week NPTI)")
-
-        # 1-3) 필드 : 월
-        _y, _m = this_month_start.year, this_month_start.month
-        _m -= 5
-        while _m <= 0:
-            _y -= 1
-            _m += 12
-        month_npti_start_date = this_month_start.replace(year=_y, month=_m, day=1)
-        month_npti_start_str = month_npti_start_date.strftime('%Y-%m-%d')
-        month_bounds_str = month_npti_start_date.strftime('%Y-%m')
-        today_bounds_str = today.strftime('%Y-%m')
-
-        query1_3 = {
-            "size": 0,
-            "runtime_mappings": {
-                "category_runtime": {
-                    "type": "keyword",
-                    "script": {
-                        # _source에서 category 값을 꺼내 임시 keyword 필드로 변환
-                        "source": "if (params['_source'].containsKey('category')) { emit(params['_source']['category'].toString()) }"
-                    }
-                }
-            },
-            "query": {
-                "range": {
-                    "pubdate": {
-                        "gte": month_npti_start_str,
-                        "lte": today_str,
-                        "format": "yyyy-MM-dd"
-                    }
-                }
-            },
-            "aggs": {
-                "per_month": {
-                    "date_histogram": {
-                        "field": "pubdate",
-                        "calendar_interval": "month",
-                        "format": "yyyy-MM",
-                        "min_doc_count": 0,
-                        # 6개월치 버킷 강제 생성
-                        "extended_bounds": {
-                            "min": month_bounds_str,
-                            "max": today_bounds_str
-                        }
-                    },
-                    "aggs": {
-                        "by_category": {
-                            "terms": {
-                                "field": "category_runtime",
-                                "size": 100,
-                                "min_doc_count": 0
-                            }
-                        }
-                    }
-                }
-            }
-        }
 
-        # 4. 검색 실행 (변수명 구분)
-        es_resp_month_npti = search_news_condition(query1_3)
-
-        # 5. [후처리] Grid 생성 (6개월 x 16개 코드 = 0값 채우기)
-        result1_3 = []
-
-        if es_resp_month_npti:
-            # 5-1. ES 결과를 조회하기 편한 Map 형태로 변환
-            _month_buckets = es_resp_month_npti['aggregations']['per_month']['buckets']
-            _month_data_map = {}
-
-            for _bucket in _month_buckets:
-                _d_key = _bucket['key_as_string']  # "YYYY-MM" 형태
-                _cat_map = {}
-                for _c_bucket in _bucket['by_category']['buckets']:
-                    _cat_map[_c_bucket['key']] = _c_bucket['doc_count']
-                _month_data_map[_d_key] = _cat_map
-
-            # 5-2. 6개월치 날짜 순회 (5달 전 ~ 이번 달)
-            for _i in range(5, -1, -1):
-                # 날짜 계산 (역순으로 월 빼기)
-                _cy, _cm = this_month_start.year, this_month_start.month
-                _cm -= _i
-                while _cm <= 0:
-                    _cy -= 1
-                    _cm += 12
-                _target_month_date = this_month_start.replace(year=_cy, month=_cm, day=1)
-                _date_key = _target_month_date.strftime('%Y-%m')  # Key: YYYY-MM
-
-                # 16개 코드 순회
+            # 1-3) 필드 : 월
+            result1_3 = []
+            for _m_start in month_starts:
+                _date_key = _m_start.strftime('%Y-%m')
                 for _code in TARGET_KEYS:
-                    # 안전하게 값 가져오기 (없으면 0)
-                    _cnt = _month_data_map.get(_date_key, {}).get(_code, 0)
-
                     result1_3.append({
                         "date_period": _date_key,
                         "category": _code,
-                        "count": _cnt
+                        "count": month_map.get(_date_key, {}).get(_code, 0)
                     })
-            # 결과 확인
-            print('result_month_npti_list (최근 6개월 NPTI code별 집계 - 0포함) 완료')
-        else:
-            print("ES Search Failed (Month NPTI)")
+            return result1_1, result1_2, result1_3
 
-        # 2. NPTI별 수집 기사 추이 - linear graph
+        # 2. NPTI별 수집 기사 추이 - linear graph (article_stats_daily 'npti' 롤업, 분류일 기준)
         # 2-1) 필드 : 일
         sql2_1 = text(f"""
             WITH RECURSIVE Past7Days AS (
@@ -1859,37 +1598,31 @@ def articles_statistics(db: Session = Depends(get_db)):
                 FROM Past7Days
                 WHERE date_period < '{today_str}'
             ),
-            AllNPTICodes AS (
-                -- 2. [코드 목록] npti_code 테이블에서 모든 코드(16개) 가져오기
-                SELECT npti_code FROM npti_code
-            ),
-            DateCodeGrid AS (
-                -- 3. [그리드 생성] (7일) x (16개 코드) = 112개 행 생성
-                -- 기사가 한 건도 없는 날이나 코드라도 이 뼈대는 무조건 존재함
-                SELECT d.date_period, c.npti_code
-                FROM Past7Days d
-                CROSS JOIN AllNPTICodes c
+            DailyStats AS (
+                -- 2. [롤업] 일자 x NPTI 코드별 분류 기사 수
+                SELECT stat_date, npti_code, SUM(article_count) AS cnt
+                FROM article_stats_daily
+                WHERE stat_kind = 'npti' AND stat_date BETWEEN '{today_str}' - INTERVAL 6 DAY AND '{today_str}'
+                GROUP BY stat_date, npti_code
             )
             SELECT 
                 G.date_period,
                 G.npti_code,
-                -- 5. 실제 기사 데이터 카운트 (없으면 0)
-                COUNT(A.news_id) as article_count
-            FROM DateCodeGrid G
-            LEFT JOIN articles_npti A
-                -- 4. [데이터 매핑] 그리드에 실제 기사 조인
-                ON G.npti_code = A.npti_code
-                AND A.updated_at >= G.date_period 
-                AND A.updated_at < G.date_period + INTERVAL 1 DAY
-            GROUP BY G.date_period, G.npti_code
+                -- 3. (7일) x (16개 코드) 그리드에 롤업 건수 매핑 (없으면 0)
+                CAST(IFNULL(R.cnt, 0) AS SIGNED) as article_count
+            FROM (
+                SELECT d.date_period, c.npti_code
+                FROM Past7Days d
+                CROSS JOIN npti_code c
+            ) G
+            LEFT JOIN DailyStats R
+                ON R.stat_date = G.date_period
+                AND R.npti_code = G.npti_code
             ORDER BY G.date_period ASC, G.npti_code ASC;
         """)
-        result2_1 = rows_to_dict(db.execute(sql2_1).fetchall())
-        print('result_articles (최근 7일 기사 수집 현황 - 0포함) 완료')
 
         # 2-2) 필드 : 주
-        # 1. 쿼리 작성
-        sql_articles_week = text(f"""
+        sql2_2 = text(f"""
             WITH RECURSIVE Past4Weeks AS (
                 -- 1. [타임라인] 최근 4주(이번 주 포함)의 월요일 생성
                 SELECT '{this_monday_str}' AS week_start
@@ -1898,39 +1631,33 @@ def articles_statistics(db: Session = Depends(get_db)):
                 FROM Past4Weeks
                 WHERE week_start > '{this_monday_str}' - INTERVAL 3 WEEK
             ),
-            AllNPTICodes AS (
-                -- 2. [코드 목록] 16개 NPTI 코드 가져오기
-                SELECT npti_code FROM npti_code
-            ),
-            WeekCodeGrid AS (
-                -- 3. [그리드 생성] (4주) x (16개 코드) = 64개 행
-                -- 데이터 유무와 상관없이 무조건 존재하는 뼈대
-                SELECT w.week_start, c.npti_code
-                FROM Past4Weeks w
-                CROSS JOIN AllNPTICodes c
+            WeeklyStats AS (
+                -- 2. [롤업] 주차(월요일) x NPTI 코드별 분류 기사 수
+                SELECT stat_date - INTERVAL WEEKDAY(stat_date) DAY AS week_start, npti_code, SUM(article_count) AS cnt
+                FROM article_stats_daily
+                WHERE stat_kind = 'npti' AND stat_date >= '{this_monday_str}' - INTERVAL 3 WEEK
+                GROUP BY week_start, npti_code
             )
             SELECT 
                 -- 날짜를 'YYYY-MM-DD ~ YYYY-MM-DD' 형태로 변환 (예: 2026-01-05 ~ 2026-01-11)
                 CONCAT(G.week_start, '\n~ ', DATE_ADD(G.week_start, INTERVAL 6 DAY)) AS date_period,
-    
+
                 G.npti_code,
-    
-                -- 5. 실제 기사 매핑 카운트 (없으면 0)
-                COUNT(A.news_id) as article_count
-            FROM WeekCodeGrid G
-            LEFT JOIN articles_npti A
-                -- 4. [데이터 매핑] 해당 주차 기간 내에 수집된 기사 조인
-                ON G.npti_code = A.npti_code
-                AND A.updated_at >= G.week_start 
-                AND A.updated_at < G.week_start + INTERVAL 1 WEEK
-            GROUP BY G.week_start, G.npti_code
+
+                -- 3. (4주) x (16개 코드) 그리드에 롤업 건수 매핑 (없으면 0)
+                CAST(IFNULL(R.cnt, 0) AS SIGNED) as article_count
+            FROM (
+                SELECT w.week_start, c.npti_code
+                FROM Past4Weeks w
+                CROSS JOIN npti_code c
+            ) G
+            LEFT JOIN WeeklyStats R
+                ON R.week_start = G.week_start
+                AND R.npti_code = G.npti_code
             ORDER BY G.week_start ASC, G.npti_code ASC;
         """)
-        result2_2 = rows_to_dict(db.execute(sql_articles_week).fetchall())
-        print('result_articles_week (최근 4주 기사 수집 현황 - 0포함) 완료')
 
         # 2-3) 필드 : 월
-        # 1. 쿼리 작성
         sql2_3 = text(f"""
             WITH RECURSIVE Past6Months AS (
                 -- 1. [타임라인] 최근 6개월(이번 달 포함) '매월 1일' 생성
@@ -1940,185 +1667,68 @@ def articles_statistics(db: Session = Depends(get_db)):
                 FROM Past6Months
                 WHERE month_start > '{this_month_str}' - INTERVAL 5 MONTH
             ),
-            AllNPTICodes AS (
-                -- 2. [코드 목록] 16개 NPTI 코드 가져오기
-                SELECT npti_code FROM npti_code
-            ),
-            MonthCodeGrid AS (
-                -- 3. [그리드 생성] (6개월) x (16개 코드) = 96개 행
-                -- 데이터 유무와 상관없이 무조건 존재하는 뼈대
-                SELECT m.month_start, c.npti_code
-                FROM Past6Months m
-                CROSS JOIN AllNPTICodes c
+            MonthlyStats AS (
+                -- 2. [롤업] 월 x NPTI 코드별 분류 기사 수
+                SELECT DATE_FORMAT(stat_date, '%Y-%m') AS month_key, npti_code, SUM(article_count) AS cnt
+                FROM article_stats_daily
+                WHERE stat_kind = 'npti' AND stat_date >= '{this_month_str}' - INTERVAL 5 MONTH
+                GROUP BY month_key, npti_code
             )
             SELECT 
                 -- 날짜를 'YYYY-MM' 형태로 변환 (예: 2025-08)
                 DATE_FORMAT(G.month_start, '%Y-%m') AS date_period,
-    
-                G.npti_code,
-    
-                -- 5. 실제 기사 매핑 카운트 (없으면 0)
-                COUNT(A.news_id) as article_count
-            FROM MonthCodeGrid G
-            LEFT JOIN articles_npti A
-                -- 4. [데이터 매핑] 해당 월 기간 내에 수집된 기사 조인
-                -- (해당 월 1일 0시 ~ 다음 달 1일 0시 전까지)
-                ON G.npti_code = A.npti_code
-                AND A.updated_at >= G.month_start 
-                AND A.updated_at < G.month_start + INTERVAL 1 MONTH
-            GROUP BY G.month_start, G.npti_code
-            ORDER BY G.month_start ASC, G.npti_code ASC;
-        """)
-        result2_3 = rows_to_dict(db.execute(sql2_3).fetchall())
-        print('result_articles_month (최근 6개월 기사 수집 현황 - 0포함) 완료')
-
-        # 3. NPTI 기준별 수집 기사 추이 - bar chart
-        # 3-1) 필드 : 일
-        # 1. 쿼리 작성
-        sql3_1 = text(f"""
-            WITH RECURSIVE Past7Days AS (
-                -- 1. [타임라인] 최근 7일 날짜 생성
-                SELECT '{today_str}' - INTERVAL 6 DAY AS date_period
-                UNION ALL
-                SELECT date_period + INTERVAL 1 DAY
-                FROM Past7Days
-                WHERE date_period < '{today_str}'
-            ),
-            DailyArticles AS (
-                -- 2. [데이터 매핑] 타임라인(P)을 기준으로 '해당 일'에 수집된 기사만 매핑
-                -- (누적 아님: updated_at이 해당 일 00시 ~ 다음날 00시 전까지)
-                SELECT 
-                    P.date_period,
-                    A.length_type,
-                    A.article_type,
-                    A.info_type,
-                    A.view_type
-                FROM Past7Days P
-                LEFT JOIN articles_npti A
-                    ON A.updated_at >= P.date_period 
-                    AND A.updated_at < P.date_period + INTERVAL 1 DAY
-            )
-            SELECT 
-                -- 날짜 그대로 출력 (YYYY-MM-DD)
-                date_period,
-    
-                -- 3. 8가지 속성별 카운트 집계 (데이터가 없으면 0)
-                COUNT(CASE WHEN length_type = 'L' THEN 1 END) AS L_count,
-                COUNT(CASE WHEN length_type = 'S' THEN 1 END) AS S_count,
-    
-                COUNT(CASE WHEN article_type = 'C' THEN 1 END) AS C_count,
-                COUNT(CASE WHEN article_type = 'T' THEN 1 END) AS T_count,
-    
-                COUNT(CASE WHEN info_type = 'I' THEN 1 END) AS I_count,
-                COUNT(CASE WHEN info_type = 'F' THEN 1 END) AS F_count,
-    
-                COUNT(CASE WHEN view_type = 'P' THEN 1 END) AS P_count,
-                COUNT(CASE WHEN view_type = 'N' THEN 1 END) AS N_count
-    
-            FROM DailyArticles
-            GROUP BY date_period
-            ORDER BY date_period ASC;
-        """)
-        result3_1 = rows_to_dict(db.execute(sql3_1).fetchall())
-        print('result_articles_type_day (최근 7일 기사 성향 상세 - 0포함) 완료')
 
+                G.npti_code,
 
-        # 3-2) 필드 : 주
-        # 1. 쿼리 작성
-        sql3_2 = text(f"""
-            WITH RECURSIVE Past4Weeks AS (
-                -- 1. [타임라인] 최근 4주(이번 주 포함)의 월요일 생성
-                SELECT '{this_monday_str}' AS week_start
-                UNION ALL
-                SELECT week_start - INTERVAL 1 WEEK
-                FROM Past4Weeks
-                WHERE week_start > '{this_monday_str}' - INTERVAL 3 WEEK
-            ),
-            WeeklyArticles AS (
-                -- 2. [데이터 매핑] 타임라인(P)을 기준으로 '해당 주'에 수집된 기사만 매핑
-                -- (누적 아님: updated_at이 해당 주 월~일 범위 내에 있는 것만)
-                SELECT 
-                    P.week_start,
-                    A.length_type,
-                    A.article_type,
-                    A.info_type,
-                    A.view_type
-                FROM Past4Weeks P
-                LEFT JOIN articles_npti A
-                    ON A.updated_at >= P.week_start 
-                    AND A.updated_at < P.week_start + INTERVAL 1 WEEK
-            )
-            SELECT 
-                -- 날짜를 'YYYY-MM-DD ~ YYYY-MM-DD' 형태로 변환 (예: 2026-01-05 ~ 2026-01-11)
-                CONCAT(week_start, '\n~ ', DATE_ADD(week_start, INTERVAL 6 DAY)) AS date_period,
-    
-                -- 3. 8가지 속성별 카운트 집계 (데이터가 없으면 0)
-                COUNT(CASE WHEN length_type = 'L' THEN 1 END) AS L_count,
-                COUNT(CASE WHEN length_type = 'S' THEN 1 END) AS S_count,
-    
-                COUNT(CASE WHEN article_type = 'C' THEN 1 END) AS C_count,
-                COUNT(CASE WHEN article_type = 'T' THEN 1 END) AS T_count,
-    
-                COUNT(CASE WHEN info_type = 'I' THEN 1 END) AS I_count,
-                COUNT(CASE WHEN info_type = 'F' THEN 1 END) AS F_count,
-    
-                COUNT(CASE WHEN view_type = 'P' THEN 1 END) AS P_count,
-                COUNT(CASE WHEN view_type = 'N' THEN 1 END) AS N_count
-    
-            FROM WeeklyArticles
-            GROUP BY week_start
-            ORDER BY week_start ASC;
+                -- 3. (6개월) x (16개 코드) 그리드에 롤업 건수 매핑 (없으면 0)
+                CAST(IFNULL(R.cnt, 0) AS SIGNED) as article_count
+            FROM (
+                SELECT m.month_start, c.npti_code
+                FROM Past6Months m
+                CROSS JOIN npti_code c
+            ) G
+            LEFT JOIN MonthlyStats R
+                ON R.month_key = DATE_FORMAT(G.month_start, '%Y-%m')
+                AND R.npti_code = G.npti_code
+            ORDER BY G.month_start ASC, G.npti_code ASC;
         """)
-        result3_2 = rows_to_dict(db.execute(sql3_2).fetchall())
-        print('result_articles_type_week (최근 4주 기사 성향 상세 - 0포함) 완료')
 
+        # 쿼리별 별도 세션으로 동시에 실행 + 결과 캐시 (집계 단위별 TTL, 만료 전 백그라운드 갱신)
+        results = dashboard_cache.get_many({
+            "result1": (STAT_TTL_DAY, with_session(load_raw)),
+            "result2_day": (STAT_TTL_DAY, query_rows(sql2_1)),
+            "result2_week": (STAT_TTL_WEEK, query_rows(sql2_2)),
+            "result2_month": (STAT_TTL_MONTH, query_rows(sql2_3)),
+        }, prefix=("articles", today_str))
+        result1_1, result1_2, result1_3 = results["result1"]
+        result2_1, result2_2, result2_3 = results["result2_day"], results["result2_week"], results["result2_month"]
+        print('기사 통계 조회 완료')
 
-        # 3-3) 필드 : 월
-        sql3_3 = text(f"""
-            WITH RECURSIVE Past6Months AS (
-                -- 1. [타임라인] 최근 6개월(이번 달 포함) '매월 1일' 생성
-                SELECT '{this_month_str}' AS month_start
-                UNION ALL
-                SELECT month_start - INTERVAL 1 MONTH
-                FROM Past6Months
-                WHERE month_start > '{this_month_str}' - INTERVAL 5 MONTH
-            ),
-            MonthlyArticles AS (
-                -- 2. [데이터 매핑] 타임라인(P)을 기준으로 해당 월에 작성된 기사(A)를 붙임
-                SELECT 
-                    P.month_start,
-                    A.length_type,
-                    A.article_type,
-                    A.info_type,
-                    A.view_type
-                FROM Past6Months P
-                LEFT JOIN articles_npti A
-                    ON A.updated_at >= P.month_start 
-                    AND A.updated_at < P.month_start + INTERVAL 1 MONTH
-            )
-            SELECT 
-                -- 날짜를 'YYYY-MM' 형태로 변환
-                DATE_FORMAT(month_start, '%Y-%m') AS date_period,
-    
-                -- 3. 8가지 속성별 카운트 집계 (데이터 없으면 0)
-                COUNT(CASE WHEN length_type = 'L' THEN 1 END) AS L_count,
-                COUNT(CASE WHEN length_type = 'S' THEN 1 END) AS S_count,
-    
-                COUNT(CASE WHEN article_type = 'C' THEN 1 END) AS C_count,
-                COUNT(CASE WHEN article_type = 'T' THEN 1 END) AS T_count,
-    
-                COUNT(CASE WHEN info_type = 'I' THEN 1 END) AS I_count,
-                COUNT(CASE WHEN info_type = 'F' THEN 1 END) AS F_count,
-    
-                COUNT(CASE WHEN view_type = 'P' THEN 1 END) AS P_count,
-                COUNT(CASE WHEN view_type = 'N' THEN 1 END) AS N_count
-    
-            FROM MonthlyArticles
-            GROUP BY month_start
-            ORDER BY month_start ASC;
-        """)
-        result3_3 = rows_to_dict(db.execute(sql3_3).fetchall())
-        print('result_articles_type_month (최근 6개월 기사 성향 상세 - 0포함) 완료')
+        # 3. NPTI 기준별 수집 기사 추이 - bar chart
+        # 2번 결과(기간 x NPTI 코드 건수)를 npti_code 4축 타입으로 합산 (추가 쿼리 없음)
+        code_types = {r["npti_code"]: r for r in get_all_npti_codes(db)}
+
+        def axis_counts(rows):
+            result = {}
+            for row in rows:
+                period = row["date_period"]
+                counts = result.setdefault(period, {
+                    "date_period": period,
+                    "L_count": 0, "S_count": 0, "C_count": 0, "T_count": 0,
+                    "I_count": 0, "F_count": 0, "P_count": 0, "N_count": 0
+                })
+                code = code_types.get(row["npti_code"])
+                if not code or not row["article_count"]:
+                    continue
+                for axis in ("length_type", "article_type", "information_type", "view_type"):
+                    counts[f"{code[axis]}_count"] += row["article_count"]
+            return list(result.values())
+
+        # 3-1) 필드 : 일 / 3-2) 필드 : 주 / 3-3) 필드 : 월
+        result3_1 = axis_counts(result2_1)
+        result3_2 = axis_counts(result2_2)
+        result3_3 = axis_counts(result2_3)
+        print('result_articles_type (기사 성향 상세 - 0포함) 완료')
         time_now = datetime.now(timezone(timedelta(hours=9))).strftime('%Y-%m-%d %H:%M:%S')
 
         return {
@@ -2137,4 +1747,4 @@ def articles_statistics(db: Session = Depends(get_db)):
         }
     except Exception as e:
         print(f'Error 발생 : {e}')
-        return JSONResponse(status_code=500, content = {"msg":"기사 통계 데이터 로드 중 오류가 발생했습니다."})
\ No newline at end of file
+        return JSONResponse(status_code=500, content = {"msg":"기사 통계 데이터 로드 중 오류가 발생했습니다."})
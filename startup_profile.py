@@ -0,0 +1,111 @@
+import os
+import sys
+import time
+import threading
+from importlib.machinery import SourceFileLoader, SourcelessFileLoader, ExtensionFileLoader
+
+# =========================
+# 웹 서버 시작 시간 측정 (main.py 맨 위에서 install)
+# - 모듈별 import 시간 : cumulative (하위 import 포함) / self (자기 모듈 코드만)
+# - 서버 준비 완료(startup 이벤트 종료) 시각, 첫 요청 도착 / 응답 시각
+# - GET /startup/report 로 조회, startup 이벤트 끝에 상위 모듈 로그 출력
+# - STARTUP_PROFILE=0 이면 import 시간 측정 안 함 (시각만 기록)
+# =========================
+STARTED_AT = time.perf_counter()
+ENABLED = os.getenv("STARTUP_PROFILE", "1") != "0"
+
+FILE_LOADERS = (SourceFileLoader, SourcelessFileLoader, ExtensionFileLoader)
+
+_imports = {}  # module name -> {"cumulative": 초, "self": 초}
+_stack = []    # 현재 실행 중인 import (중첩)
+_lock = threading.Lock()
+_marks = {}    # "ready" / "first_request" / "first_response" -> 시작 후 경과 초
+
+
+def elapsed() -> float:
+    return time.perf_counter() - STARTED_AT
+
+
+def _timed_exec(name, exec_module):
+    def exec_with_timer(module):
+        # 다른 스레드의 import는 중첩 관계를 알 수 없으므로 메인 흐름(시작 스레드)만 측정
+        if threading.current_thread() is not threading.main_thread():
+            return exec_module(module)
+        frame = [name, time.perf_counter(), 0.0]  # 이름, 시작 시각, 하위 import 합계
+        _stack.append(frame)
+        try:
+            return exec_module(module)
+        finally:
+            _stack.pop()
+            cumulative = time.perf_counter() - frame[1]
+            if _stack:
+                _stack[-1][2] += cumulative
+            with _lock:
+                _imports[name] = {"cumulative": cumulative, "self": cumulative - frame[2]}
+    return exec_with_timer
+
+
+class _ImportTimer:
+    """sys.meta_path 맨 앞에서 다른 finder가 찾은 loader의 exec_module만 감싸서 시간 측정"""
+
+    def find_spec(self, fullname, path=None, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is None:
+                continue
+            loader = spec.loader
+            # 파일 1개당 loader 1개인 경우(.py / 확장 모듈)만 감쌈 (BuiltinImporter, zipimport 등은 공유 loader)
+            if isinstance(loader, FILE_LOADERS):
+                try:
+                    loader.exec_module = _timed_exec(fullname, loader.exec_module)
+                except (AttributeError, TypeError):
+                    pass
+            return spec
+        return None
+
+
+_installed = False
+
+def install():
+    global _installed
+    if ENABLED and not _installed:
+        sys.meta_path.insert(0, _ImportTimer())
+        _installed = True
+
+
+def uninstall():
+    global _installed
+    sys.meta_path[:] = [f for f in sys.meta_path if not isinstance(f, _ImportTimer)]
+    _installed = False
+
+
+def mark(name: str):
+    """처음 한 번만 기록 (ready / first_request / first_response)"""
+    if name not in _marks:
+        _marks[name] = round(elapsed(), 3)
+
+
+def report(top: int = 20) -> dict:
+    with _lock:
+        items = list(_imports.items())
+    by_cumulative = sorted(items, key=lambda x: x[1]["cumulative"], reverse=True)[:top]
+    by_self = sorted(items, key=lambda x: x[1]["self"], reverse=True)[:top]
+    return {
+        "profiling": _installed,
+        "elapsed": round(elapsed(), 3),
+        "marks": dict(_marks),
+        "modules_imported": len(items),
+        "import_self_total": round(sum(v["self"] for _, v in items), 3),
+        "top_cumulative": [{"module": m, "seconds": round(v["cumulative"], 3)} for m, v in by_cumulative],
+        "top_self": [{"module": m, "seconds": round(v["self"], 3)} for m, v in by_self],
+    }
+
+
+def format_report(top: int = 15) -> str:
+    r = report(top)
+    lines = [f"[시작 시간] 준비 완료 {r['marks'].get('ready', '-')}초 / import {r['modules_imported']}개 "
+             f"(합계 {r['import_self_total']}초)"]
+    lines += [f"  {x['seconds']:>7.3f}s  {x['module']}" for x in r["top_cumulative"]]
+    return "\n".join(lines)
@@ -0,0 +1,128 @@
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from logger import Logger
+
+logger = Logger().get_logger(__name__)
+
+
+class TTLCache:
+    """
+    크기 제한(LRU) + 만료 시간(TTL)이 있는 프로세스 메모리 캐시
+    - maxsize를 넘으면 가장 오래 사용하지 않은 항목부터 제거
+    - ttl(초)이 지난 항목은 조회 시 제거
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60, name: str = "cache"):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.name = name
+        self._data = OrderedDict()  # key -> (만료 시각, 값)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        now = time.monotonic()
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self.misses += 1
+                return default
+            expire_at, value = item
+            if expire_at <= now:
+                del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value, ttl: float = None):
+        expire_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expire_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+        logger.info(f"{self.name} 캐시 초기화")
+
+    def stats(self):
+        with self._lock:
+            size = len(self._data)
+        return {"name": self.name, "size": size, "maxsize": self.maxsize, "ttl": self.ttl,
+                "hits": self.hits, "misses": self.misses}
+
+
+class RefreshingCache:
+    """
+    여러 개의 조회 함수를 동시에 실행하고 결과를 항목별 TTL로 캐시
+    - get_many({key: (ttl, loader)}) : 캐시에 없거나 만료된 항목만 스레드 풀에서 동시에 실행
+    - TTL의 refresh_ratio(기본 80%)가 지난 항목은 캐시 값을 바로 반환하고 백그라운드에서 미리 갱신
+    """
+
+    def __init__(self, max_workers: int = 8, refresh_ratio: float = 0.8, name: str = "cache"):
+        self.refresh_ratio = refresh_ratio
+        self.name = name
+        self._data = {}  # key -> (로드 시각, ttl, 값)
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+
+    def _load(self, key, ttl, loader):
+        value = loader()
+        with self._lock:
+            self._data[key] = (time.monotonic(), ttl, value)
+        return value
+
+    def _refresh(self, key, ttl, loader):
+        try:
+            self._load(key, ttl, loader)
+        except Exception as e:
+            logger.error(f"{self.name} 캐시 백그라운드 갱신 실패 {key} : {e}")
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def get_many(self, loaders: dict, prefix=None):
+        """prefix : 키 앞에 붙일 값 (예: 날짜 -> 날짜가 바뀌면 새로 조회)"""
+        loaders = {(prefix, key): value for key, value in loaders.items()}
+        now = time.monotonic()
+        results, futures = {}, {}
+        with self._lock:
+            # 만료된 항목 정리 (날짜가 바뀐 이전 키 등)
+            for key in [k for k, (t, ttl, _) in self._data.items() if now - t >= ttl and k not in loaders]:
+                del self._data[key]
+            items = {key: self._data.get(key) for key in loaders}
+
+        for key, (ttl, loader) in loaders.items():
+            item = items[key]
+            age = now - item[0] if item else None
+            if item and age < ttl:
+                results[key[1]] = item[2]
+                if age >= ttl * self.refresh_ratio:
+                    with self._lock:
+                        if key in self._refreshing:
+                            continue
+                        self._refreshing.add(key)
+                    self._executor.submit(self._refresh, key, ttl, loader)
+            else:
+                futures[key] = self._executor.submit(self._load, key, ttl, loader)
+
+        for key, future in futures.items():
+            results[key[1]] = future.result()
+        return results
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+        logger.info(f"{self.name} 캐시 초기화")
@@ -0,0 +1,162 @@
+import os
+import sqlite3
+import time
+from logger import Logger
+
+logger = Logger().get_logger(__name__)
+
+# =========================
+# 로컬 작업 큐 (SQLite 파일 기반, 프로세스 간 공유 / 서버 재시작 후에도 유지)
+# - enqueue : 작업 등록 (같은 key가 대기 중이면 무시)
+# - lease   : 처리할 작업을 lease_seconds 동안 점유 (처리 중 프로세스가 죽으면 만료 후 다시 배정)
+#             점유할 때마다 attempts 증가 -> 점유 만료(워커 종료 / 타임아웃)가 max_attempts번 반복되면 dead
+# - ack     : 처리 완료 -> 삭제
+# - nack    : 처리 실패 -> backoff 후 재시도, max_attempts 도달 시 dead 상태로 보관
+# =========================
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+QUEUE_PATH = os.getenv("WORK_QUEUE_PATH", os.path.join(BASE_DIR, "work_queue.sqlite3"))
+
+
+class WorkQueue:
+    def __init__(self, name: str, path: str = QUEUE_PATH, max_attempts: int = 5, retry_delay: float = 30):
+        self.name = name
+        self.path = path
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        conn = self._connect()
+        try:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS work_queue (
+                    queue        TEXT NOT NULL,
+                    item_key     TEXT NOT NULL,
+                    status       TEXT NOT NULL DEFAULT 'ready',  -- ready / leased / dead
+                    attempts     INTEGER NOT NULL DEFAULT 0,
+                    available_at REAL NOT NULL,
+                    enqueued_at  REAL NOT NULL,
+                    last_error   TEXT,
+                    PRIMARY KEY (queue, item_key)
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_work_queue_ready ON work_queue (queue, status, available_at)")
+        finally:
+            conn.close()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def enqueue(self, keys):
+        if isinstance(keys, str):
+            keys = [keys]
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.executemany("""
+                INSERT INTO work_queue (queue, item_key, status, attempts, available_at, enqueued_at)
+                VALUES (?, ?, 'ready', 0, ?, ?)
+                ON CONFLICT (queue, item_key) DO UPDATE SET
+                    status = 'ready', attempts = 0, available_at = excluded.available_at
+                WHERE work_queue.status = 'dead'
+            """, [(self.name, key, now, now) for key in keys])
+        finally:
+            conn.close()
+
+    def lease(self, limit: int = 100, lease_seconds: float = 300):
+        """대기 중이거나 점유가 만료된 작업을 최대 limit건 점유해서 key 목록 반환"""
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            rows = conn.execute("""
+                SELECT item_key, status, attempts FROM work_queue
+                WHERE queue = ? AND status IN ('ready', 'leased') AND available_at <= ?
+                ORDER BY available_at
+                LIMIT ?
+            """, (self.name, now, limit)).fetchall()
+            # 점유가 만료된 작업 = 이전 시도가 ack / nack 없이 끝남 -> 한도에 도달했으면 dead로 보관
+            dead = [key for key, status, attempts in rows if status == 'leased' and attempts >= self.max_attempts]
+            keys = [key for key, status, attempts in rows if not (status == 'leased' and attempts >= self.max_attempts)]
+            conn.executemany("""
+                UPDATE work_queue SET status = 'dead', last_error = 'lease expired'
+                WHERE queue = ? AND item_key = ?
+            """, [(self.name, key) for key in dead])
+            conn.executemany("""
+                UPDATE work_queue SET status = 'leased', available_at = ?, attempts = attempts + 1
+                WHERE queue = ? AND item_key = ?
+            """, [(now + lease_seconds, self.name, key) for key in keys])
+            conn.execute("COMMIT")
+            for key in dead:
+                logger.error(f"[{self.name}] 점유 만료 반복으로 재시도 한도 초과 : {key}")
+            return keys
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def ack(self, keys):
+        if not keys:
+            return
+        conn = self._connect()
+        try:
+            conn.executemany("DELETE FROM work_queue WHERE queue = ? AND item_key = ?",
+                             [(self.name, key) for key in keys])
+        finally:
+            conn.close()
+
+    def nack(self, keys, error: str = None):
+        if not keys:
+            return
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            for key in keys:
+                row = conn.execute("SELECT attempts FROM work_queue WHERE queue = ? AND item_key = ?",
+                                   (self.name, key)).fetchone()
+                if row is None:
+                    continue
+                attempts = max(row[0], 1)  # lease에서 이미 증가시킨 시도 횟수
+                status = "dead" if attempts >= self.max_attempts else "ready"
+                conn.execute("""
+                    UPDATE work_queue SET status = ?, attempts = ?, available_at = ?, last_error = ?
+                    WHERE queue = ? AND item_key = ?
+                """, (status, attempts, now + self.retry_delay * (2 ** (attempts - 1)),
+                      (error or "")[:500], self.name, key))
+                if status == "dead":
+                    logger.error(f"[{self.name}] 재시도 한도 초과 : {key} / {error}")
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def stats(self):
+        conn = self._connect()
+        try:
+            rows = conn.execute("SELECT status, COUNT(*) FROM work_queue WHERE queue = ? GROUP BY status",
+                                (self.name,)).fetchall()
+            return dict(rows)
+        finally:
+            conn.close()
+
+
+# 신규 기사 NPTI 분류 대기열 (크롤러 -> 분류기)
+_npti_queue = None
+
+def get_npti_queue() -> WorkQueue:
+    global _npti_queue
+    if _npti_queue is None:
+        _npti_queue = WorkQueue("npti_classify")
+    return _npti_queue
+
+
+def enqueue_npti(news_id: str):
+    # 크롤링은 계속 진행되도록 큐 등록 실패는 로그만 남김 (정합성 점검 스캔이 보완)
+    try:
+        get_npti_queue().enqueue(news_id)
+    except Exception as e:
+        logger.error(f"NPTI 분류 대기열 등록 실패 {news_id} : {e}")